@@ -14,11 +14,13 @@ Usage:
     python auto_run_full_flow.py
     python auto_run_full_flow.py --delay 5    # Wait 5 seconds before starting
     python auto_run_full_flow.py --allure     # Push results to Allure
+    python auto_run_full_flow.py --stage-graph flow.yaml  # Custom stage graph
 
 NOTE: This script now uses the modular src/auto_flow package.
 The actual implementation has been refactored into:
     - src/auto_flow/runner.py      (AutoTestRunner class)
     - src/auto_flow/stages.py      (StageManager class)
+    - src/auto_flow/scheduler.py   (StageGraph / StageScheduler)
     - src/auto_flow/allure_helper.py (AllureHelper class)
     - src/auto_flow/cli.py         (CLI and main entry)
 
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Import-Time Benchmark
+=====================
+Measures how long a fresh interpreter takes to import framework modules
+(what every pytest-xdist worker and CLI run pays before doing any work).
+
+Usage:
+    python benchmark_imports.py                       # Default module set
+    python benchmark_imports.py --runs 20 src.utils.logger
+    python benchmark_imports.py --max-ms 400          # Exit 1 if any median exceeds 400ms
+    python benchmark_imports.py --importtime src.auto_flow.cli
+                                                      # Slowest imports (python -X importtime)
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+DEFAULT_MODULES = [
+    "config.settings",
+    "src.utils.logger",
+    "src.utils.http_client",
+    "src.api_clients.upstox_auth_client",
+    "src.auto_flow.cli",
+]
+
+
+def time_import(module: str, runs: int) -> list:
+    """Wall-clock seconds of `python -c "import module"`, once per run"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", f"import {module}"], check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def slowest_imports(module: str, top: int = 15) -> list:
+    """(cumulative_us, self_us, name) of the slowest imports under module"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        check=True, capture_output=True, text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark framework import time")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--runs", type=int, default=10, help="Fresh interpreters per module")
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail if any median exceeds this")
+    parser.add_argument("--importtime", action="store_true", help="Show the slowest nested imports")
+    args = parser.parse_args()
+
+    baseline = statistics.median(time_import("sys", args.runs))
+    print(f"\n⏱  Import time (median of {args.runs} runs, interpreter startup {baseline * 1000:.0f}ms subtracted)")
+    print("=" * 70)
+    failed = False
+    for module in args.modules:
+        timings = time_import(module, args.runs)
+        median_ms = (statistics.median(timings) - baseline) * 1000
+        over = args.max_ms is not None and median_ms > args.max_ms
+        failed |= over
+        print(f"{'❌' if over else '✅'} {module:<45} {median_ms:8.1f} ms")
+
+        if args.importtime:
+            for cumulative_us, self_us, name in slowest_imports(module):
+                print(f"      {cumulative_us / 1000:8.1f} ms  (self {self_us / 1000:6.1f})  {name}")
+    print("=" * 70)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
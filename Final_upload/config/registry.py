@@ -0,0 +1,262 @@
+"""
+Config Registry for API Automation Framework
+Typed, immutable snapshot of environments.yaml + upstox_config.yaml, built
+once per process and swapped atomically on hot reload.
+"""
+import string
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from config.settings import CONFIG_DIR, Settings
+
+DEFAULT_CONFIG_FILES = (CONFIG_DIR / "environments.yaml", CONFIG_DIR / "upstox_config.yaml")
+
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    """One API endpoint; `params` are the {placeholders} in its path"""
+    name: str
+    path: str
+    method: str = "GET"
+    description: str = ""
+    params: Tuple[str, ...] = ()
+
+    def url(self, **params: Any) -> str:
+        """Fill the path template, e.g. get_lead.url(lead_id=42)"""
+        return self.path.format(**params) if self.params else self.path
+
+
+@dataclass(frozen=True)
+class Environment:
+    """Target environment: where to send requests and how patiently"""
+    name: str
+    base_url: str
+    timeout: int = 30
+    retry_attempts: int = 3
+
+
+@dataclass(frozen=True)
+class ApiConfig:
+    """A group of endpoints (e.g. lead_generation, upstox)"""
+    name: str
+    endpoints: Mapping[str, Endpoint] = field(default_factory=lambda: _EMPTY)
+    base_url: Optional[str] = None
+    headers: Mapping[str, str] = field(default_factory=lambda: _EMPTY)
+    defaults: Mapping[str, Any] = field(default_factory=lambda: _EMPTY)
+
+    def endpoint(self, name: str) -> Endpoint:
+        try:
+            return self.endpoints[name]
+        except KeyError:
+            raise KeyError(f"Unknown endpoint '{name}' in API '{self.name}' (known: {sorted(self.endpoints)})") from None
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Everything read from the config files at one point in time"""
+    environments: Mapping[str, Environment]
+    apis: Mapping[str, ApiConfig]
+    auth: Mapping[str, Any] = field(default_factory=lambda: _EMPTY)
+    rate_limits: Mapping[str, Any] = field(default_factory=lambda: _EMPTY)
+    raw: Mapping[str, Any] = field(default_factory=lambda: _EMPTY)  # Parsed environments.yaml, read-only (for Settings' dict API)
+    version: int = 0  # Incremented on every reload
+
+    def env(self, name: Optional[str] = None) -> Environment:
+        """Environment by name (default: Settings.ENV)"""
+        name = name or Settings.ENV
+        try:
+            return self.environments[name]
+        except KeyError:
+            raise KeyError(f"Unknown environment '{name}' (known: {sorted(self.environments)})") from None
+
+    def api(self, name: str) -> ApiConfig:
+        try:
+            return self.apis[name]
+        except KeyError:
+            raise KeyError(f"Unknown API '{name}' (known: {sorted(self.apis)})") from None
+
+    def endpoint(self, api: str, name: str) -> Endpoint:
+        return self.api(api).endpoint(name)
+
+
+def _freeze(value: Any) -> Any:
+    """Read-only copy of parsed YAML: mappings become MappingProxyType, lists tuples"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _endpoints(config: Optional[Mapping[str, Any]]) -> Mapping[str, Endpoint]:
+    endpoints = {}
+    for name, spec in (config or {}).items():
+        path = spec["path"]
+        params = tuple(field_name for _, field_name, _, _ in string.Formatter().parse(path) if field_name)
+        endpoints[name] = Endpoint(
+            name=name,
+            path=path,
+            method=spec.get("method", "GET").upper(),
+            description=spec.get("description", ""),
+            params=params
+        )
+    return MappingProxyType(endpoints)
+
+
+def build_snapshot(documents: Sequence[Mapping[str, Any]], version: int = 0) -> ConfigSnapshot:
+    """
+    Build a snapshot from parsed YAML documents
+
+    environments.yaml contributes environments/apis/auth/rate_limits;
+    upstox_config.yaml's `upstox` block becomes the "upstox" API.
+    """
+    environments: Dict[str, Environment] = {}
+    apis: Dict[str, ApiConfig] = {}
+    auth: Dict[str, Any] = {}
+    rate_limits: Dict[str, Any] = {}
+    raw: Dict[str, Any] = {}
+
+    for document in documents:
+        document = document or {}
+        if "environments" in document and not raw:
+            raw = dict(document)
+        for name, spec in (document.get("environments") or {}).items():
+            environments[name] = Environment(
+                name=name,
+                base_url=spec.get("base_url", ""),
+                timeout=int(spec.get("timeout", 30)),
+                retry_attempts=int(spec.get("retry_attempts", 3))
+            )
+        for name, spec in (document.get("apis") or {}).items():
+            apis[name] = ApiConfig(name=name, endpoints=_endpoints(spec.get("endpoints")))
+        auth.update(document.get("auth") or {})
+        rate_limits.update(document.get("rate_limits") or {})
+        if "upstox" in document:
+            spec = document["upstox"] or {}
+            apis["upstox"] = ApiConfig(
+                name="upstox",
+                endpoints=_endpoints(spec.get("endpoints")),
+                base_url=spec.get("base_url"),
+                headers=_freeze(spec.get("headers") or {}),
+                defaults=_freeze(spec.get("defaults") or {})
+            )
+
+    return ConfigSnapshot(
+        environments=MappingProxyType(environments),
+        apis=MappingProxyType(apis),
+        auth=_freeze(auth),
+        rate_limits=_freeze(rate_limits),
+        raw=_freeze(raw),
+        version=version
+    )
+
+
+class ConfigRegistry:
+    """
+    Holds the current ConfigSnapshot.
+
+    The files are parsed once, on first access. reload() re-parses them only
+    if one changed on disk (mtime/size), then swaps in the new snapshot, so
+    readers never see a half-built config. watch() runs reload() in a
+    background thread for long-running load jobs.
+
+    Example:
+        >>> snapshot = config_registry.snapshot
+        >>> staging = snapshot.env("staging")
+        >>> snapshot.endpoint("lead_generation", "get_lead").url(lead_id=42)
+        '/api/v1/leads/42'
+    """
+
+    def __init__(self, files: Sequence[Path] = DEFAULT_CONFIG_FILES):
+        self.files = [Path(f) for f in files]
+        self._lock = threading.Lock()
+        self._snapshot: Optional[ConfigSnapshot] = None
+        self._signature: Optional[Tuple] = None
+        self._listeners: List[Callable[[ConfigSnapshot], None]] = []
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            self.reload()
+            snapshot = self._snapshot
+        return snapshot
+
+    def _file_signature(self) -> Tuple:
+        signature = []
+        for path in self.files:
+            try:
+                stat = path.stat()
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Re-read the config files if they changed
+
+        Returns:
+            True if a new snapshot was installed
+        """
+        import yaml
+
+        with self._lock:
+            signature = self._file_signature()
+            if not force and signature == self._signature:
+                return False
+            documents = []
+            for path in self.files:
+                if path.exists():
+                    with open(path, 'r') as f:
+                        documents.append(yaml.safe_load(f))
+            version = self._snapshot.version + 1 if self._snapshot is not None else 0
+            self._snapshot = build_snapshot(documents, version)
+            self._signature = signature
+            snapshot, listeners = self._snapshot, list(self._listeners)
+
+        if version:
+            from src.utils.logger import logger
+            logger.info(f"🔄 Config reloaded (version {version})")
+        for listener in listeners:
+            listener(snapshot)
+        return True
+
+    def subscribe(self, listener: Callable[[ConfigSnapshot], None]):
+        """Call listener(snapshot) after every reload"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def watch(self, interval: float = 2.0):
+        """Reload automatically when a config file changes (daemon thread)"""
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.reload()
+                except Exception as e:  # A half-written file must not kill the watcher
+                    from src.utils.logger import logger
+                    logger.error(f"❌ Config reload failed, keeping previous config: {e}")
+
+        self._watcher = threading.Thread(target=run, name="config-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+
+# Global registry (parsed on first use)
+config_registry = ConfigRegistry()
@@ -2,31 +2,70 @@
 Configuration Management for API Automation Framework
 """
 import os
-import yaml
+import threading
 from pathlib import Path
-from dotenv import load_dotenv
-from typing import Dict, Any, Optional
-
-# Load environment variables
-load_dotenv()
+from typing import Any, Callable, Mapping, Optional
 
 # Base paths
 BASE_DIR = Path(__file__).parent.parent
 CONFIG_DIR = Path(__file__).parent
 
+_env_lock = threading.Lock()
+_env_loaded = False
+
+
+def load_env():
+    """Load .env into os.environ (once, on first use of an env-backed setting)"""
+    global _env_loaded
+    with _env_lock:
+        if not _env_loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            _env_loaded = True
+
+
+def _as_bool(value: str) -> bool:
+    return value.lower() == "true"
+
+
+class EnvSetting:
+    """
+    Settings attribute read from the environment on first access.
+    The value then replaces the descriptor on the class, so later reads
+    are plain attribute lookups and assignments (e.g. from conftest) work.
+    """
+    
+    def __init__(self, name: str, default: Optional[str] = None, cast: Callable[[str], Any] = str):
+        self.name = name
+        self.default = default
+        self.cast = cast
+    
+    def __set_name__(self, owner, attr: str):
+        self.attr = attr
+    
+    def __get__(self, instance, owner):
+        load_env()
+        raw = os.getenv(self.name, self.default)
+        value = self.cast(raw) if raw is not None else None
+        setattr(owner, self.attr, value)
+        return value
+
 
 class Settings:
     """Application settings and configuration"""
     
     # Environment
-    ENV: str = os.getenv("ENV", "development")
-    DEBUG: bool = os.getenv("DEBUG", "false").lower() == "true"
+    ENV: str = EnvSetting("ENV", "development")
+    DEBUG: bool = EnvSetting("DEBUG", "false", _as_bool)
     
     # API Credentials (from environment variables)
-    API_KEY: Optional[str] = os.getenv("API_KEY")
-    API_SECRET: Optional[str] = os.getenv("API_SECRET")
-    ACCESS_TOKEN: Optional[str] = os.getenv("ACCESS_TOKEN")
-    REFRESH_TOKEN: Optional[str] = os.getenv("REFRESH_TOKEN")
+    API_KEY: Optional[str] = EnvSetting("API_KEY")
+    API_SECRET: Optional[str] = EnvSetting("API_SECRET")
+    ACCESS_TOKEN: Optional[str] = EnvSetting("ACCESS_TOKEN")
+    REFRESH_TOKEN: Optional[str] = EnvSetting("REFRESH_TOKEN")
+    
+    # Upstox API (point at a local mock server with UPSTOX_BASE_URL=http://127.0.0.1:8765)
+    UPSTOX_BASE_URL: str = EnvSetting("UPSTOX_BASE_URL", "https://service-uat.upstox.com")
     
     # Test Data
     TEST_DATA_DIR: Path = BASE_DIR / "tests" / "data"
@@ -34,43 +73,47 @@ class Settings:
     LOGS_DIR: Path = BASE_DIR / "logs"
     
     # Test Execution
-    PARALLEL_WORKERS: int = int(os.getenv("PARALLEL_WORKERS", "4"))
-    TEST_TIMEOUT: int = int(os.getenv("TEST_TIMEOUT", "300"))
+    PARALLEL_WORKERS: int = EnvSetting("PARALLEL_WORKERS", "4", int)
+    TEST_TIMEOUT: int = EnvSetting("TEST_TIMEOUT", "300", int)
     
     # Reporting
-    GENERATE_HTML_REPORT: bool = os.getenv("GENERATE_HTML_REPORT", "true").lower() == "true"
-    GENERATE_ALLURE_REPORT: bool = os.getenv("GENERATE_ALLURE_REPORT", "false").lower() == "true"
-    
-    _config_cache: Optional[Dict[str, Any]] = None
+    GENERATE_HTML_REPORT: bool = EnvSetting("GENERATE_HTML_REPORT", "true", _as_bool)
+    GENERATE_ALLURE_REPORT: bool = EnvSetting("GENERATE_ALLURE_REPORT", "false", _as_bool)
     
     @classmethod
-    def load_config(cls) -> Dict[str, Any]:
-        """Load YAML configuration file"""
-        if cls._config_cache is None:
-            config_file = CONFIG_DIR / "environments.yaml"
-            with open(config_file, 'r') as f:
-                cls._config_cache = yaml.safe_load(f)
-        return cls._config_cache
+    def load_config(cls) -> Mapping[str, Any]:
+        """
+        Parsed environments.yaml (read-only), from the shared config registry
+        (typed access: config.registry.config_registry.snapshot)
+        """
+        from config.registry import config_registry
+        return config_registry.snapshot.raw
     
     @classmethod
-    def get_env_config(cls, env: Optional[str] = None) -> Dict[str, Any]:
+    def get_env_config(cls, env: Optional[str] = None) -> Mapping[str, Any]:
         """Get configuration for specific environment"""
         config = cls.load_config()
         env = env or cls.ENV
         return config.get("environments", {}).get(env, {})
     
     @classmethod
-    def get_api_config(cls) -> Dict[str, Any]:
+    def get_api_config(cls) -> Mapping[str, Any]:
         """Get API endpoints configuration"""
         config = cls.load_config()
         return config.get("apis", {})
     
     @classmethod
-    def get_auth_config(cls) -> Dict[str, Any]:
+    def get_auth_config(cls) -> Mapping[str, Any]:
         """Get authentication configuration"""
         config = cls.load_config()
         return config.get("auth", {})
     
+    @classmethod
+    def get_rate_limit_config(cls) -> Mapping[str, Any]:
+        """Get client-side rate limits (token buckets per host/endpoint)"""
+        config = cls.load_config()
+        return config.get("rate_limits") or {}
+    
     @classmethod
     def get_base_url(cls, env: Optional[str] = None) -> str:
         """Get base URL for environment"""
@@ -83,6 +126,3 @@ class Settings:
         for directory in [cls.TEST_DATA_DIR, cls.REPORTS_DIR, cls.LOGS_DIR]:
             directory.mkdir(parents=True, exist_ok=True)
 
-
-# Initialize settings
-Settings.ensure_directories()
@@ -4,6 +4,7 @@ Pytest Configuration and Fixtures
 import pytest
 import uuid
 from datetime import datetime
+from pathlib import Path
 from faker import Faker
 
 from src.api_clients.lead_client import LeadAPIClient
@@ -26,6 +27,14 @@ def api_client():
     client.close()
 
 
+@pytest.fixture(scope="session")
+def upstox_mock_server():
+    """Session-scoped local Upstox mock server"""
+    from src.mock_server import UpstoxMockServer
+    with UpstoxMockServer() as server:
+        yield server
+
+
 @pytest.fixture(scope="session")
 def base_url():
     """Get base URL from settings"""
@@ -36,6 +45,51 @@ def base_url():
 # FUNCTION FIXTURES
 # ═══════════════════════════════════════════════════════════════════
 
+CASSETTE_DIR = Path(__file__).parent / "tests" / "cassettes"
+
+
+@pytest.fixture(autouse=True)
+def vcr_cassette(request):
+    """
+    Record/replay HTTP traffic for the test.
+    Active for tests marked @pytest.mark.vcr, or for every test when
+    --record-mode is once/new_episodes/all.
+    Cassettes live in tests/cassettes/<module>/<test>.json
+    """
+    record_mode = request.config.getoption("--record-mode")
+    if record_mode == "none" and not request.node.get_closest_marker("vcr"):
+        yield None
+        return
+    
+    from src.utils.cassette import use_cassette
+    path = CASSETTE_DIR / request.node.path.stem / f"{request.node.name}.json"
+    with use_cassette(str(path), record_mode) as cassette:
+        yield cassette
+
+
+@pytest.fixture(autouse=True)
+def otp_scheduler(request, monkeypatch):
+    """
+    Fresh Generate OTP scheduler for tests that never reach UAT (unit tests,
+    --upstox-mock, cassettes), so throttling recorded by one test does not
+    delay the next. Against UAT the process-wide scheduler is kept, since
+    the real server throttles mobiles across tests.
+    """
+    from src.utils.rate_limiter import NextAllowedScheduler
+    offline = (
+        "unit" in request.node.path.parts
+        or request.config.getoption("--upstox-mock")
+        or request.config.getoption("--record-mode") != "none"
+        or request.node.get_closest_marker("vcr")
+    )
+    if not offline:
+        yield None
+        return
+    
+    scheduler = NextAllowedScheduler()
+    monkeypatch.setattr("src.api_clients.upstox_auth_client.default_otp_scheduler", scheduler)
+    yield scheduler
+
 @pytest.fixture
 def unique_email():
     """Generate unique email for test isolation"""
@@ -110,6 +164,28 @@ def pytest_configure(config):
     """Configure pytest"""
     config.addinivalue_line("markers", "smoke: Smoke tests")
     config.addinivalue_line("markers", "regression: Regression tests")
+    Settings.ensure_directories()
+    
+    # Point every UpstoxAuthClient at a local mock server instead of UAT
+    if config.getoption("--upstox-mock"):
+        from src.mock_server import UpstoxMockServer
+        config._upstox_mock = UpstoxMockServer().start()
+        Settings.UPSTOX_BASE_URL = config._upstox_mock.base_url
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Export HTTP metrics collected by every HTTPClient"""
+    path_prefix = session.config.getoption("--http-metrics")
+    if path_prefix:
+        from src.utils.metrics import metrics_collector
+        metrics_collector.write(path_prefix)
+
+
+def pytest_unconfigure(config):
+    """Stop the Upstox mock server if it was started"""
+    server = getattr(config, "_upstox_mock", None)
+    if server:
+        server.stop()
 
 
 def pytest_collection_modifyitems(config, items):
@@ -183,7 +259,21 @@ def pytest_addoption(parser):
         "--record-mode",
         action="store",
         default="none",
-        help="Record mode for VCR (none, once, new_episodes, all)"
+        choices=("none", "once", "new_episodes", "all"),
+        help="Record mode for HTTP cassettes (none, once, new_episodes, all)"
+    )
+    parser.addoption(
+        "--http-metrics",
+        action="store",
+        default=None,
+        metavar="PATH_PREFIX",
+        help="Write per-endpoint HTTP metrics to PATH_PREFIX.json and PATH_PREFIX.prom"
+    )
+    parser.addoption(
+        "--upstox-mock",
+        action="store_true",
+        default=False,
+        help="Run Upstox tests against the bundled local mock server instead of UAT"
     )
 
 
@@ -7,18 +7,38 @@ Generates beautiful HTML/Markdown test reports with all required fields.
 Usage:
     python generate_test_report.py                    # Single test
     python generate_test_report.py --bulk 10          # Bulk test (10 leads)
+    python generate_test_report.py --bulk 1000 --concurrency 32 --rps 50
+                                                      # Concurrent bulk test
+    python generate_test_report.py --bulk 100 --metrics reports/http_metrics
+                                                      # + per-endpoint latency metrics
+    python generate_test_report.py --bulk 50000 --concurrency 32 --stream reports/soak [--resume]
+                                                      # Write each flow to NDJSON/CSV as it
+                                                      # finishes; --resume continues after a crash
 """
 import json
 import sys
+import time
 import argparse
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 
 # Add src to path
 sys.path.insert(0, 'src')
 
+from config.settings import Settings
+from src.api_clients.client_pool import ClientPool
 from src.api_clients.upstox_auth_client import UpstoxAuthClient
-from src.models.upstox_models import token_store
+from src.models.upstox_models import session_scope, token_store
+from src.utils.http_client import HTTPClient
+from src.utils.metrics import metrics_collector
+from src.utils.rate_limiter import RateLimitRegistry
+from src.utils.redaction import redact
+from src.utils.report_viewer import write_report_viewer
+from src.utils.report_writers import CSV_HEADER, StreamingReportWriter, csv_row
+from src.utils.result_records import FlowRecords
+from src.utils.results_db import ResultsStore, rows_from_flow_results
 from src.utils.mobile_generator import generate_unique_mobile
 from src.utils.email_generator import generate_random_email
 
@@ -26,32 +46,50 @@ from src.utils.email_generator import generate_random_email
 class TestReportGenerator:
     """Generates comprehensive test reports"""
     
-    def __init__(self):
+    def __init__(self, stream_to=None, resume=False):
+        """
+        Args:
+            stream_to: Path prefix; bulk results are appended to
+                       <prefix>.ndjson/.csv as each flow finishes instead of
+                       being kept in memory
+            resume: Continue an existing stream_to report, skipping done flows
+        """
         self.report_data = {
             "test_execution": {
                 "date": datetime.now().strftime("%Y-%m-%d"),
                 "time": datetime.now().strftime("%H:%M:%S"),
                 "timestamp": datetime.now().isoformat(),
                 "environment": "UAT",
-                "base_url": "https://service-uat.upstox.com"
+                "base_url": Settings.UPSTOX_BASE_URL
             },
             "test_data": {},
             "api_results": [],
             "summary": {}
         }
         self.bulk_mode = False
-        self.bulk_results = []
+        self.bulk_results = FlowRecords()  # Columnar; reads back as result dicts
+        self.stream = StreamingReportWriter(stream_to, resume=resume) if stream_to else None
+        self.rate_limits = None  # Overall --rps bucket plus configured quotas, set per bulk run
     
-    def run_single_test(self, test_number=1):
-        """Run single test and return results"""
-        print(f"\n{'='*70}")
-        if self.bulk_mode:
-            print(f"🚀 Running Test #{test_number}...")
-        else:
-            print("🚀 Running Complete 5-Stage Test Suite...")
-        print('='*70)
+    def run_single_test(self, test_number=1, client=None):
+        """
+        Run single test and return results
+        
+        Args:
+            test_number: Sequence number of this test
+            client: Pooled UpstoxAuthClient to reuse. When given, the flow runs
+                    in its own session_scope() and the client is left open.
+        """
+        concurrent = client is not None
+        if not concurrent:
+            print(f"\n{'='*70}")
+            if self.bulk_mode:
+                print(f"🚀 Running Test #{test_number}...")
+            else:
+                print("🚀 Running Complete 5-Stage Test Suite...")
+            print('='*70)
+            client = self._make_client()  # Uses dynamic request ID: QATestDDMMYYHHMM
         
-        client = UpstoxAuthClient()  # Uses dynamic request ID: QATestDDMMYYHHMM
         test_result = {
             "test_number": test_number,
             "timestamp": datetime.now().isoformat(),
@@ -69,31 +107,34 @@ class TestReportGenerator:
             test_result["email"] = email
             test_result["otp_used"] = otp
             
-            print(f"📱 Mobile: {mobile}")
-            print(f"📧 Email: {email}")
-            print("-" * 70)
+            self._print(concurrent, f"📱 Mobile: {mobile}")
+            self._print(concurrent, f"📧 Email: {email}")
+            self._print(concurrent, "-" * 70)
             
             # Stage 1: Generate OTP
-            stage1_response = client.generate_otp(mobile, save_token=True)
+            stage1_response, latency = self._timed(client.generate_otp, mobile, save_token=True)
+            latency -= client.last_otp_wait  # Not the time spent waiting for the mobile's slot
             stage1_pass = stage1_response.success
             test_result["stages"].append({
                 "stage": 1,
                 "api_name": "Generate OTP",
                 "status": "PASS" if stage1_pass else "FAIL",
+                "latency": latency,
                 "details": {"token_generated": bool(stage1_response.validate_otp_token)}
             })
-            print(f"   Stage 1: {'✅ PASS' if stage1_pass else '❌ FAIL'}")
+            self._print(concurrent, f"   Stage 1: {'✅ PASS' if stage1_pass else '❌ FAIL'}")
             
             if not stage1_pass:
                 raise Exception("Stage 1 Failed")
             
             # Stage 2: Verify OTP
-            stage2_response = client.verify_otp(otp=otp, mobile_number=mobile, save_profile_id=True)
+            stage2_response, latency = self._timed(client.verify_otp, otp=otp, mobile_number=mobile, save_profile_id=True)
             is_valid, _ = stage2_response.validate_success_response()
             test_result["stages"].append({
                 "stage": 2,
                 "api_name": "Verify OTP",
                 "status": "PASS" if is_valid else "FAIL",
+                "latency": latency,
                 "details": {
                     "user_type": stage2_response.user_type,
                     "profile_id": stage2_response.profile_id
@@ -101,52 +142,55 @@ class TestReportGenerator:
             })
             test_result["profile_id"] = stage2_response.profile_id
             test_result["user_type"] = stage2_response.user_type
-            print(f"   Stage 2: {'✅ PASS' if is_valid else '❌ FAIL'} | Profile: {stage2_response.profile_id}")
+            self._print(concurrent, f"   Stage 2: {'✅ PASS' if is_valid else '❌ FAIL'} | Profile: {stage2_response.profile_id}")
             
             if not is_valid:
                 raise Exception("Stage 2 Failed")
             
             # Stage 3: 2FA Authentication
-            stage3_response = client.two_factor_auth(otp=otp)
+            stage3_response, latency = self._timed(client.two_factor_auth, otp=otp)
             is_valid, _ = stage3_response.validate_success_response()
             test_result["stages"].append({
                 "stage": 3,
                 "api_name": "2FA Authentication",
                 "status": "PASS" if is_valid else "FAIL",
+                "latency": latency,
                 "details": {
                     "customer_status": stage3_response.customer_status
                 }
             })
             test_result["customer_status"] = stage3_response.customer_status
-            print(f"   Stage 3: {'✅ PASS' if is_valid else '❌ FAIL'} | Status: {stage3_response.customer_status}")
+            self._print(concurrent, f"   Stage 3: {'✅ PASS' if is_valid else '❌ FAIL'} | Status: {stage3_response.customer_status}")
             
             if not is_valid:
                 raise Exception("Stage 3 Failed")
             
             # Stage 4: Email Send OTP
-            stage4_response = client.email_send_otp(email=email)
+            stage4_response, latency = self._timed(client.email_send_otp, email=email)
             is_valid, _ = stage4_response.validate_success_response()
             test_result["stages"].append({
                 "stage": 4,
                 "api_name": "Email Send OTP",
                 "status": "PASS" if is_valid else "FAIL",
+                "latency": latency,
                 "details": {"email_used": email}
             })
-            print(f"   Stage 4: {'✅ PASS' if is_valid else '❌ FAIL'}")
+            self._print(concurrent, f"   Stage 4: {'✅ PASS' if is_valid else '❌ FAIL'}")
             
             if not is_valid:
                 raise Exception("Stage 4 Failed")
             
             # Stage 5: Email Verify OTP
-            stage5_response = client.email_verify_otp(email=email, otp=otp)
+            stage5_response, latency = self._timed(client.email_verify_otp, email=email, otp=otp)
             is_valid, _ = stage5_response.validate_success_response()
             test_result["stages"].append({
                 "stage": 5,
                 "api_name": "Email Verify OTP",
                 "status": "PASS" if is_valid else "FAIL",
+                "latency": latency,
                 "details": {"email_verified": email}
             })
-            print(f"   Stage 5: {'✅ PASS' if is_valid else '❌ FAIL'}")
+            self._print(concurrent, f"   Stage 5: {'✅ PASS' if is_valid else '❌ FAIL'}")
             
             if not is_valid:
                 raise Exception("Stage 5 Failed")
@@ -155,47 +199,149 @@ class TestReportGenerator:
             test_result["overall"] = "✅ ALL PASS"
             
         except Exception as e:
-            print(f"   ❌ Error: {e}")
+            self._print(concurrent, f"   ❌ Error: {e}")
             test_result["error"] = str(e)
             test_result["overall"] = "❌ FAILED"
         
         finally:
-            client.close()
-            token_store.clear_all()
+            if not concurrent:
+                client.close()
+                token_store.clear_all()
         
         return test_result
     
-    def run_bulk_tests(self, count=10):
-        """Run multiple tests for bulk lead generation"""
+    @staticmethod
+    def _timed(call, *args, **kwargs):
+        """call(*args, **kwargs) and the seconds it took"""
+        started = time.perf_counter()
+        result = call(*args, **kwargs)
+        return result, time.perf_counter() - started
+    
+    @staticmethod
+    def _print(concurrent, message):
+        """Print per-stage progress only in sequential mode (concurrent output would interleave)"""
+        if not concurrent:
+            print(message)
+    
+    def run_bulk_tests(self, count=10, concurrency=1, rps=None):
+        """
+        Run multiple tests for bulk lead generation
+        
+        Args:
+            count: Number of 5-stage flows to run
+            concurrency: Number of flows to run at once (1 = sequential)
+            rps: Global requests-per-second cap across all flows (None = unlimited)
+        """
         self.bulk_mode = True
+        # --rps is one overall bucket on top of the configured quotas
+        self.rate_limits = None
+        if rps:
+            self.rate_limits = RateLimitRegistry({**Settings.get_rate_limit_config(), "rate": rps, "burst": 1})
         print(f"\n🚀 BULK TEST MODE: Running {count} tests...")
+        if concurrency > 1 or rps:
+            print(f"   Concurrency: {concurrency} | Rate limit: {f'{rps} req/s' if rps else 'none'}")
         print("=" * 70)
         
-        for i in range(1, count + 1):
-            result = self.run_single_test(test_number=i)
-            self.bulk_results.append(result)
+        pending = [i for i in range(1, count + 1) if not self.stream or i not in self.stream.completed]
+        if len(pending) < count:
+            print(f"   Resuming: {count - len(pending)} tests already done")
         
-        # Calculate bulk summary
-        passed = sum(1 for r in self.bulk_results if r["status"] == "PASS")
-        failed = count - passed
+        if concurrency > 1:
+            self._run_concurrent_tests(pending, concurrency)
+        else:
+            for i in pending:
+                result = self.run_single_test(test_number=i)
+                self._store_result(result)
+        
+        # Calculate bulk summary over the results actually held (a resumed
+        # stream may also hold flows outside 1..count)
+        if self.stream:
+            total, passed = self.stream.total, self.stream.passed
+        else:
+            total, passed = len(self.bulk_results), self.bulk_results.passed_count()
+        failed = total - passed
+        success_rate = (passed / total) * 100 if total else 0.0
         
         self.report_data["bulk_summary"] = {
-            "total_tests": count,
+            "total_tests": total,
             "passed": passed,
             "failed": failed,
-            "success_rate": f"{(passed/count)*100:.1f}%",
+            "success_rate": f"{success_rate:.1f}%",
             "timestamp": datetime.now().isoformat()
         }
         
         print(f"\n{'='*70}")
         print("📊 BULK TEST SUMMARY")
         print('='*70)
-        print(f"   Total Tests: {count}")
+        print(f"   Total Tests: {total}")
         print(f"   Passed: ✅ {passed}")
         print(f"   Failed: ❌ {failed}")
-        print(f"   Success Rate: {(passed/count)*100:.1f}%")
+        print(f"   Success Rate: {success_rate:.1f}%")
         print('='*70)
     
+    def _store_result(self, result):
+        """Keep a finished flow: streamed to disk, or in bulk_results"""
+        if self.stream:
+            self.stream.write(result)
+        else:
+            self.bulk_results.append(result)
+    
+    def _report_rows(self):
+        """Bulk results for reports, streamed from disk when stream_to is set"""
+        return self.stream.results() if self.stream else iter(self.bulk_results)
+    
+    def record_history(self, path):
+        """Append this run's stage results to the SQLite results history"""
+        with ResultsStore(path) as store:
+            return store.record_run(
+                "bulk" if self.bulk_mode else "single",
+                rows_from_flow_results(self._report_rows()),
+                environment=Settings.ENV,
+                started_at=self.report_data["test_execution"]["timestamp"]
+            )
+    
+    def _make_client(self):
+        """UpstoxAuthClient for one flow, drawing from the run's rate limits if --rps is set"""
+        if self.rate_limits is None:
+            return UpstoxAuthClient()
+        http_client = HTTPClient(base_url=Settings.UPSTOX_BASE_URL, rate_limits=self.rate_limits)
+        return UpstoxAuthClient(http_client=http_client)
+    
+    def _run_concurrent_tests(self, test_numbers, concurrency):
+        """
+        Run the given flows on ``concurrency`` threads sharing a client pool
+
+        Flows are submitted through a window of ``concurrency`` futures and
+        each result is stored as soon as it completes, so neither pending
+        futures nor finished result dicts accumulate over a long run.
+        """
+        def run_flow(test_number):
+            with pool.client() as client, session_scope():
+                return self.run_single_test(test_number=test_number, client=client)
+        
+        completed, count = 0, len(test_numbers)
+        pending = iter(test_numbers)
+        with ClientPool(self._make_client, size=concurrency) as pool:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                running = set()
+                while True:
+                    # Top up in-flight flows; only these (not the whole run) are held in memory
+                    for test_number in islice(pending, concurrency - len(running)):
+                        running.add(executor.submit(run_flow, test_number))
+                    if not running:
+                        break
+                    
+                    done, running = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        result = future.result()
+                        self._store_result(result)
+                        completed += 1
+                        status_icon = "✅" if result["status"] == "PASS" else "❌"
+                        print(f"   [{completed}/{count}] Test #{result['test_number']}: "
+                              f"{status_icon} {result['status']} | {result.get('mobile_number', 'N/A')}")
+        
+        self.bulk_results.sort()
+    
     def generate_html_report(self, filename="reports/test_report.html"):
         """Generate beautiful HTML report"""
         Path(filename).parent.mkdir(parents=True, exist_ok=True)
@@ -417,204 +563,58 @@ class TestReportGenerator:
         return filename
     
     def _generate_bulk_html_report(self, filename):
-        """Generate HTML report for bulk tests"""
+        """
+        Generate HTML report for bulk tests
+
+        Results are embedded as a compact columnar blob and rendered by a
+        virtual-scrolling table (filter, sort, summary charts), so a 50k-flow
+        report opens as fast as a 10-flow one. Rows are written one at a time.
+        """
         summary = self.report_data.get("bulk_summary", {})
-        
-        html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Upstox API Bulk Test Report</title>
-    <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            padding: 20px;
-            min-height: 100vh;
-        }}
-        .container {{ max-width: 1200px; margin: 0 auto; }}
-        .header {{
-            background: white;
-            border-radius: 15px;
-            padding: 30px;
-            margin-bottom: 20px;
-            box-shadow: 0 10px 40px rgba(0,0,0,0.1);
-            text-align: center;
-        }}
-        .header h1 {{ color: #333; font-size: 2em; margin-bottom: 10px; }}
-        .summary-cards {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
-            gap: 15px;
-            margin-bottom: 20px;
-        }}
-        .summary-card {{
-            background: white;
-            border-radius: 10px;
-            padding: 20px;
-            text-align: center;
-            box-shadow: 0 5px 20px rgba(0,0,0,0.1);
-        }}
-        .summary-card h3 {{
-            color: #667eea;
-            font-size: 0.8em;
-            text-transform: uppercase;
-            margin-bottom: 10px;
-        }}
-        .summary-card .number {{
-            font-size: 2em;
-            font-weight: bold;
-            color: #333;
-        }}
-        .summary-card.pass {{ border-top: 4px solid #11998e; }}
-        .summary-card.fail {{ border-top: 4px solid #eb3349; }}
-        .leads-table {{
-            background: white;
-            border-radius: 15px;
-            overflow: hidden;
-            box-shadow: 0 10px 40px rgba(0,0,0,0.1);
-        }}
-        .leads-table h2 {{
-            padding: 20px;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            margin: 0;
-            font-size: 1.3em;
-        }}
-        table {{ width: 100%; border-collapse: collapse; }}
-        th {{
-            background: #f8f9fa;
-            padding: 12px;
-            text-align: left;
-            font-weight: 600;
-            color: #555;
-            border-bottom: 2px solid #e9ecef;
-            font-size: 0.85em;
-        }}
-        td {{
-            padding: 10px 12px;
-            border-bottom: 1px solid #e9ecef;
-            font-size: 0.9em;
-        }}
-        tr:hover {{ background: #f8f9fa; }}
-        tr.pass {{ background: #f0fff4; }}
-        tr.fail {{ background: #fff5f5; }}
-        .badge {{
-            padding: 3px 8px;
-            border-radius: 10px;
-            font-size: 0.75em;
-            font-weight: bold;
-        }}
-        .badge-pass {{ background: #d4edda; color: #155724; }}
-        .badge-fail {{ background: #f8d7da; color: #721c24; }}
-        .footer {{
-            text-align: center;
-            color: white;
-            opacity: 0.8;
-            padding: 20px;
-            font-size: 0.9em;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <!-- Header -->
-        <div class="header">
-            <h1>🚀 Upstox API Bulk Test Report</h1>
-            <p style="color: #666; margin-top: 10px;">
-                Bulk Lead Generation | {summary.get('total_tests', 0)} Leads | 
-                Date: <strong>{self.report_data['test_execution']['date']}</strong>
-            </p>
-        </div>
-        
-        <!-- Summary Cards -->
-        <div class="summary-cards">
-            <div class="summary-card">
-                <h3>Total Leads</h3>
-                <div class="number">{summary.get('total_tests', 0)}</div>
-            </div>
-            <div class="summary-card pass">
-                <h3>Passed</h3>
-                <div class="number" style="color: #11998e;">{summary.get('passed', 0)}</div>
-            </div>
-            <div class="summary-card fail">
-                <h3>Failed</h3>
-                <div class="number" style="color: #eb3349;">{summary.get('failed', 0)}</div>
-            </div>
-            <div class="summary-card">
-                <h3>Success Rate</h3>
-                <div class="number">{summary.get('success_rate', '0%')}</div>
-            </div>
-        </div>
-        
-        <!-- Leads Table -->
-        <div class="leads-table">
-            <h2>📋 Generated Leads Details</h2>
-            <table>
-                <thead>
-                    <tr>
-                        <th>#</th>
-                        <th>Mobile Number</th>
-                        <th>Email</th>
-                        <th>Profile ID</th>
-                        <th>User Type</th>
-                        <th>Customer Status</th>
-                        <th>Status</th>
-                    </tr>
-                </thead>
-                <tbody>
-"""
-        
-        # Add rows for each lead
-        for result in self.bulk_results:
-            row_class = "pass" if result.get('status') == 'PASS' else "fail"
-            html += f"""
-                    <tr class="{row_class}">
-                        <td><strong>{result['test_number']}</strong></td>
-                        <td>{result.get('mobile_number', 'N/A')}</td>
-                        <td>{result.get('email', 'N/A')}</td>
-                        <td>{result.get('profile_id', 'N/A')}</td>
-                        <td>{result.get('user_type', 'N/A')}</td>
-                        <td>{result.get('customer_status', 'N/A')}</td>
-                        <td><span class="badge {'badge-pass' if result.get('status') == 'PASS' else 'badge-fail'}">{result.get('status', 'FAIL')}</span></td>
-                    </tr>
-"""
-        
-        html += f"""
-                </tbody>
-            </table>
-        </div>
-        
-        <div class="footer">
-            <p>Generated by Upstox API Automation Framework | Bulk Mode | {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
-        </div>
-    </div>
-</body>
-</html>
-"""
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(html)
+        rows = (csv_row(result) for result in self._report_rows())
+        
+        write_report_viewer(
+            filename,
+            title="🚀 Upstox API Bulk Test Report",
+            columns=CSV_HEADER,
+            rows=rows,
+            status_column="Overall Status",
+            charts=("Overall Status", "User Type", "Customer Status"),
+            subtitle=f"Bulk Lead Generation | {summary.get('total_tests', 0)} tests | "
+                     f"Success Rate: {summary.get('success_rate', '0%')} | "
+                     f"Environment: {Settings.ENV.upper()}",
+            footer=f"Generated by Upstox API Automation Framework | Bulk Mode | "
+                   f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            widths={"Test #": "80px", "Email": "2fr", "Overall Status": "120px"}
+        )
         
         print(f"📄 Bulk HTML Report saved: {filename}")
         return filename
     
     def generate_json_report(self, filename="reports/test_report.json"):
-        """Generate JSON report"""
+        """Generate JSON report (bulk results are written one at a time)"""
         Path(filename).parent.mkdir(parents=True, exist_ok=True)
         
-        data = {
-            "test_execution": self.report_data['test_execution'],
-            "results": self.bulk_results if self.bulk_mode else (self.bulk_results[0] if self.bulk_results else {})
-        }
-        
-        if self.bulk_mode:
-            data["bulk_summary"] = self.report_data.get("bulk_summary", {})
+        if not self.bulk_mode:
+            data = {
+                "test_execution": self.report_data['test_execution'],
+                "results": self.bulk_results[0] if self.bulk_results else {}
+            }
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(redact(data), f, indent=2)
+            print(f"📄 JSON Report saved: {filename}")
+            return filename
         
         with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+            f.write('{\n  "test_execution": ')
+            f.write(json.dumps(redact(self.report_data['test_execution']), indent=2))
+            f.write(',\n  "results": [')
+            for index, result in enumerate(self._report_rows()):
+                f.write(",\n    " if index else "\n    ")
+                f.write(json.dumps(redact(result)))
+            f.write('\n  ],\n  "bulk_summary": ')
+            f.write(json.dumps(redact(self.report_data.get("bulk_summary", {})), indent=2))
+            f.write('\n}\n')
         
         print(f"📄 JSON Report saved: {filename}")
         return filename
@@ -627,18 +627,10 @@ class TestReportGenerator:
         
         with open(filename, 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
-            writer.writerow(['Test #', 'Mobile Number', 'Email', 'Profile ID', 'User Type', 'Customer Status', 'Overall Status'])
+            writer.writerow(CSV_HEADER)
             
-            for result in self.bulk_results:
-                writer.writerow([
-                    result['test_number'],
-                    result.get('mobile_number', ''),
-                    result.get('email', ''),
-                    result.get('profile_id', ''),
-                    result.get('user_type', ''),
-                    result.get('customer_status', ''),
-                    result.get('status', 'FAIL')
-                ])
+            for result in self._report_rows():
+                writer.writerow(csv_row(result))
         
         print(f"📄 CSV Report saved: {filename}")
         return filename
@@ -664,7 +656,7 @@ class TestReportGenerator:
             print("-" * 80)
             print(f"   {'#':<4} {'Mobile':<12} {'Email':<25} {'Profile ID':<12} {'Status':<8}")
             print("-" * 80)
-            for result in self.bulk_results:
+            for result in self._report_rows():
                 status_icon = "✅" if result.get('status') == 'PASS' else "❌"
                 print(f"   {result['test_number']:<4} {result.get('mobile_number', 'N/A'):<12} {result.get('email', 'N/A'):<25} {str(result.get('profile_id', 'N/A')):<12} {status_icon} {result.get('status', 'FAIL')}")
         else:
@@ -696,18 +688,34 @@ def main():
     """Main function"""
     parser = argparse.ArgumentParser(description='Upstox API Test Report Generator')
     parser.add_argument('--bulk', type=int, metavar='N', help='Run N bulk tests')
+    parser.add_argument('--concurrency', type=int, default=1, metavar='N',
+                        help='Run N bulk flows at once (default: 1)')
+    parser.add_argument('--rps', type=float, default=None, metavar='R',
+                        help='Global requests-per-second cap across all flows')
+    parser.add_argument('--metrics', type=str, default=None, metavar='PATH_PREFIX',
+                        help='Write per-endpoint HTTP metrics to PATH_PREFIX.json/.prom')
+    parser.add_argument('--stream', type=str, default=None, metavar='PATH_PREFIX',
+                        help='Append each bulk flow to PATH_PREFIX.ndjson/.csv as it finishes')
+    parser.add_argument('--resume', action='store_true',
+                        help='With --stream: continue an interrupted run, skipping finished flows')
+    parser.add_argument('--results-db', type=str, default=None, metavar='PATH',
+                        help='Append stage results to this SQLite results history (e.g. reports/results_history.db)')
     args = parser.parse_args()
     
     print("\n🚀 Upstox API Test Report Generator")
     print("=" * 70)
     
-    generator = TestReportGenerator()
+    generator = TestReportGenerator(stream_to=args.stream if args.bulk else None, resume=args.resume)
     
     if args.bulk:
         # Bulk mode
-        generator.run_bulk_tests(count=args.bulk)
+        generator.run_bulk_tests(count=args.bulk, concurrency=args.concurrency, rps=args.rps)
         generator.print_console_report()
         
+        if args.results_db:
+            generator.record_history(args.results_db)  # Before the stream is closed
+            print(f"   🗄️  Results history: {args.results_db}")
+        
         # [DISABLED] Hardcoded reports - using Allure reporting instead
         # print("\n📄 Generating Reports...")
         # print("-" * 70)
@@ -715,6 +723,11 @@ def main():
         # generator.generate_json_report("reports/bulk_test_report.json")
         # generator.generate_csv_report("reports/bulk_test_report.csv")
         
+        if generator.stream:
+            generator.generate_html_report(f"{args.stream}.html")  # Rendered from the NDJSON
+            generator.stream.close()
+            print(f"   📄 Streamed results: {args.stream}.ndjson / {args.stream}.csv")
+        
         print(f"\n✅ Bulk test completed!")
         print(f"   📊 Use Allure for reporting: pytest --alluredir=reports/allure-results")
     else:
@@ -723,6 +736,10 @@ def main():
         generator.bulk_results.append(result)  # Add to list for report generation
         generator.print_console_report()
         
+        if args.results_db:
+            generator.record_history(args.results_db)
+            print(f"   🗄️  Results history: {args.results_db}")
+        
         # [DISABLED] Hardcoded reports - using Allure reporting instead
         # print("\n📄 Generating Reports...")
         # print("-" * 70)
@@ -731,6 +748,10 @@ def main():
         
         print(f"\n✅ Test completed!")
         print(f"   📊 Use Allure for reporting: pytest --alluredir=reports/allure-results")
+    
+    if args.metrics:
+        metrics_collector.write(args.metrics)
+        print(f"   📈 HTTP metrics: {args.metrics}.json / {args.metrics}.prom")
 
 
 if __name__ == "__main__":
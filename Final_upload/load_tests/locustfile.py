@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Locust Load Test - Upstox 5-Stage Onboarding Flow
+Each virtual user runs StageManager journeys with its own mobile number,
+email and token session; every stage is reported twice:
+    POST  <stage name>   raw HTTP latency of the stage's API call
+    STAGE <stage name>   full stage (call + parsing + validation), failed
+                         when the stage's business validation fails
+
+Usage:
+    # Against UAT (default host: Settings.UPSTOX_BASE_URL)
+    locust -f load_tests/locustfile.py --headless -u 20 -r 5 -t 2m --csv reports/load
+
+    # Against the bundled mock server, started in-process
+    locust -f load_tests/locustfile.py --headless -u 50 -r 10 -t 1m --upstox-mock
+
+    # Against a separately started mock (python -m src.mock_server)
+    locust -f load_tests/locustfile.py --headless -u 200 -r 20 -t 5m --host http://127.0.0.1:8765
+
+    # Weight where journeys stop: 20% after stage 1, 30% after stage 2, 50% full flow
+    locust -f load_tests/locustfile.py ... --stage-weights 2,3,0,0,5
+
+Client-side rate limits (environments.yaml `rate_limits`) are always off
+here: Locust controls the load, and waits on a local token bucket would
+cap throughput and inflate the STAGE percentiles.
+"""
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+from locust import SequentialTaskSet, HttpUser, between, events, task
+
+# Make project imports work when run from any directory
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from config.settings import Settings
+from src.api_clients.upstox_auth_client import UpstoxAuthClient
+from src.auto_flow.scheduler import DEFAULT_STAGE_GRAPH
+from src.auto_flow.stages import StageManager
+from src.models.upstox_models import SessionContext
+from src.utils.email_generator import generate_random_email
+from src.utils.http_client import HTTPClient
+from src.utils.mobile_generator import generate_unique_mobile
+from src.utils.rate_limiter import RateLimitRegistry
+
+
+STAGES = [(stage["name"], stage["handler"]) for stage in DEFAULT_STAGE_GRAPH]
+PERCENTILES = (0.50, 0.95, 0.99)
+
+
+# ═══════════════════════════════════════════════════════════════════
+# COMMAND LINE OPTIONS / MOCK SERVER
+# ═══════════════════════════════════════════════════════════════════
+
+@events.init_command_line_parser.add_listener
+def add_arguments(parser):
+    """Extra Locust options for the onboarding flow"""
+    parser.add_argument("--upstox-mock", action="store_true", default=False,
+                        help="Start the local Upstox mock server and target it")
+    parser.add_argument("--stage-weights", type=str, default="0,0,0,0,1",
+                        help="Relative weight of journeys ending after stage 1..5")
+    parser.add_argument("--otp", type=str, default="123789", help="OTP used for every stage")
+    parser.add_argument("--summary-json", type=str, default="reports/load_test_summary.json",
+                        help="Where to write per-stage throughput/percentiles ('' to disable)")
+
+
+def parse_stage_weights(value: str) -> list:
+    """Parse '--stage-weights 2,3,0,0,5' into five non-negative weights"""
+    weights = [float(part) for part in value.split(",")]
+    if len(weights) != len(STAGES) or any(w < 0 for w in weights) or not any(weights):
+        raise ValueError(f"--stage-weights needs {len(STAGES)} non-negative weights, got: {value}")
+    return weights
+
+
+@events.init.add_listener
+def on_init(environment, **kwargs):
+    """Start the mock server (if requested) and default the host"""
+    options = environment.parsed_options
+    if options is None:
+        return
+    options.stage_weight_list = parse_stage_weights(options.stage_weights)
+
+    if options.upstox_mock:
+        from src.mock_server import UpstoxMockServer
+        environment.upstox_mock = UpstoxMockServer().start()
+        environment.host = environment.upstox_mock.base_url
+    elif not environment.host:
+        environment.host = Settings.UPSTOX_BASE_URL
+    print(f"🎯 Load test target: {environment.host}")
+
+
+# ═══════════════════════════════════════════════════════════════════
+# ONBOARDING JOURNEY
+# ═══════════════════════════════════════════════════════════════════
+
+class OnboardingJourney(SequentialTaskSet):
+    """
+    One onboarding journey: stages 1..depth in order with a fresh
+    mobile/email; tokens are handed between stages through the
+    user's SessionContext. The journey ends after `depth` stages or on
+    the first failed stage, and the next one starts with new data.
+    """
+
+    def on_start(self):
+        options = self.user.environment.parsed_options
+        weights = getattr(options, "stage_weight_list", None) or [0, 0, 0, 0, 1]
+        self.depth = random.choices(range(1, len(STAGES) + 1), weights=weights)[0]
+        self.user.session.clear_all()
+        self.stage_manager = StageManager(
+            self.user.upstox,
+            mobile_number=generate_unique_mobile(),
+            email=generate_random_email(),
+            otp=getattr(options, "otp", "123789")
+        )
+
+    def _run_stage(self, number: int):
+        """Run stage `number`, report it, and end the journey when done or failed"""
+        name, handler = STAGES[number - 1]
+        start = time.perf_counter()
+        exception = None
+        try:
+            with self.client.rename_request(name):
+                result = getattr(self.stage_manager, handler)()
+            if not result.success:
+                exception = AssertionError(result.message)
+        except Exception as e:
+            exception = e
+
+        self.user.environment.events.request.fire(
+            request_type="STAGE",
+            name=name,
+            response_time=(time.perf_counter() - start) * 1000,
+            response_length=0,
+            exception=exception,
+            context={"mobile_number": self.stage_manager.mobile_number}
+        )
+        if exception or number >= self.depth:
+            self.interrupt(reschedule=False)
+
+    @task
+    def stage1_generate_otp(self):
+        self._run_stage(1)
+
+    @task
+    def stage2_verify_otp(self):
+        self._run_stage(2)
+
+    @task
+    def stage3_two_fa(self):
+        self._run_stage(3)
+
+    @task
+    def stage4_email_send_otp(self):
+        self._run_stage(4)
+
+    @task
+    def stage5_email_verify_otp(self):
+        self._run_stage(5)
+
+
+class UpstoxOnboardingUser(HttpUser):
+    """Virtual user with its own Upstox client (on Locust's session) and token session"""
+
+    tasks = [OnboardingJourney]
+    wait_time = between(0.5, 2)
+
+    def on_start(self):
+        self.session = SessionContext(name=f"locust-user-{id(self)}")
+        # No client-side retries or rate limits: the load test must see every
+        # failure and real server latency
+        http = HTTPClient(base_url=self.host, retry_attempts=0, session=self.client,
+                          rate_limits=RateLimitRegistry({}))
+        self.upstox = UpstoxAuthClient(http_client=http, store=self.session, base_url=self.host)
+
+
+# ═══════════════════════════════════════════════════════════════════
+# SUMMARY
+# ═══════════════════════════════════════════════════════════════════
+
+def stage_summary(stats) -> list:
+    """Throughput and latency percentiles for every stage (STAGE and HTTP entries)"""
+    rows = []
+    for (name, method), entry in sorted(stats.entries.items()):
+        rows.append({
+            "name": name,
+            "type": method,
+            "requests": entry.num_requests,
+            "failures": entry.num_failures,
+            "rps": round(entry.total_rps, 2),
+            "avg_ms": round(entry.avg_response_time, 1),
+            **{
+                f"p{int(p * 100)}_ms": entry.get_response_time_percentile(p)
+                for p in PERCENTILES
+            },
+        })
+    return rows
+
+
+@events.quitting.add_listener
+def on_quitting(environment, **kwargs):
+    """Print per-stage percentiles, write the JSON summary and stop the mock server"""
+    rows = stage_summary(environment.stats)
+
+    print("\n" + "=" * 100)
+    print(f"{'Type':<6} {'Name':<32} {'Reqs':>7} {'Fails':>6} {'RPS':>7} {'p50':>7} {'p95':>7} {'p99':>7}")
+    print("-" * 100)
+    for row in rows:
+        print(f"{row['type']:<6} {row['name']:<32} {row['requests']:>7} {row['failures']:>6} "
+              f"{row['rps']:>7} {row['p50_ms']:>7} {row['p95_ms']:>7} {row['p99_ms']:>7}")
+    print("=" * 100)
+
+    options = environment.parsed_options
+    summary_path = getattr(options, "summary_json", "") if options else ""
+    if summary_path:
+        Path(summary_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(summary_path, 'w') as f:
+            json.dump({"host": environment.host, "stages": rows}, f, indent=2)
+        print(f"📄 Load test summary: {summary_path}")
+
+    server = getattr(environment, "upstox_mock", None)
+    if server:
+        server.stop()
@@ -7,6 +7,7 @@ import requests
 
 from src.utils.http_client import HTTPClient
 from src.utils.logger import logger
+from config.registry import config_registry
 from config.settings import Settings
 
 T = TypeVar('T', bound=BaseModel)
@@ -21,9 +22,25 @@ class BaseAPIClient:
     def __init__(
         self,
         http_client: Optional[HTTPClient] = None,
-        base_url: Optional[str] = None
+        base_url: Optional[str] = None,
+        env: Optional[str] = None
     ):
-        self.http = http_client or HTTPClient(base_url=base_url)
+        """
+        Args:
+            http_client: Pre-configured HTTP client
+            base_url: Server to target (default: the environment's base_url)
+            env: Environment from environments.yaml (default: Settings.ENV).
+                 Clients for different environments can be used side by side.
+        """
+        if http_client is None:
+            snapshot = config_registry.snapshot
+            environment = snapshot.env(env) if env else snapshot.environments.get(Settings.ENV)
+            http_client = HTTPClient(
+                base_url=base_url or (environment.base_url if environment else None),
+                timeout=environment.timeout if environment else 30,
+                retry_attempts=environment.retry_attempts if environment else 3
+            )
+        self.http = http_client
         self._authenticate()
     
     def _authenticate(self):
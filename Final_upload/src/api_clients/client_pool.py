@@ -0,0 +1,81 @@
+"""
+Client Pool - reuse API clients (and their keep-alive connections) across flows
+"""
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Callable, Generic, Iterator, List, TypeVar
+
+from src.utils.logger import logger
+
+C = TypeVar('C')
+
+
+class ClientPool(Generic[C]):
+    """
+    Fixed-size, thread-safe pool of API clients.
+
+    Clients are created lazily by ``factory`` up to ``size`` and handed back
+    to the pool after each flow, so their HTTP sessions (and TCP+TLS
+    connections) are reused instead of re-established per flow.
+
+    Example:
+        >>> pool = ClientPool(lambda: UpstoxAuthClient(), size=8)
+        >>> with pool.client() as client:
+        ...     client.generate_otp("9870165199")
+        >>> pool.close()
+    """
+
+    def __init__(self, factory: Callable[[], C], size: int):
+        if size < 1:
+            raise ValueError(f"size must be at least 1, got: {size}")
+        self.factory = factory
+        self.size = size
+        self._idle: "queue.LifoQueue[C]" = queue.LifoQueue()
+        self._created: List[C] = []
+        self._lock = threading.Lock()
+
+    def acquire(self) -> C:
+        """Take an idle client, creating one if the pool is not full yet"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if len(self._created) < self.size:
+                client = self.factory()
+                self._created.append(client)
+                return client
+
+        # Pool exhausted - wait for another flow to release a client
+        return self._idle.get()
+
+    def release(self, client: C):
+        """Return a client to the pool"""
+        self._idle.put(client)
+
+    @contextmanager
+    def client(self) -> Iterator[C]:
+        """Borrow a client for the duration of a with-block"""
+        client = self.acquire()
+        try:
+            yield client
+        finally:
+            self.release(client)
+
+    def close(self):
+        """Close every client created by the pool"""
+        with self._lock:
+            for client in self._created:
+                try:
+                    client.close()
+                except Exception as e:
+                    logger.warning(f"Failed to close pooled client: {e}")
+            self._created.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
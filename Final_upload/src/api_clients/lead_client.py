@@ -2,9 +2,18 @@
 Lead Generation API Client
 Implements all 7 Lead Generation API endpoints
 """
-from typing import List, Optional, Dict, Any
+import copy
+import math
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Dict, Any
 import requests
+from urllib3.exceptions import NewConnectionError
 
+from config.registry import config_registry
 from src.api_clients.base_client import BaseAPIClient
 from src.models.lead_models import (
     CreateLeadRequest,
@@ -14,11 +23,22 @@ from src.models.lead_models import (
     LeadStatusResponse,
     BulkImportRequest,
     BulkImportResponse,
+    LeadCreationResult,
     LEAD_RESPONSE_SCHEMA,
     LEAD_LIST_SCHEMA
 )
 from src.utils.assertions import APIAssertions
+from src.utils.http_client import HTTPClient
 from src.utils.logger import logger
+from src.utils.polling import poll
+
+
+def _never_sent(error: requests.exceptions.RequestException) -> bool:
+    """True if the request failed before reaching the server (safe to resend)"""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(error, requests.exceptions.ConnectionError) and isinstance(reason, NewConnectionError)
 
 
 class LeadAPIClient(BaseAPIClient):
@@ -33,8 +53,15 @@ class LeadAPIClient(BaseAPIClient):
     5. GET    /api/v1/leads              - List Leads
     6. GET    /api/v1/leads/{lead_id}/status - Get Lead Status
     7. POST   /api/v1/leads/bulk-import  - Bulk Import Leads
+    
+    
+    The class attributes are the default paths; each client overrides them
+    with apis.lead_generation.endpoints from environments.yaml, resolved
+    once per client (a config reload applies to new clients).
     """
     
+    API_NAME = "lead_generation"
+    
     # API Endpoints
     CREATE_LEAD = "/api/v1/leads"
     GET_LEAD = "/api/v1/leads/{lead_id}"
@@ -44,6 +71,31 @@ class LeadAPIClient(BaseAPIClient):
     LEAD_STATUS = "/api/v1/leads/{lead_id}/status"
     BULK_IMPORT = "/api/v1/leads/bulk-import"
     
+    # Attribute -> endpoint name in the config
+    _CONFIG_ENDPOINTS = {
+        "CREATE_LEAD": "create_lead",
+        "GET_LEAD": "get_lead",
+        "UPDATE_LEAD": "update_lead",
+        "DELETE_LEAD": "delete_lead",
+        "LIST_LEADS": "list_leads",
+        "LEAD_STATUS": "lead_status",
+        "BULK_IMPORT": "bulk_import",
+    }
+    
+    def __init__(
+        self,
+        http_client: Optional[HTTPClient] = None,
+        base_url: Optional[str] = None,
+        env: Optional[str] = None
+    ):
+        super().__init__(http_client=http_client, base_url=base_url, env=env)
+        
+        # Configured paths override the class defaults for this client
+        endpoints = config_registry.snapshot.api(self.API_NAME).endpoints
+        for attribute, name in self._CONFIG_ENDPOINTS.items():
+            if name in endpoints:
+                setattr(self, attribute, endpoints[name].path)
+    
     # ═══════════════════════════════════════════════════════════════
     # 1. CREATE LEAD
     # ═══════════════════════════════════════════════════════════════
@@ -225,6 +277,75 @@ class LeadAPIClient(BaseAPIClient):
         
         return self._handle_response(response, LeadListResponse)
     
+    def iter_leads(
+        self,
+        page_size: int = 100,
+        prefetch: int = 4,
+        limit: Optional[int] = None,
+        validate_response: bool = True,
+        **filters
+    ) -> Iterator[LeadResponse]:
+        """
+        Iterate over all leads, paging transparently
+        
+        The first page is fetched to learn the total; after that up to
+        `prefetch` pages are fetched concurrently ahead of the consumer,
+        so at most (prefetch + 1) pages are held in memory. Breaking out
+        of the loop (or hitting `limit`) cancels the outstanding pages.
+        
+        Args:
+            page_size: Items per page
+            prefetch: Pages fetched ahead of the consumer (0 = serial)
+            limit: Stop after this many leads
+            validate_response: Whether to validate each page's schema
+            **filters: status / source / search, as for list_leads
+            
+        Yields:
+            LeadResponse objects in list order
+            
+        Example:
+            >>> for lead in client.iter_leads(page_size=200, status="new"):
+            ...     export(lead)
+        """
+        def fetch(page: int) -> LeadListResponse:
+            return self.list_leads(page=page, page_size=page_size,
+                                   validate_response=validate_response, **filters)
+        
+        first = fetch(1)
+        last_page = max(1, math.ceil(first.total / page_size))
+        yielded = 0
+        
+        executor = ThreadPoolExecutor(max_workers=prefetch) if prefetch > 0 else None
+        pending = deque()
+        next_page = 2
+        try:
+            page = first
+            while True:
+                # Keep up to `prefetch` pages in flight behind the current one
+                while executor and len(pending) < prefetch and next_page <= last_page:
+                    pending.append(executor.submit(fetch, next_page))
+                    next_page += 1
+                
+                for lead in page.leads:
+                    if limit is not None and yielded >= limit:
+                        return
+                    yield lead
+                    yielded += 1
+                
+                # A short page means the listing ended early (e.g. leads were deleted)
+                if len(page.leads) < page_size:
+                    return
+                if pending:
+                    page = pending.popleft().result()
+                elif next_page <= last_page:
+                    page = fetch(next_page)
+                    next_page += 1
+                else:
+                    return
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+    
     def list_leads_raw(self, **params) -> requests.Response:
         """List leads raw response (for testing)"""
         return self.http.get(self.LIST_LEADS, params=params)
@@ -266,7 +387,8 @@ class LeadAPIClient(BaseAPIClient):
         self,
         leads: List[CreateLeadRequest],
         skip_validation: bool = False,
-        validate_response: bool = True
+        validate_response: bool = True,
+        headers: Optional[Dict[str, str]] = None
     ) -> BulkImportResponse:
         """
         Bulk import leads
@@ -275,6 +397,7 @@ class LeadAPIClient(BaseAPIClient):
             leads: List of lead data
             skip_validation: Skip validation on server side
             validate_response: Whether to validate response
+            headers: Extra request headers (e.g. an idempotency key)
             
         Returns:
             BulkImportResponse object
@@ -288,11 +411,190 @@ class LeadAPIClient(BaseAPIClient):
         
         response = self.http.post(
             self.BULK_IMPORT,
-            json=request_data.model_dump(by_alias=True, exclude_none=True)
+            json=request_data.model_dump(by_alias=True, exclude_none=True),
+            headers=headers or {}
         )
         
         return self._handle_response(response, BulkImportResponse)
     
+    def bulk_import_chunked(
+        self,
+        leads: Iterable[CreateLeadRequest],
+        chunk_size: int = 500,
+        max_workers: int = 4,
+        chunk_retries: int = 2,
+        retry_backoff: float = 1.0,
+        skip_validation: bool = False,
+        idempotency_header: Optional[str] = None
+    ) -> BulkImportResponse:
+        """
+        Bulk import any number of leads as concurrent chunks
+        
+        Leads are read lazily and split into chunks of `chunk_size`; at
+        most `max_workers` chunks are in flight. Bulk import is not
+        idempotent, so chunks go through a client that never resends a
+        request the server may have processed, and a failed chunk is only
+        retried on its own (with exponential backoff) when it provably was
+        not imported: a connection failure before sending, or a 429. With
+        `idempotency_header` set (the server deduplicates on it), each chunk
+        carries a stable key and timeouts and 5xx are retried too. A chunk
+        that still fails counts all its leads as failed. Per-lead error
+        "index" values are offset to positions in the full input.
+        
+        Args:
+            leads: Lead data (list or generator)
+            chunk_size: Leads per bulk-import request
+            max_workers: Chunks sent at once
+            chunk_retries: Extra attempts per failed chunk
+            retry_backoff: Base delay (seconds) between chunk attempts
+            skip_validation: Skip validation on server side
+            idempotency_header: Header the server deduplicates requests by
+                                (e.g. "Idempotency-Key"); None if unsupported
+            
+        Returns:
+            One BulkImportResponse aggregated over all chunks
+            
+        Example:
+            >>> leads = (make_lead(n) for n in range(100_000))
+            >>> result = client.bulk_import_chunked(leads, chunk_size=1000, max_workers=8)
+        """
+        def chunk_failed(chunk_number: int, offset: int, chunk: list, error: Exception) -> BulkImportResponse:
+            logger.error(f"❌ Bulk chunk {chunk_number} failed ({len(chunk)} leads): {error}")
+            return BulkImportResponse(imported=0, failed=len(chunk), errors=[{
+                "chunk": chunk_number, "offset": offset, "size": len(chunk), "error": str(error)
+            }])
+        
+        def send(chunk_number: int, offset: int, chunk: List[CreateLeadRequest]) -> BulkImportResponse:
+            # One key per chunk, reused by its retries so the server can deduplicate
+            extra = {"headers": {idempotency_header: str(uuid.uuid4())}} if idempotency_header else {}
+            for attempt in range(chunk_retries + 1):
+                try:
+                    result = sender.bulk_import(chunk, skip_validation=skip_validation, **extra)
+                    break
+                except requests.exceptions.RequestException as e:
+                    status = getattr(e.response, "status_code", None)
+                    if status == 429 or _never_sent(e):
+                        retryable = True
+                    else:
+                        retryable = idempotency_header is not None and (status is None or status >= 500)
+                    if not retryable or attempt == chunk_retries:
+                        return chunk_failed(chunk_number, offset, chunk, e)
+                    logger.warning(f"⚠ Bulk chunk {chunk_number} attempt {attempt + 1} failed, retrying: {e}")
+                    time.sleep(retry_backoff * 2 ** attempt)
+                except Exception as e:  # Invalid body etc. - resending won't help, other chunks go on
+                    return chunk_failed(chunk_number, offset, chunk, e)
+            
+            # A non-JSON body comes back as the raw response
+            if not isinstance(result, BulkImportResponse):
+                error = ValueError(f"unparseable bulk-import response: {result!r:.200}")
+                return chunk_failed(chunk_number, offset, chunk, error)
+            
+            errors = []
+            for error in result.errors or []:
+                error = dict(error)
+                if isinstance(error.get("index"), int):
+                    error["index"] += offset
+                errors.append(error)
+            return BulkImportResponse(imported=result.imported, failed=result.failed, errors=errors)
+        
+        imported = failed = 0
+        errors: List[dict] = []
+        iterator = iter(leads)
+        chunk_number = offset = 0
+        
+        # This client, but on an HTTPClient that never resends a sent POST
+        sender = copy.copy(self)
+        sender.http = self.http.without_resends()
+        sender.http.set_pool_size(max_workers)
+        
+        with sender.http, ThreadPoolExecutor(max_workers=max_workers) as executor:
+            running = set()
+            while True:
+                # Top up in-flight chunks; only these are held in memory
+                while len(running) < max_workers:
+                    chunk = list(islice(iterator, chunk_size))
+                    if not chunk:
+                        break
+                    running.add(executor.submit(send, chunk_number, offset, chunk))
+                    chunk_number += 1
+                    offset += len(chunk)
+                if not running:
+                    break
+                
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    imported += result.imported
+                    failed += result.failed
+                    errors.extend(result.errors or [])
+                logger.info(f"📦 Bulk import progress: {imported} imported, {failed} failed, {offset} queued")
+        
+        return BulkImportResponse(imported=imported, failed=failed, errors=errors or None)
+    
+    def create_leads(
+        self,
+        leads: Iterable[CreateLeadRequest],
+        concurrency: int = 8,
+        validate_response: bool = True
+    ) -> Iterator[LeadCreationResult]:
+        """
+        Create many leads concurrently, one create-lead request each
+        
+        Leads are read lazily and at most `concurrency` requests are in
+        flight, all over one keep-alive pool sized to match, so a large job
+        is bounded by the server (and any configured rate limits) rather
+        than by one round trip after another. Creating a lead is not
+        idempotent, so requests go through a client that never resends one
+        the server may have processed. A lead that fails is reported in its
+        result, never raised, and the other leads go on.
+        
+        Args:
+            leads: Lead data (list or generator)
+            concurrency: Requests sent at once
+            validate_response: Whether to validate each response schema
+            
+        Yields:
+            LeadCreationResult per lead, in completion order
+            
+        Example:
+            >>> leads = (make_lead(n) for n in range(10_000))
+            >>> failed = [r for r in client.create_leads(leads, concurrency=32) if not r.success]
+        """
+        def create(index: int, lead: CreateLeadRequest) -> LeadCreationResult:
+            result = LeadCreationResult(index=index, email=lead.email)
+            start = time.monotonic()
+            try:
+                created = sender.create_lead(lead, validate_response=validate_response)
+                # A non-JSON body comes back as the raw response
+                if not isinstance(created, LeadResponse):
+                    raise ValueError(f"unparseable create-lead response: {created!r:.200}")
+                result.success, result.lead_id, result.message = True, created.id, "Lead created"
+            except Exception as e:
+                logger.error(f"❌ Creating lead {index} ({lead.email}) failed: {e}")
+                result.message = f"{type(e).__name__}: {e}"
+            result.duration = time.monotonic() - start
+            return result
+        
+        iterator = enumerate(leads)
+        
+        # This client, but on an HTTPClient that never resends a sent POST
+        sender = copy.copy(self)
+        sender.http = self.http.without_resends()
+        sender.http.set_pool_size(concurrency)
+        
+        with sender.http, ThreadPoolExecutor(max_workers=concurrency) as executor:
+            running = set()
+            while True:
+                # Top up in-flight requests; only these leads are held in memory
+                for index, lead in islice(iterator, concurrency - len(running)):
+                    running.add(executor.submit(create, index, lead))
+                if not running:
+                    break
+                
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+    
     def bulk_import_raw(self, data: Dict[str, Any]) -> requests.Response:
         """Bulk import raw data (for testing)"""
         return self.http.post(self.BULK_IMPORT, json=data)
@@ -313,30 +615,93 @@ class LeadAPIClient(BaseAPIClient):
         lead_id: str,
         expected_status: Optional[str] = None,
         timeout: int = 30,
-        interval: float = 1.0
+        interval: float = 0.25,
+        max_interval: float = 5.0
     ) -> Optional[LeadResponse]:
         """
         Wait for lead to be available (useful for async operations)
         
+        Polls with exponential backoff and jitter (interval doubling up to
+        max_interval), never sleeping past the timeout. Request errors and
+        unparseable responses count as "not ready yet".
+        
         Args:
             lead_id: Lead identifier
             expected_status: Expected status to wait for
             timeout: Maximum wait time in seconds
-            interval: Polling interval
+            interval: First polling interval
+            max_interval: Longest polling interval
             
         Returns:
             LeadResponse when found, None if timeout
         """
-        import time
-        start = time.time()
+        result = poll(
+            lambda: self.get_lead(lead_id, validate_response=False),
+            until=lambda lead: expected_status is None or lead.status == expected_status,
+            timeout=timeout,
+            initial_interval=interval,
+            max_interval=max_interval,
+            retry_on=(requests.exceptions.RequestException, ValueError),
+            description=f"lead {lead_id}" + (f" status '{expected_status}'" if expected_status else "")
+        )
+        return result.value if result.success else None
+    
+    def wait_for_leads(
+        self,
+        lead_ids: Iterable[str],
+        expected_status: Optional[str] = None,
+        timeout: int = 60,
+        interval: float = 0.5,
+        max_interval: float = 5.0,
+        max_workers: int = 8
+    ) -> Dict[str, Optional[LeadResponse]]:
+        """
+        Wait for many leads at once
         
-        while time.time() - start < timeout:
+        Each polling round fetches every still-pending lead concurrently;
+        rounds back off exponentially, so N leads cost one request each per
+        round instead of one request per lead per second.
+        
+        Args:
+            lead_ids: Lead identifiers
+            expected_status: Expected status to wait for
+            timeout: Maximum wait time in seconds for the whole batch
+            interval: First interval between rounds
+            max_interval: Longest interval between rounds
+            max_workers: Concurrent requests per round
+            
+        Returns:
+            {lead_id: LeadResponse, or None if it timed out}
+        """
+        results: Dict[str, Optional[LeadResponse]] = {lead_id: None for lead_id in lead_ids}
+        pending = set(results)
+        
+        def check(lead_id: str) -> Optional[LeadResponse]:
             try:
                 lead = self.get_lead(lead_id, validate_response=False)
-                if expected_status is None or lead.status == expected_status:
-                    return lead
-            except:
-                pass
-            time.sleep(interval)
+            except (requests.exceptions.RequestException, ValueError):
+                return None
+            if expected_status is None or lead.status == expected_status:
+                return lead
+            return None
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            def poll_round() -> set:
+                for lead_id, lead in zip(list(pending), executor.map(check, list(pending))):
+                    if lead is not None:
+                        results[lead_id] = lead
+                        pending.discard(lead_id)
+                return pending
+            
+            poll(
+                poll_round,
+                until=lambda remaining: not remaining,
+                timeout=timeout,
+                initial_interval=interval,
+                max_interval=max_interval,
+                description=f"{len(results)} leads"
+            )
         
-        return None
+        if pending:
+            logger.warning(f"⚠ {len(pending)}/{len(results)} leads not ready after {timeout}s")
+        return results
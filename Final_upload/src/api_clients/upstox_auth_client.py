@@ -2,7 +2,11 @@
 Upstox Authentication API Client
 Handles OTP generation and validation
 """
-from typing import Optional, Dict, Any
+import copy
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+from typing import Optional, Dict, Any, Iterable, Iterator, Type, TypeVar
 from datetime import datetime
 import requests
 
@@ -20,10 +24,19 @@ from src.models.upstox_models import (
     EmailVerifyOTPResponse,
     UpstoxDeviceDetails,
     UpstoxErrorCodes,
+    OnboardingResult,
+    SessionContext,
+    UpstoxResponse,
     token_store
 )
 from src.utils.assertions import APIAssertions
+from src.utils.email_generator import generate_random_email
+from src.utils.http_client import HTTPClient, retry_after_seconds
 from src.utils.logger import logger
+from src.utils.rate_limiter import NextAllowedScheduler
+from config.settings import Settings
+
+R = TypeVar("R", bound=UpstoxResponse)
 
 
 def generate_dynamic_request_id() -> str:
@@ -38,6 +51,11 @@ def generate_dynamic_request_id() -> str:
     return f"QATest{now.strftime('%d%m%y%H%M')}"
 
 
+# Generate OTP throttling is per mobile on the server, so by default every
+# client in the process shares one scheduler
+default_otp_scheduler = NextAllowedScheduler()
+
+
 class UpstoxAuthClient(BaseAPIClient):
     """
     Upstox Authentication Client
@@ -64,7 +82,12 @@ class UpstoxAuthClient(BaseAPIClient):
     def __init__(
         self,
         request_id: Optional[str] = None,
-        device_details: Optional[UpstoxDeviceDetails] = None
+        device_details: Optional[UpstoxDeviceDetails] = None,
+        http_client: Optional[HTTPClient] = None,
+        store: Optional[SessionContext] = None,
+        base_url: Optional[str] = None,
+        otp_scheduler: Optional[NextAllowedScheduler] = None,
+        trust_responses: bool = False
     ):
         """
         Initialize Upstox Auth Client
@@ -72,12 +95,28 @@ class UpstoxAuthClient(BaseAPIClient):
         Args:
             request_id: Request ID for query parameter (default: auto-generated QATestDDMMYYHHMM)
             device_details: Device details for headers
+            http_client: Pre-configured HTTP client (e.g. with a rate limiter)
+            store: Session to bind this client to. By default the client uses
+                   token_store, i.e. whichever session_scope() is active when
+                   each method runs.
+            base_url: Server to target (default: Settings.UPSTOX_BASE_URL, i.e. UAT
+                      unless overridden, e.g. to point at the local mock server)
+            otp_scheduler: Tracks when each mobile may request another OTP
+                           (default: default_otp_scheduler, shared process-wide)
+            trust_responses: Build response models without validation (e.g. for
+                             bulk runs against the mock server). Cassette
+                             replays are always trusted.
         """
-        super().__init__(base_url=self.BASE_URL)
+        self.base_url = base_url or Settings.UPSTOX_BASE_URL
+        super().__init__(http_client=http_client, base_url=self.base_url)
 
         # Use dynamic request ID if not provided
         self.request_id = request_id or generate_dynamic_request_id()
         self.device_details = device_details or UpstoxDeviceDetails()
+        self.token_store = store or token_store
+        self.otp_scheduler = otp_scheduler if otp_scheduler is not None else default_otp_scheduler
+        self.last_otp_wait = 0.0  # Seconds the last generate_otp waited for its slot
+        self.trust_responses = trust_responses
 
         # Set default headers
         self._setup_headers()
@@ -90,6 +129,11 @@ class UpstoxAuthClient(BaseAPIClient):
             'Accept': 'application/json'
         })
 
+    def _parse_response(self, model: Type[R], response: requests.Response) -> R:
+        """Decode a response body into model straight from its bytes"""
+        trusted = self.trust_responses or getattr(response, "replayed", False)
+        return model.parse(response.content, trusted=trusted)
+
     def _build_url_with_query(self, endpoint: str, extra_params: Optional[Dict] = None) -> str:
         """Build URL with query parameters"""
         params = {'requestId': self.request_id}
@@ -128,16 +172,15 @@ class UpstoxAuthClient(BaseAPIClient):
         # Prepare request body
         request_data = GenerateOTPRequest.with_mobile_number(mobile_number)
 
-        # Make request
-        response = self.http.post(url, json=request_data.model_dump())
+        # Make request (waits if this mobile is known to be throttled)
+        response = self._send_generate_otp(mobile_number, url, request_data.model_dump())
 
         # Validate response status code
         APIAssertions.assert_status_code(response, 200)
         logger.info(f"✓ Status code verified: 200")
 
         # Parse response
-        response_data = response.json()
-        otp_response = GenerateOTPResponse(**response_data)
+        otp_response = self._parse_response(GenerateOTPResponse, response)
 
         # Validate success flag
         if not otp_response.is_success:
@@ -157,11 +200,64 @@ class UpstoxAuthClient(BaseAPIClient):
 
             # Save token if requested (only for successful responses)
             if save_token:
-                token_store.save_token(token_key, otp_response.validate_otp_token)
+                self.token_store.save_token(token_key, otp_response.validate_otp_token)
                 logger.info(f"✓ Token saved with key: {token_key}")
 
         return otp_response
 
+    def _send_generate_otp(self, mobile_number: str, url: str, payload: Dict[str, Any]) -> requests.Response:
+        """
+        POST Generate OTP through otp_scheduler
+
+        Waits until neither this mobile nor the server as a whole is known to
+        be throttled, then records the next allowed time from the response
+        (nextRequestInterval, or Retry-After on HTTP 429). A 429 is not retried
+        by the HTTP client: the scheduler decides when this mobile goes again.
+        """
+        self.last_otp_wait = self.otp_scheduler.acquire(mobile_number)
+        if self.last_otp_wait > 0:
+            logger.info(f"⏳ Waited {self.last_otp_wait:.2f}s for Generate OTP slot of {mobile_number}")
+
+        interval = None
+        try:
+            response = self.http.post(url, json=payload, retry_throttled=False)
+            interval = self._next_otp_interval(response)
+            return response
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None:
+                interval = self._next_otp_interval(e.response)
+            raise
+        finally:
+            self.otp_scheduler.release(mobile_number, interval)
+
+    def _next_otp_interval(self, response: requests.Response) -> Optional[float]:
+        """
+        Seconds before this mobile may request another OTP, from a Generate OTP response
+
+        A 429 without RATE_LIMIT_EXCEEDED is treated as server-wide throttling
+        and holds every mobile instead.
+        """
+        try:
+            otp_response = self._parse_response(GenerateOTPResponse, response)
+        except ValueError:
+            otp_response = None
+
+        if response.status_code == 429:
+            interval = retry_after_seconds(response.headers.get("Retry-After"), self.otp_scheduler.default_interval)
+            if otp_response is None or otp_response.error_code != UpstoxErrorCodes.RATE_LIMIT_EXCEEDED:
+                logger.warning(f"⏸ Generate OTP throttled server-wide; holding all mobiles for {interval}s")
+                self.otp_scheduler.defer_all(interval)
+                return None
+            return interval
+
+        if otp_response is None:
+            return None
+        if otp_response.next_request_interval:
+            return float(otp_response.next_request_interval)
+        if otp_response.error_code == UpstoxErrorCodes.RATE_LIMIT_EXCEEDED:
+            return self.otp_scheduler.default_interval
+        return None
+
     def generate_otp_raw(self, mobile_number: str) -> requests.Response:
         """
         Generate OTP and return raw response (for testing)
@@ -195,7 +291,7 @@ class UpstoxAuthClient(BaseAPIClient):
             Validation response
         """
         # Get token from parameter or token store
-        token = validate_otp_token or token_store.get_token(token_key)
+        token = validate_otp_token or self.token_store.get_token(token_key)
 
         if not token:
             raise ValueError(f"No validateOTPToken found. Call generate_otp first or provide token.")
@@ -257,7 +353,7 @@ class UpstoxAuthClient(BaseAPIClient):
             >>> print(f"Profile ID: {verify_response.profile_id}")
         """
         # Get token from parameter or token store
-        token = validate_otp_token or token_store.get_token(token_key)
+        token = validate_otp_token or self.token_store.get_token(token_key)
 
         if not token:
             raise ValueError(f"No validateOTPToken found. Call generate_otp first or provide token.")
@@ -299,8 +395,7 @@ class UpstoxAuthClient(BaseAPIClient):
         logger.info(f"✓ Status code verified: 200")
 
         # Parse response
-        response_data = response.json()
-        verify_response = VerifyOTPResponse(**response_data)
+        verify_response = self._parse_response(VerifyOTPResponse, response)
 
         # Check for session expiry error (1017076)
         # NOTE: Auto-retry logic is commented out for testing
@@ -394,12 +489,12 @@ class UpstoxAuthClient(BaseAPIClient):
 
         # Save profileId and userType
         if save_profile_id and verify_response.profile_id:
-            token_store.save_user_data("profile_id", verify_response.profile_id)
+            self.token_store.save_user_data("profile_id", verify_response.profile_id)
             logger.info(f"✓ Profile ID saved: {verify_response.profile_id}")
 
         # Save userType for report generation
         if verify_response.user_type:
-            token_store.save_user_data("user_type", verify_response.user_type)
+            self.token_store.save_user_data("user_type", verify_response.user_type)
             logger.info(f"✓ User Type saved: {verify_response.user_type}")
 
         logger.info(f"🎉 OTP verified successfully!")
@@ -422,7 +517,7 @@ class UpstoxAuthClient(BaseAPIClient):
         Returns:
             Raw requests.Response object
         """
-        token = validate_otp_token or token_store.get_token(token_key)
+        token = validate_otp_token or self.token_store.get_token(token_key)
 
         if not token:
             raise ValueError(f"No validateOTPToken found.")
@@ -482,7 +577,7 @@ class UpstoxAuthClient(BaseAPIClient):
         logger.info(f"="*70)
 
         # Get token from parameter or token store
-        token = validate_otp_token or token_store.get_token(token_key)
+        token = validate_otp_token or self.token_store.get_token(token_key)
 
         if not token:
             raise ValueError(
@@ -515,8 +610,7 @@ class UpstoxAuthClient(BaseAPIClient):
         logger.info(f"✓ Status code verified: 200")
 
         # Parse response
-        response_data = response.json()
-        two_fa_response = TwoFactorAuthResponse(**response_data)
+        two_fa_response = self._parse_response(TwoFactorAuthResponse, response)
 
         # Check if success
         if not two_fa_response.success:
@@ -541,11 +635,11 @@ class UpstoxAuthClient(BaseAPIClient):
         # Save response data
         if save_response_data:
             if two_fa_response.redirect_uri:
-                token_store.save_user_data("redirect_uri", two_fa_response.redirect_uri)
+                self.token_store.save_user_data("redirect_uri", two_fa_response.redirect_uri)
                 logger.info(f"✓ Redirect URI saved: {two_fa_response.redirect_uri}")
 
             if two_fa_response.customer_status:
-                token_store.save_user_data("customer_status", two_fa_response.customer_status)
+                self.token_store.save_user_data("customer_status", two_fa_response.customer_status)
                 logger.info(f"✓ Customer status saved: {two_fa_response.customer_status}")
 
         logger.info(f"🎉 2FA Authentication successful!")
@@ -570,7 +664,7 @@ class UpstoxAuthClient(BaseAPIClient):
         Returns:
             Raw requests.Response object
         """
-        token = validate_otp_token or token_store.get_token(token_key)
+        token = validate_otp_token or self.token_store.get_token(token_key)
 
         if not token:
             raise ValueError(f"No validateOTPToken found.")
@@ -588,20 +682,20 @@ class UpstoxAuthClient(BaseAPIClient):
 
     def get_stored_token(self, token_key: str = "validate_otp_token") -> Optional[str]:
         """Get stored validateOTPToken"""
-        return token_store.get_token(token_key)
+        return self.token_store.get_token(token_key)
 
     def clear_stored_token(self, token_key: str = "validate_otp_token"):
         """Clear stored validateOTPToken"""
-        token_store.clear_token(token_key)
+        self.token_store.clear_token(token_key)
         logger.info(f"Cleared token with key: {token_key}")
 
     def get_stored_profile_id(self) -> Optional[int]:
         """Get stored profileId from successful verification"""
-        return token_store.get_user_data("profile_id")
+        return self.token_store.get_user_data("profile_id")
 
     def clear_stored_profile_id(self):
         """Clear stored profileId"""
-        token_store.clear_user_data("profile_id")
+        self.token_store.clear_user_data("profile_id")
         logger.info(f"Cleared profile_id from storage")
 
     # ═══════════════════════════════════════════════════════════════════
@@ -610,23 +704,23 @@ class UpstoxAuthClient(BaseAPIClient):
 
     def get_stored_redirect_uri(self) -> Optional[str]:
         """Get stored redirectUri from successful 2FA"""
-        return token_store.get_user_data("redirect_uri")
+        return self.token_store.get_user_data("redirect_uri")
 
     def get_stored_customer_status(self) -> Optional[str]:
         """Get stored customerStatus from successful 2FA"""
-        return token_store.get_user_data("customer_status")
+        return self.token_store.get_user_data("customer_status")
 
     def clear_stored_2fa_data(self):
         """Clear all 2FA related stored data"""
-        token_store.clear_user_data("redirect_uri")
-        token_store.clear_user_data("customer_status")
+        self.token_store.clear_user_data("redirect_uri")
+        self.token_store.clear_user_data("customer_status")
         logger.info(f"Cleared 2FA data from storage")
 
     def get_all_stored_data(self) -> Dict[str, Any]:
         """Get all stored tokens and user data"""
         return {
-            "tokens": token_store.all_tokens,
-            "user_data": token_store.all_user_data
+            "tokens": self.token_store.all_tokens,
+            "user_data": self.token_store.all_user_data
         }
 
     # ═══════════════════════════════════════════════════════════════════
@@ -665,13 +759,13 @@ class UpstoxAuthClient(BaseAPIClient):
         logger.info(f"Email: {email}")
 
         # Get profile_id from store if not provided
-        profile_id = profile_id or token_store.get_user_data("profile_id")
+        profile_id = profile_id or self.token_store.get_user_data("profile_id")
         if not profile_id:
             raise ValueError("No profile_id found. Please run Stage 2 (Verify OTP) first.")
         logger.info(f"Using profile_id: {profile_id}")
 
         # Get token from store if not provided (from 2FA response or cookies)
-        auth_token = authorization_token or token_store.get_user_data("access_token")
+        auth_token = authorization_token or self.token_store.get_user_data("access_token")
         if not auth_token:
             # Try to construct from cookies or use placeholder
             logger.warning("No access_token found in store. Using placeholder.")
@@ -703,8 +797,7 @@ class UpstoxAuthClient(BaseAPIClient):
         logger.info(f"✓ Status code verified: 200")
 
         # Parse response (handles flat format: {"EMAIL": "OTP sent successfully"})
-        response_data = response.json()
-        email_response = EmailSendOTPResponse.from_raw_response(response_data)
+        email_response = self._parse_response(EmailSendOTPResponse, response)
 
         # Validate success response
         is_valid, error_msg = email_response.validate_success_response()
@@ -770,20 +863,20 @@ class UpstoxAuthClient(BaseAPIClient):
         logger.info(f"="*70)
 
         # Get email from store if not provided
-        email = email or token_store.get_user_data("email_used")
+        email = email or self.token_store.get_user_data("email_used")
         if not email:
             raise ValueError("No email found. Please run Stage 4 (Email Send OTP) first.")
         logger.info(f"Email: {email}")
         logger.info(f"OTP: {otp}")
 
         # Get profile_id from store if not provided
-        profile_id = profile_id or token_store.get_user_data("profile_id")
+        profile_id = profile_id or self.token_store.get_user_data("profile_id")
         if not profile_id:
             raise ValueError("No profile_id found. Please run Stage 2 (Verify OTP) first.")
         logger.info(f"Using profile_id: {profile_id}")
 
         # Get token from store if not provided
-        auth_token = authorization_token or token_store.get_user_data("access_token")
+        auth_token = authorization_token or self.token_store.get_user_data("access_token")
         if not auth_token:
             logger.warning("No access_token found in store. Using placeholder.")
             auth_token = "Bearer <token_from_2fa>"
@@ -814,8 +907,7 @@ class UpstoxAuthClient(BaseAPIClient):
         logger.info(f"✓ Status code verified: 200")
 
         # Parse response (handles flat format)
-        response_data = response.json()
-        verify_response = EmailVerifyOTPResponse.from_raw_response(response_data)
+        verify_response = self._parse_response(EmailVerifyOTPResponse, response)
 
         # Validate success response
         is_valid, error_msg = verify_response.validate_success_response()
@@ -847,6 +939,144 @@ class UpstoxAuthClient(BaseAPIClient):
         return self.email_verify_otp(email, otp)
 
 
+    # ═══════════════════════════════════════════════════════════════════
+    # BATCH ONBOARDING
+    # ═══════════════════════════════════════════════════════════════════
+
+    def onboard_many(
+        self,
+        mobiles: Iterable[str],
+        emails: Optional[Iterable[str]] = None,
+        concurrency: int = 8,
+        otp: str = "123789",
+        max_rate_limit_retries: int = 3,
+        lookahead: Optional[int] = None
+    ) -> Iterator[OnboardingResult]:
+        """
+        Run the 5-stage onboarding flow for many users concurrently
+
+        Generate OTP → Verify OTP → 2FA → Email Send OTP → Email Verify OTP
+        for up to `concurrency` users at a time. All users share this
+        client's connection pool; each gets its own SessionContext, so
+        tokens never leak between users. Results are yielded as each user
+        finishes.
+
+        Generate OTP goes through otp_scheduler, so a mobile is never sent
+        while known to be throttled. Pending users are picked from a
+        lookahead window, soonest-allowed mobile first, so a repeated mobile
+        waits without holding up the users behind it.
+
+        Args:
+            mobiles: Mobile numbers (list or generator)
+            emails: Emails in the same order (default: random per user)
+            concurrency: Users onboarded at once
+            otp: OTP used for every stage
+            max_rate_limit_retries: Generate OTP attempts after being rate-limited
+            lookahead: Pending users considered for reordering (default: 4 x concurrency)
+
+        Yields:
+            OnboardingResult per user, in completion order
+
+        Example:
+            >>> with UpstoxAuthClient() as client:
+            ...     for result in client.onboard_many(mobiles, concurrency=16):
+            ...         print(result.mobile_number, result.success, result.profile_id)
+        """
+        self.http.set_pool_size(concurrency)
+        users = iter(zip(mobiles, emails) if emails is not None else ((m, None) for m in mobiles))
+        window = lookahead if lookahead is not None else 4 * concurrency
+        pending = []
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            running = set()
+            while True:
+                # Read input lazily so a huge input is never fully queued
+                pending.extend(islice(users, max(0, window - len(pending))))
+                while pending and len(running) < concurrency:
+                    # min() keeps input order among equally ready mobiles
+                    index = min(range(len(pending)), key=lambda i: self.otp_scheduler.ready_at(pending[i][0]))
+                    mobile, email = pending.pop(index)
+                    running.add(executor.submit(
+                        self._onboard_one, mobile, email or generate_random_email(), otp, max_rate_limit_retries
+                    ))
+                if not running:
+                    break
+
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+    def _for_session(self, store: SessionContext) -> "UpstoxAuthClient":
+        """Shallow copy sharing this client's HTTP pool but with its own token store"""
+        client = copy.copy(self)
+        client.token_store = store
+        return client
+
+    def _onboard_one(
+        self,
+        mobile_number: str,
+        email: str,
+        otp: str,
+        max_rate_limit_retries: int
+    ) -> OnboardingResult:
+        """One user's flow; never raises"""
+        client = self._for_session(SessionContext(name=mobile_number))
+        result = OnboardingResult(mobile_number=mobile_number, email=email, success=False, stage="Generate OTP")
+        start = time.monotonic()
+        try:
+            # The scheduler already holds the mobile for the server's interval;
+            # retrying just waits for that slot
+            for attempt in range(max_rate_limit_retries + 1):
+                try:
+                    generate = client.generate_otp(mobile_number)
+                    rate_limited = generate.error_code == UpstoxErrorCodes.RATE_LIMIT_EXCEEDED
+                except requests.exceptions.HTTPError as e:
+                    if e.response is None or e.response.status_code != 429:
+                        raise
+                    rate_limited = True
+                result.rate_limit_wait += client.last_otp_wait
+                if not rate_limited:
+                    break
+                result.rate_limit_retries += 1
+                logger.warning(f"⏸ Rate limited on Generate OTP for {mobile_number}; retrying when allowed")
+            else:
+                result.message = "Rate limited on Generate OTP"
+                return result
+
+            if not generate.is_success:
+                result.message = generate.message
+                return result
+
+            result.stage = "Verify OTP"
+            verify = client.verify_otp(otp=otp, mobile_number=mobile_number)
+            is_valid, result.message = verify.validate_success_response()
+            if not is_valid:
+                return result
+            result.profile_id = verify.profile_id
+
+            result.stage = "2FA Authentication"
+            two_fa = client.two_factor_auth(otp=otp)
+            is_valid, result.message = two_fa.validate_success_response()
+            if not is_valid:
+                return result
+            result.customer_status = two_fa.customer_status
+
+            result.stage = "Email Send OTP"
+            is_valid, result.message = client.email_send_otp(email).validate_success_response()
+            if not is_valid:
+                return result
+
+            result.stage = "Email Verify OTP"
+            is_valid, result.message = client.email_verify_otp(email, otp).validate_success_response()
+            result.success = is_valid
+            return result
+        except Exception as e:
+            result.message = f"{type(e).__name__}: {e}"
+            return result
+        finally:
+            result.duration = time.monotonic() - start
+
+
 # Standalone functions for quick usage
 
 def generate_otp_token(
@@ -9,6 +9,8 @@ import os
 from datetime import datetime
 from pathlib import Path
 
+from src.utils.redaction import redact
+
 
 class AllureHelper:
     """Helper class to generate Allure result files"""
@@ -43,7 +45,7 @@ class AllureHelper:
             "stop": int(datetime.now().timestamp() * 1000)
         }
         if details:
-            step_data["description"] = json.dumps(details, indent=2)
+            step_data["description"] = json.dumps(redact(details), indent=2)
         self.steps.append(step_data)
         return step_uuid
 
@@ -95,7 +97,7 @@ class AllureHelper:
         if test_summary:
             summary_content = self._format_summary(test_summary)
             self.add_attachment("📊 Test Summary", summary_content, "text/plain")
-            self.add_attachment("Test Data (JSON)", json.dumps(test_summary, indent=2), "application/json")
+            self.add_attachment("Test Data (JSON)", json.dumps(redact(test_summary), indent=2), "application/json")
 
         if message and status != "passed":
             test_result["statusDetails"] = {"message": message, "trace": ""}
@@ -11,6 +11,7 @@ from datetime import datetime
 from pathlib import Path
 
 from .runner import AutoTestRunner
+from .scheduler import StageGraph
 
 
 def setup_logging() -> Path:
@@ -39,6 +40,10 @@ def parse_arguments():
                         help='Enable Allure reporting')
     parser.add_argument('--allure-dir', type=str, default='reports/allure-results',
                         help='Allure results directory')
+    parser.add_argument('--stage-graph', type=str, default=None,
+                        help='YAML file defining the stage graph (default: built-in 5-stage flow)')
+    parser.add_argument('--results-db', type=str, default=None, metavar='PATH',
+                        help='Append stage results to this SQLite results history (e.g. reports/results_history.db)')
     return parser.parse_args()
 
 
@@ -65,7 +70,9 @@ def main() -> int:
 
     runner = AutoTestRunner(
         allure_enabled=args.allure, 
-        allure_results_dir=args.allure_dir
+        allure_results_dir=args.allure_dir,
+        stage_graph=StageGraph.from_yaml(args.stage_graph) if args.stage_graph else None,
+        results_db=args.results_db
     )
 
     # Run all stages
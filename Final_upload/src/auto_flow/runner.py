@@ -11,11 +11,14 @@ from typing import Optional
 
 sys.path.insert(0, 'src')
 
+from config.settings import Settings
 from src.api_clients.upstox_auth_client import UpstoxAuthClient
 from src.models.upstox_models import token_store
+from src.utils.results_db import ResultsStore, rows_from_stage_records
 from src.utils.mobile_generator import generate_unique_mobile
 from src.utils.email_generator import generate_random_email
 from .allure_helper import AllureHelper
+from .scheduler import FlowState, StageGraph, StageScheduler
 from .stages import StageManager, StageResult
 
 
@@ -25,14 +28,15 @@ logger = logging.getLogger(__name__)
 class AutoTestRunner:
     """Automatically runs all 5 stages with user input for mobile number"""
 
-    def __init__(self, allure_enabled: bool = False, allure_results_dir: str = "reports/allure-results"):
+    def __init__(self, allure_enabled: bool = False, allure_results_dir: str = "reports/allure-results",
+                 stage_graph: Optional[StageGraph] = None, results_db: Optional[str] = None):
         self.report_data = {
             "test_execution": {
                 "date": datetime.now().strftime("%Y-%m-%d"),
                 "time": datetime.now().strftime("%H:%M:%S"),
                 "timestamp": datetime.now().isoformat(),
                 "environment": "UAT",
-                "base_url": "https://service-uat.upstox.com"
+                "base_url": Settings.UPSTOX_BASE_URL
             },
             "test_data": {},
             "api_results": [],
@@ -45,6 +49,8 @@ class AutoTestRunner:
         self.allure_enabled = allure_enabled
         self.allure_helper: Optional[AllureHelper] = None
         self.stage_manager: Optional[StageManager] = None
+        self.stage_graph = stage_graph or StageGraph.default()
+        self.results_db = results_db  # SQLite results history to append this run to
         
         if allure_enabled:
             self.allure_helper = AllureHelper(allure_results_dir)
@@ -155,21 +161,17 @@ class AutoTestRunner:
             self.client = UpstoxAuthClient()
             self.stage_manager = StageManager(self.client, self.mobile_number, self.email, self.otp)
 
-            # Run all 5 stages
-            stages = [
-                ("Stage 1: Generate OTP", self.stage_manager.run_stage1_generate_otp),
-                ("Stage 2: Verify OTP", self.stage_manager.run_stage2_verify_otp),
-                ("Stage 3: 2FA Authentication", self.stage_manager.run_stage3_two_fa),
-                ("Stage 4: Email Send OTP", self.stage_manager.run_stage4_email_send_otp),
-                ("Stage 5: Email Verify OTP", self.stage_manager.run_stage5_email_verify_otp),
-            ]
-
-            for stage_name, stage_func in stages:
-                result = stage_func()
-                self.allure_step(stage_name, "passed" if result.success else "failed", result.details)
-                
-                if not result.success:
-                    raise Exception(result.message)
+            # Run all stages as soon as their inputs are ready
+            flow = FlowState(self.stage_manager, session=token_store.session)
+            StageScheduler(self.stage_graph).run(
+                [flow],
+                on_stage_complete=lambda _, stage, result: self.allure_step(
+                    stage.name, "passed" if result.success else "failed", result.details
+                )
+            )
+
+            if not flow.success:
+                raise Exception(flow.failed.message)
 
             # Collect results
             self.report_data["api_results"] = self.stage_manager.get_results()
@@ -199,14 +201,28 @@ class AutoTestRunner:
                 result_file = self.allure_helper.end_test(test_status, error_message, test_summary)
                 print(f"\n📊 Allure result saved: {result_file}")
 
+            if self.results_db and self.stage_manager:
+                self._record_history()
+
+    def _record_history(self):
+        """Append this run's stage results (with latency) to the results history"""
+        with ResultsStore(self.results_db) as store:
+            store.record_run(
+                "auto_flow",
+                rows_from_stage_records(self.stage_manager.results),
+                environment=Settings.ENV,
+                started_at=self.report_data["test_execution"]["timestamp"]
+            )
+        print(f"🗄️  Results history updated: {self.results_db}")
+
     def _update_summary(self):
         """Update test summary with final data"""
         all_data = self.client.get_all_stored_data() if self.client else {}
         user_data = all_data.get('user_data', {})
 
         self.report_data["summary"] = {
-            "total_stages": 5,
-            "passed": 5,
+            "total_stages": len(self.stage_graph.stages),
+            "passed": len(self.stage_graph.stages),
             "failed": 0,
             "success_rate": "100%",
             "overall_status": "PASS",
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Stage Scheduler - Runs StageManager stages as a dependency graph
+Each stage declares the values it needs (inputs) and produces (outputs);
+any stage whose inputs are ready is run, concurrently with other ready
+stages of the same flow or of other flows.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.models.upstox_models import SessionContext, session_scope
+from .stages import StageManager, StageResult
+
+logger = logging.getLogger(__name__)
+
+
+# Values every flow starts with (set from StageManager attributes)
+FLOW_SEED_KEYS = ("mobile_number", "email", "otp")
+
+# Default 5-stage Upstox onboarding flow.
+# Email send/verify are declared after 2FA because the account-opening
+# APIs require a completed 2FA session for the profile.
+DEFAULT_STAGE_GRAPH: List[Dict[str, Any]] = [
+    {
+        "name": "Stage 1: Generate OTP",
+        "handler": "run_stage1_generate_otp",
+        "inputs": ["mobile_number"],
+        "outputs": ["validate_otp_token"],
+    },
+    {
+        "name": "Stage 2: Verify OTP",
+        "handler": "run_stage2_verify_otp",
+        "inputs": ["validate_otp_token", "otp"],
+        "outputs": ["profile_id", "user_type"],
+    },
+    {
+        "name": "Stage 3: 2FA Authentication",
+        "handler": "run_stage3_two_fa",
+        "inputs": ["validate_otp_token", "profile_id", "otp"],
+        "outputs": ["redirect_uri", "customer_status"],
+    },
+    {
+        "name": "Stage 4: Email Send OTP",
+        "handler": "run_stage4_email_send_otp",
+        "inputs": ["profile_id", "customer_status", "email"],
+        "outputs": ["email_otp_sent"],
+    },
+    {
+        "name": "Stage 5: Email Verify OTP",
+        "handler": "run_stage5_email_verify_otp",
+        "inputs": ["email_otp_sent", "otp"],
+        "outputs": ["email_verified"],
+    },
+]
+
+
+@dataclass(frozen=True)
+class StageSpec:
+    """One node of the stage graph"""
+    name: str
+    handler: str
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StageSpec":
+        """Build a stage from a config dict"""
+        return cls(
+            name=data["name"],
+            handler=data["handler"],
+            inputs=tuple(data.get("inputs", ())),
+            outputs=tuple(data.get("outputs", ())),
+        )
+
+
+class StageGraph:
+    """Validated, declarative set of stages"""
+
+    def __init__(self, stages: Iterable[StageSpec], seed_keys: Iterable[str] = FLOW_SEED_KEYS):
+        self.stages: List[StageSpec] = list(stages)
+        self.seed_keys = tuple(seed_keys)
+        self._validate()
+
+    @classmethod
+    def from_config(cls, config: List[Dict[str, Any]], seed_keys: Iterable[str] = FLOW_SEED_KEYS) -> "StageGraph":
+        """Build a graph from a list of stage dicts (name/handler/inputs/outputs)"""
+        return cls([StageSpec.from_dict(item) for item in config], seed_keys)
+
+    @classmethod
+    def from_yaml(cls, path: str) -> "StageGraph":
+        """Load a graph from a YAML file with a top-level 'stages' list"""
+        import yaml  # Only needed here; keeps PyYAML off the package import path
+
+        with open(Path(path), 'r') as f:
+            config = yaml.safe_load(f)
+        return cls.from_config(config["stages"], config.get("seed_keys", FLOW_SEED_KEYS))
+
+    @classmethod
+    def default(cls) -> "StageGraph":
+        """The standard 5-stage onboarding flow"""
+        return cls.from_config(DEFAULT_STAGE_GRAPH)
+
+    def _validate(self):
+        """Reject duplicate names, unknown inputs and cycles"""
+        names = [stage.name for stage in self.stages]
+        duplicates = {name for name in names if names.count(name) > 1}
+        if duplicates:
+            raise ValueError(f"Duplicate stage names: {sorted(duplicates)}")
+
+        available = set(self.seed_keys)
+        for stage in self.stages:
+            available.update(stage.outputs)
+        for stage in self.stages:
+            missing = set(stage.inputs) - available
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' needs inputs nobody produces: {sorted(missing)}")
+
+        # Resolve in waves; anything left over is part of a cycle
+        ready = set(self.seed_keys)
+        pending = list(self.stages)
+        while pending:
+            runnable = [stage for stage in pending if set(stage.inputs) <= ready]
+            if not runnable:
+                raise ValueError(f"Stage graph has a cycle: {[stage.name for stage in pending]}")
+            for stage in runnable:
+                ready.update(stage.outputs)
+                pending.remove(stage)
+
+    def critical_path(self) -> List[str]:
+        """Longest dependency chain (stage names), i.e. the minimum number of sequential round trips"""
+        producers = {key: stage for stage in self.stages for key in stage.outputs}
+        depth: Dict[str, List[str]] = {}
+
+        def chain(stage: StageSpec) -> List[str]:
+            if stage.name not in depth:
+                parents = [producers[key] for key in stage.inputs if key in producers]
+                longest = max((chain(parent) for parent in parents), key=len, default=[])
+                depth[stage.name] = longest + [stage.name]
+            return depth[stage.name]
+
+        return max((chain(stage) for stage in self.stages), key=len, default=[])
+
+
+class FlowState:
+    """Runtime state of one user's flow through the graph"""
+
+    def __init__(self, stage_manager: StageManager, session: Optional[SessionContext] = None):
+        self.stage_manager = stage_manager
+        self.session = session or SessionContext(name=stage_manager.mobile_number)
+        self.values: Dict[str, Any] = {
+            key: getattr(stage_manager, key) for key in FLOW_SEED_KEYS
+        }
+        self.started: set = set()
+        self.completed: Dict[str, StageResult] = {}
+        self.failed: Optional[StageResult] = None
+
+    @property
+    def success(self) -> bool:
+        """True once the flow finished without a failed stage"""
+        return self.failed is None
+
+
+StageCallback = Callable[[FlowState, StageSpec, StageResult], None]
+
+
+class StageScheduler:
+    """
+    Runs one or many flows through a StageGraph, executing every stage
+    whose inputs are ready on a shared worker pool.
+
+    Example:
+        >>> scheduler = StageScheduler(StageGraph.default(), max_workers=8)
+        >>> flows = [FlowState(StageManager(client, mobile, email)) for ...]
+        >>> scheduler.run(flows)
+    """
+
+    def __init__(self, graph: Optional[StageGraph] = None, max_workers: int = 4):
+        self.graph = graph or StageGraph.default()
+        self.max_workers = max_workers
+
+    def _run_stage(self, flow: FlowState, stage: StageSpec) -> StageResult:
+        """Execute a stage inside its flow's session"""
+        handler = getattr(flow.stage_manager, stage.handler)
+        with session_scope(flow.session):
+            return handler()
+
+    def _ready_stages(self, flow: FlowState) -> List[StageSpec]:
+        """Stages of a flow whose inputs are all available"""
+        if flow.failed:
+            return []
+        return [
+            stage for stage in self.graph.stages
+            if stage.name not in flow.started and set(stage.inputs) <= flow.values.keys()
+        ]
+
+    def run(self, flows: List[FlowState], on_stage_complete: Optional[StageCallback] = None) -> List[FlowState]:
+        """
+        Run all flows to completion or first failure
+
+        Args:
+            flows: Flows to run
+            on_stage_complete: Called (on the scheduler thread) after each stage
+
+        Returns:
+            The same flows, with completed/failed populated
+        """
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                for flow in flows:
+                    for stage in self._ready_stages(flow):
+                        flow.started.add(stage.name)
+                        future = executor.submit(self._run_stage, flow, stage)
+                        running[future] = (flow, stage)
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    flow, stage = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.error(f"❌ {stage.name} raised: {e}")
+                        result = StageResult(False, f"{stage.name} Failed: {e}")
+
+                    flow.completed[stage.name] = result
+                    if result.success:
+                        for key in stage.outputs:
+                            flow.values[key] = result.outputs.get(key)
+                    elif flow.failed is None:
+                        flow.failed = result
+
+                    if on_stage_complete:
+                        on_stage_complete(flow, stage, result)
+
+        # Stages that never became ready (a dependency failed or was never produced)
+        for flow in flows:
+            if flow.failed is None and len(flow.completed) < len(self.graph.stages):
+                skipped = [s.name for s in self.graph.stages if s.name not in flow.completed]
+                flow.failed = StageResult(False, f"Stages never became ready: {skipped}")
+
+        return flows
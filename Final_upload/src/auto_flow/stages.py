@@ -4,41 +4,53 @@ Stage Handlers - Individual API stage implementations
 Extracted from auto_run_full_flow.py for better modularity
 """
 import logging
-from datetime import datetime
-from typing import Tuple, Dict, Any
+import time
+from typing import Tuple, Dict, Any, Optional
 
 from src.api_clients.upstox_auth_client import UpstoxAuthClient
 from src.models.upstox_models import token_store
+from src.utils.result_records import StageRecords
 
 logger = logging.getLogger(__name__)
 
 
 class StageResult:
     """Result of a stage execution"""
-    def __init__(self, success: bool, message: str = "", details: dict = None):
+    def __init__(self, success: bool, message: str = "", details: dict = None, outputs: dict = None):
         self.success = success
         self.message = message
         self.details = details or {}
+        self.outputs = outputs or {}  # Values handed to dependent stages
 
 
 class StageManager:
-    """Manages all 5 stages of the authentication flow"""
+    """
+    Manages all 5 stages of the authentication flow
     
-    def __init__(self, client: UpstoxAuthClient, mobile_number: str, email: str, otp: str = "123789"):
+    Results go to a StageRecords store. Pass one shared `results` store
+    (and a distinct `flow` number) to many managers to collect a whole
+    bulk/soak run compactly.
+    """
+    
+    def __init__(self, client: UpstoxAuthClient, mobile_number: str, email: str, otp: str = "123789",
+                 results: Optional[StageRecords] = None, flow: int = -1):
         self.client = client
         self.mobile_number = mobile_number
         self.email = email
         self.otp = otp
-        self.results: list = []
+        self.results = results if results is not None else StageRecords()
+        self.flow = flow
     
     def run_stage1_generate_otp(self) -> StageResult:
         """Stage 1: Generate OTP"""
         logger.info("\n📌 STAGE 1: Generate OTP")
         
+        started = time.perf_counter()
         response = self.client.generate_otp(self.mobile_number, save_token=True)
+        latency = time.perf_counter() - started
         success = response.success
         
-        self._record_result(1, "Generate OTP", success, 200, response.message)
+        self._record_result(1, "Generate OTP", success, 200, response.message, latency=latency)
         logger.info(f"   Status: {'✅ PASS' if success else '❌ FAIL'}")
         
         if not success:
@@ -46,24 +58,26 @@ class StageManager:
         
         return StageResult(True, response.message, {
             "token": response.validate_otp_token[:30] + "..." if response.validate_otp_token else None
-        })
+        }, outputs={"validate_otp_token": response.validate_otp_token})
     
     def run_stage2_verify_otp(self) -> StageResult:
         """Stage 2: Verify OTP"""
         logger.info("\n📌 STAGE 2: Verify OTP")
         
+        started = time.perf_counter()
         response = self.client.verify_otp(
             otp=self.otp,
             mobile_number=self.mobile_number,
             save_profile_id=True
         )
+        latency = time.perf_counter() - started
         
         is_valid, error_msg = response.validate_success_response()
         
         self._record_result(2, "Verify OTP", is_valid, 200, response.message, {
             "user_type": response.user_type,
             "profile_id": response.profile_id
-        })
+        }, latency=latency)
         
         logger.info(f"   Status: {'✅ PASS' if is_valid else '❌ FAIL'}")
         logger.info(f"   Profile ID: {response.profile_id}")
@@ -75,20 +89,22 @@ class StageManager:
         return StageResult(True, "OTP verified", {
             "user_type": response.user_type,
             "profile_id": response.profile_id
-        })
+        }, outputs={"profile_id": response.profile_id, "user_type": response.user_type})
     
     def run_stage3_two_fa(self) -> StageResult:
         """Stage 3: 2FA Authentication"""
         logger.info("\n📌 STAGE 3: 2FA Authentication")
         
+        started = time.perf_counter()
         response = self.client.two_factor_auth(otp=self.otp)
+        latency = time.perf_counter() - started
         is_valid, error_msg = response.validate_success_response()
         
         self._record_result(3, "2FA Authentication", is_valid, 200, "2FA Successful", {
             "redirect_uri": response.redirect_uri,
             "user_type": response.user_type,
             "customer_status": response.customer_status
-        })
+        }, latency=latency)
         
         logger.info(f"   Status: {'✅ PASS' if is_valid else '❌ FAIL'}")
         logger.info(f"   Redirect URI: {response.redirect_uri}")
@@ -100,18 +116,20 @@ class StageManager:
         return StageResult(True, "2FA successful", {
             "redirect_uri": response.redirect_uri,
             "customer_status": response.customer_status
-        })
+        }, outputs={"redirect_uri": response.redirect_uri, "customer_status": response.customer_status})
     
     def run_stage4_email_send_otp(self) -> StageResult:
         """Stage 4: Email Send OTP"""
         logger.info("\n📌 STAGE 4: Email Send OTP")
         
+        started = time.perf_counter()
         response = self.client.email_send_otp(email=self.email)
+        latency = time.perf_counter() - started
         is_valid, error_msg = response.validate_success_response()
         
         self._record_result(4, "Email Send OTP", is_valid, 200, response.message, {
             "email_used": self.email
-        })
+        }, latency=latency)
         
         logger.info(f"   Status: {'✅ PASS' if is_valid else '❌ FAIL'}")
         logger.info(f"   Email: {self.email}")
@@ -120,18 +138,21 @@ class StageManager:
         if not is_valid:
             return StageResult(False, f"Stage 4 Failed: {error_msg}")
         
-        return StageResult(True, response.message, {"email": self.email})
+        return StageResult(True, response.message, {"email": self.email},
+                           outputs={"email_otp_sent": True})
     
     def run_stage5_email_verify_otp(self) -> StageResult:
         """Stage 5: Email Verify OTP"""
         logger.info("\n📌 STAGE 5: Email Verify OTP")
         
+        started = time.perf_counter()
         response = self.client.email_verify_otp(email=self.email, otp=self.otp)
+        latency = time.perf_counter() - started
         is_valid, error_msg = response.validate_success_response()
         
         self._record_result(5, "Email Verify OTP", is_valid, 200, response.message, {
             "email_verified": self.email
-        })
+        }, latency=latency)
         
         logger.info(f"   Status: {'✅ PASS' if is_valid else '❌ FAIL'}")
         logger.info(f"   Email Verified: {self.email}")
@@ -140,21 +161,16 @@ class StageManager:
         if not is_valid:
             return StageResult(False, f"Stage 5 Failed: {error_msg}")
         
-        return StageResult(True, response.message, {"email": self.email})
+        return StageResult(True, response.message, {"email": self.email},
+                           outputs={"email_verified": True})
     
     def _record_result(self, stage: int, api_name: str, status: bool, 
-                       status_code: int, message: str, details: dict = None):
+                       status_code: int, message: str, details: dict = None,
+                       latency: Optional[float] = None):
         """Record API result for reporting"""
-        self.results.append({
-            "stage": stage,
-            "api_name": api_name,
-            "status": "PASS" if status else "FAIL",
-            "status_code": status_code,
-            "message": message,
-            "details": details or {},
-            "timestamp": datetime.now().isoformat()
-        })
+        self.results.add(stage, api_name, status, status_code, message, details,
+                         latency=latency, flow=self.flow)
     
     def get_results(self) -> list:
-        """Get all recorded results"""
-        return self.results
+        """Get this flow's recorded results (as dicts)"""
+        return [self.results[index] for index in self.results.for_flow(self.flow)]
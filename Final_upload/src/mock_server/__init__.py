@@ -0,0 +1,6 @@
+"""
+Mock Server Package - Local stand-in for the Upstox UAT APIs
+"""
+from .upstox_mock import MockConfig, UpstoxMockServer
+
+__all__ = ['MockConfig', 'UpstoxMockServer']
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Run the Upstox mock server from the command line
+
+Usage:
+    python -m src.mock_server                         # http://127.0.0.1:8765
+    python -m src.mock_server --port 9000 --latency-ms 80 --failure-rate 0.02
+    UPSTOX_BASE_URL=http://127.0.0.1:8765 python generate_test_report.py --bulk 100 --concurrency 16
+"""
+import argparse
+import sys
+
+from .upstox_mock import MockConfig, UpstoxMockServer
+
+
+def parse_arguments():
+    """Parse command-line arguments"""
+    parser = argparse.ArgumentParser(description='Upstox UAT Mock Server')
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='Bind address')
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on')
+    parser.add_argument('--latency-ms', type=float, default=0.0,
+                        help='Fixed latency added to every response')
+    parser.add_argument('--jitter-ms', type=float, default=0.0,
+                        help='Random extra latency (0..N ms)')
+    parser.add_argument('--failure-rate', type=float, default=0.0,
+                        help='Fraction of requests answered with --failure-status')
+    parser.add_argument('--failure-status', type=int, default=503,
+                        help='Status code for injected failures')
+    parser.add_argument('--next-request-interval', type=int, default=30,
+                        help='nextRequestInterval reported by generate OTP (seconds)')
+    parser.add_argument('--enforce-rate-limit', action='store_true',
+                        help='Reject generate OTP within nextRequestInterval with 429')
+    parser.add_argument('--token-ttl', type=float, default=300.0,
+                        help='Seconds before a validateOTPToken expires')
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Main entry point"""
+    args = parse_arguments()
+    config = MockConfig(
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.jitter_ms,
+        failure_rate=args.failure_rate,
+        failure_status=args.failure_status,
+        next_request_interval=args.next_request_interval,
+        enforce_rate_limit=args.enforce_rate_limit,
+        token_ttl=args.token_ttl
+    )
+    server = UpstoxMockServer(args.host, args.port, config)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Mock server stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
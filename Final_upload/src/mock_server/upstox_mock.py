@@ -0,0 +1,376 @@
+"""
+Upstox Mock Server
+Local stand-in for the Upstox UAT auth and email-OTP endpoints.
+
+Implements every endpoint constant on UpstoxAuthClient with the same
+request/response shapes, the real state machine
+(generate → verify → 2FA → email send → email verify) and
+UpstoxErrorCodes error responses, plus latency/failure injection.
+"""
+import json
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from src.api_clients.upstox_auth_client import UpstoxAuthClient
+from src.models.upstox_models import (
+    EmailSendOTPResponse,
+    EmailVerifyOTPResponse,
+    TwoFactorAuthResponse,
+    UpstoxErrorCodes,
+    VerifyOTPResponse
+)
+from src.utils.logger import logger
+
+
+# Not a documented Upstox code - the mock needs one for a wrong OTP
+INVALID_OTP_CODE = 1017000
+
+GENERATE_OTP_MESSAGE = "OTP sent successfully"
+VALIDATE_OTP_MESSAGE = "OTP validated successfully"
+LOGIN_MESSAGE = "Login successful"
+
+
+@dataclass
+class MockConfig:
+    """Behaviour knobs for the mock server"""
+    valid_otp: str = "123789"
+    token_ttl: float = 300.0               # Seconds before validateOTPToken expires
+    next_request_interval: int = 30        # Reported in generate-OTP responses
+    enforce_rate_limit: bool = False       # Reject generate-OTP inside the interval with 429
+    latency_ms: float = 0.0                # Fixed latency added to every response
+    latency_jitter_ms: float = 0.0         # Extra random latency (0..jitter)
+    failure_rate: float = 0.0              # Fraction of requests answered with failure_status
+    failure_status: int = 503
+    endpoint_failure_rates: Dict[str, float] = field(default_factory=dict)  # Per-path override
+    seed: Optional[int] = None
+
+
+class MockState:
+    """In-memory Upstox state shared by all handler threads"""
+
+    def __init__(self, config: MockConfig):
+        self.config = config
+        self.lock = threading.Lock()
+        self.sessions: Dict[str, Dict[str, Any]] = {}       # validateOTPToken -> session
+        self.profiles: Dict[int, Dict[str, Any]] = {}       # profileId -> profile
+        self.profile_by_mobile: Dict[str, int] = {}
+        self.next_allowed: Dict[str, float] = {}            # mobile -> next generate time
+        self.request_counts: Dict[str, int] = {}
+        self._next_profile_id = 100000
+        self.random = random.Random(config.seed)
+
+    def reset(self):
+        """Drop all users and sessions"""
+        with self.lock:
+            self.sessions.clear()
+            self.profiles.clear()
+            self.profile_by_mobile.clear()
+            self.next_allowed.clear()
+            self.request_counts.clear()
+
+    def profile_for(self, mobile: str) -> int:
+        """Get or create the profile id for a mobile number (caller holds lock)"""
+        if mobile not in self.profile_by_mobile:
+            self._next_profile_id += 1
+            profile_id = self._next_profile_id
+            self.profile_by_mobile[mobile] = profile_id
+            self.profiles[profile_id] = {"mobile": mobile, "two_fa": False, "email": None,
+                                         "email_otp_sent": False, "email_verified": False}
+        return self.profile_by_mobile[mobile]
+
+
+def _error(status: int, code: int, message: str) -> Tuple[int, Dict[str, Any], Dict[str, str]]:
+    """Upstox-style error envelope"""
+    return status, {
+        "success": False,
+        "error": {"code": code, "message": message},
+        "request_id": uuid.uuid4().hex
+    }, {}
+
+
+def _ok(data: Dict[str, Any]) -> Tuple[int, Dict[str, Any], Dict[str, str]]:
+    """Upstox-style success envelope"""
+    return 200, {"success": True, "data": data}, {}
+
+
+class UpstoxMockHandler(BaseHTTPRequestHandler):
+    """Routes requests to endpoint handlers"""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, so pooled clients reuse connections
+    server: "UpstoxMockHTTPServer"
+
+    ROUTES = {
+        UpstoxAuthClient.GENERATE_OTP_ENDPOINT: "generate_otp",
+        UpstoxAuthClient.VALIDATE_OTP_ENDPOINT: "validate_otp",
+        UpstoxAuthClient.VERIFY_OTP_ENDPOINT: "verify_otp",
+        UpstoxAuthClient.TWO_FA_ENDPOINT: "two_fa",
+        UpstoxAuthClient.EMAIL_SEND_OTP_ENDPOINT: "email_send_otp",
+        UpstoxAuthClient.EMAIL_VERIFY_OTP_ENDPOINT: "email_verify_otp",
+        UpstoxAuthClient.LOGIN_ENDPOINT: "login",
+    }
+
+    def log_message(self, format, *args):
+        """Route access logs to the framework logger at DEBUG"""
+        logger.debug(f"[mock] {self.address_string()} {format % args}")
+
+    def do_POST(self):
+        parts = urlsplit(self.path)
+        state = self.server.state
+        config = state.config
+
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw) if raw else {}
+        except ValueError:
+            body = None
+
+        self._inject_latency(config, state)
+
+        route = self.ROUTES.get(parts.path)
+        with state.lock:
+            state.request_counts[parts.path] = state.request_counts.get(parts.path, 0) + 1
+
+        if route is None:
+            status, payload, headers = 404, {"success": False, "error": {"message": "Not Found"}}, {}
+        elif self._should_fail(config, state, parts.path):
+            status, payload, headers = config.failure_status, {
+                "success": False, "error": {"message": "Injected failure"}
+            }, {}
+        elif body is None or not isinstance(body, dict):
+            status, payload, headers = 400, {"success": False, "error": {"message": "Malformed JSON"}}, {}
+        else:
+            query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+            status, payload, headers = getattr(self, f"_{route}")(state, body, query)
+
+        self._send(status, payload, headers)
+
+    def _inject_latency(self, config: MockConfig, state: MockState):
+        if config.latency_ms or config.latency_jitter_ms:
+            with state.lock:
+                jitter = state.random.uniform(0, config.latency_jitter_ms)
+            time.sleep((config.latency_ms + jitter) / 1000)
+
+    def _should_fail(self, config: MockConfig, state: MockState, path: str) -> bool:
+        rate = config.endpoint_failure_rates.get(path, config.failure_rate)
+        if rate <= 0:
+            return False
+        with state.lock:
+            return state.random.random() < rate
+
+    def _send(self, status: int, payload: Dict[str, Any], headers: Dict[str, str]):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    # ═══════════════════════════════════════════════════════════════
+    # ENDPOINT HANDLERS (called with state.lock NOT held)
+    # ═══════════════════════════════════════════════════════════════
+
+    def _live_session(self, state: MockState, token: Optional[str]):
+        """Return (session, error_response) for a validateOTPToken"""
+        if not token:
+            return None, (400, {"success": False, "error": {"message": "validateOtpToken is required"}}, {})
+        session = state.sessions.get(token)
+        if session is None or time.monotonic() > session["expires_at"]:
+            return None, _error(200, UpstoxErrorCodes.SESSION_EXPIRED,
+                                "Your session to validate otp has expired, please try again.")
+        return session, None
+
+    def _generate_otp(self, state, body, query):
+        mobile = (body.get("data") or {}).get("mobileNumber")
+        if mobile is None:
+            return 400, {"success": False, "error": {"message": "mobileNumber is required"}}, {}
+        if len(mobile) != 10 or not mobile.isdigit() or mobile[0] not in "6789":
+            return _error(400, UpstoxErrorCodes.INVALID_MOBILE, "Please enter a valid mobile number")
+
+        config = state.config
+        now = time.monotonic()
+        with state.lock:
+            wait = state.next_allowed.get(mobile, 0) - now
+            if config.enforce_rate_limit and wait > 0:
+                status, payload, _ = _error(429, UpstoxErrorCodes.RATE_LIMIT_EXCEEDED,
+                                            "Too many OTP requests, please try again later.")
+                return status, payload, {"Retry-After": str(max(1, int(wait + 0.999)))}
+            state.next_allowed[mobile] = now + config.next_request_interval
+
+            token = uuid.uuid4().hex + uuid.uuid4().hex
+            state.sessions[token] = {
+                "mobile": mobile,
+                "expires_at": now + config.token_ttl,
+                "verified": False,
+            }
+
+        return _ok({
+            "message": GENERATE_OTP_MESSAGE,
+            "validateOTPToken": token,
+            "nextRequestInterval": config.next_request_interval
+        })
+
+    def _validate_otp(self, state, body, query):
+        data = body.get("data") or {}
+        token = data.get("validateOTPToken") or query.get("validateOTPToken")
+        with state.lock:
+            session, error = self._live_session(state, token)
+            if error:
+                return error
+            if data.get("otp") != state.config.valid_otp:
+                return _error(200, INVALID_OTP_CODE, "Invalid OTP")
+            session["verified"] = True
+        return _ok({"message": VALIDATE_OTP_MESSAGE})
+
+    def _verify_otp(self, state, body, query):
+        data = body.get("data") or {}
+        with state.lock:
+            session, error = self._live_session(state, data.get("validateOtpToken"))
+            if error:
+                return error
+            if data.get("otp") != state.config.valid_otp:
+                return _error(200, INVALID_OTP_CODE, "Invalid OTP")
+            session["verified"] = True
+            profile_id = state.profile_for(session["mobile"])
+
+        return _ok({
+            "message": VerifyOTPResponse.SUCCESS_MESSAGE,
+            "userType": "LEAD",
+            "isSecretPinSet": False,
+            "userProfile": {"profileId": profile_id}
+        })
+
+    def _two_fa(self, state, body, query):
+        data = body.get("data") or {}
+        with state.lock:
+            session, error = self._live_session(state, data.get("validateOtpToken"))
+            if error:
+                return error
+            if data.get("otp") != state.config.valid_otp:
+                return _error(200, INVALID_OTP_CODE, "Invalid OTP")
+            if not session["verified"]:
+                return _error(200, UpstoxErrorCodes.SESSION_EXPIRED,
+                              "Your session to validate otp has expired, please try again.")
+            state.profiles[state.profile_for(session["mobile"])]["two_fa"] = True
+
+        return _ok({
+            "message": "2FA successful",
+            "redirectUri": query.get("redirect_uri", TwoFactorAuthResponse.EXPECTED_REDIRECT_URI),
+            "userType": TwoFactorAuthResponse.EXPECTED_USER_TYPE,
+            "customerStatus": TwoFactorAuthResponse.EXPECTED_CUSTOMER_STATUS
+        })
+
+    def _email_profile(self, state):
+        """Return (profile, error_response) for the X-profile-id header"""
+        try:
+            profile_id = int(self.headers.get("X-profile-id", ""))
+        except ValueError:
+            return None, (400, {"errors": [{"code": 400, "message": "X-profile-id header is required"}]}, {})
+        profile = state.profiles.get(profile_id)
+        if profile is None or not profile["two_fa"]:
+            return None, (401, {"errors": [{"code": 401, "message": "Unauthorized"}]}, {})
+        return profile, None
+
+    def _email_send_otp(self, state, body, query):
+        email = body.get("email")
+        if not email or "@" not in email:
+            return 400, {"errors": [{"code": 400, "message": "Please enter a valid email"}]}, {}
+        with state.lock:
+            profile, error = self._email_profile(state)
+            if error:
+                return error
+            profile.update(email=email, email_otp_sent=True, email_verified=False)
+        return 200, {EmailSendOTPResponse.EXPECTED_KEY: EmailSendOTPResponse.EXPECTED_MESSAGE}, {}
+
+    def _email_verify_otp(self, state, body, query):
+        with state.lock:
+            profile, error = self._email_profile(state)
+            if error:
+                return error
+            if not profile["email_otp_sent"] or profile["email"] != body.get("email"):
+                return 400, {"errors": [{"code": 400, "message": "Please request an email OTP first"}]}, {}
+            if body.get("otp") != state.config.valid_otp:
+                return 400, {"errors": [{"code": INVALID_OTP_CODE, "message": "Invalid OTP"}]}, {}
+            profile["email_verified"] = True
+        return 200, {EmailVerifyOTPResponse.EXPECTED_KEY: EmailVerifyOTPResponse.EXPECTED_MESSAGE}, {}
+
+    def _login(self, state, body, query):
+        data = body.get("data") or {}
+        token = data.get("validateOTPToken") or data.get("validateOtpToken") or query.get("validateOTPToken")
+        with state.lock:
+            session, error = self._live_session(state, token)
+            if error:
+                return error
+            if not session["verified"]:
+                return _error(200, INVALID_OTP_CODE, "Please validate the OTP first")
+            profile_id = state.profile_for(session["mobile"])
+        return _ok({"message": LOGIN_MESSAGE, "profileId": profile_id, "accessToken": uuid.uuid4().hex})
+
+
+class UpstoxMockHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP server carrying the shared mock state"""
+    daemon_threads = True
+    request_queue_size = 512
+
+    def __init__(self, address, state: MockState):
+        super().__init__(address, UpstoxMockHandler)
+        self.state = state
+
+
+class UpstoxMockServer:
+    """
+    Run the mock server in a background thread.
+
+    Example:
+        >>> with UpstoxMockServer() as server:
+        ...     client = UpstoxAuthClient(base_url=server.base_url)
+        ...     client.generate_otp("9870165199")
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, config: Optional[MockConfig] = None):
+        self.config = config or MockConfig()
+        self.state = MockState(self.config)
+        self.httpd = UpstoxMockHTTPServer((host, port), self.state)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """URL to pass as UpstoxAuthClient(base_url=...)"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "UpstoxMockServer":
+        """Start serving in a daemon thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="upstox-mock", daemon=True)
+        self._thread.start()
+        logger.info(f"🧪 Upstox mock server listening on {self.base_url}")
+        return self
+
+    def stop(self):
+        """Stop serving and release the port"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def serve_forever(self):
+        """Serve in the calling thread (CLI usage)"""
+        logger.info(f"🧪 Upstox mock server listening on {self.base_url}")
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
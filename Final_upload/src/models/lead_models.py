@@ -120,6 +120,16 @@ class BulkImportResponse(BaseModel):
     imported: int
     failed: int
     errors: Optional[List[dict]] = None
+
+
+class LeadCreationResult(BaseModel):
+    """Outcome of one lead in LeadAPIClient.create_leads"""
+    index: int                          # Position in the input
+    email: str
+    success: bool = False
+    lead_id: Optional[str] = None
+    message: str = ""
+    duration: float = 0.0               # Seconds
     
     
 class LeadStatusResponse(BaseModel):
@@ -1,9 +1,90 @@
 """
 Data Models for Upstox API
 """
-from typing import Optional, Dict, Any, List, ClassVar
+import json
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import cached_property, lru_cache
+from typing import Optional, Dict, Any, List, ClassVar, FrozenSet, Iterator, Tuple, Type, TypeVar, Union
 from pydantic import BaseModel, Field, field_validator
 
+try:
+    import orjson  # Optional: decodes response bytes several times faster than json
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+R = TypeVar("R", bound="UpstoxResponse")
+
+
+# ═══════════════════════════════════════════════════════════════════
+# RESPONSE DECODING
+# ═══════════════════════════════════════════════════════════════════
+
+@lru_cache(maxsize=None)
+def _construction_plan(model: Type[BaseModel]) -> Optional[Tuple[FrozenSet[str], Dict[str, Any], Dict[str, Any]]]:
+    """
+    (required fields, defaults of optional fields, private attribute defaults)
+    for building `model` without validation; None if a field needs a
+    default_factory (then model_construct is used)
+    """
+    required, defaults = [], {}
+    for name, info in model.model_fields.items():
+        if info.is_required():
+            required.append(name)
+        elif info.default_factory is not None:
+            return None
+        else:
+            defaults[name] = info.default
+    private = {name: attr.get_default() for name, attr in model.__private_attributes__.items()}
+    return frozenset(required), defaults, private
+
+
+class UpstoxResponse(BaseModel):
+    """
+    Base for Upstox response models: decodes straight from response bytes.
+
+    Derived accessors (message, profile_id, ...) are cached_property, so
+    they are computed once per instance; treat a parsed response as
+    read-only.
+
+    trusted=True builds the model without validation (like model_construct,
+    but cheaper) for bodies that were already validated once, such as cassette replays and
+    mock-server responses. A body missing a required field is still
+    validated, so it fails loudly instead of producing a half-built model.
+
+    Example:
+        >>> otp_response = GenerateOTPResponse.parse(response.content)
+        >>> otp_response.validate_otp_token
+    """
+    
+    @classmethod
+    def parse(cls: Type[R], content: Union[bytes, str], trusted: bool = False) -> R:
+        """Decode a JSON body (bytes or str) into the model"""
+        return cls.from_data(_json_loads(content), trusted=trusted)
+    
+    @classmethod
+    def from_data(cls: Type[R], data: Dict[str, Any], trusted: bool = False) -> R:
+        """Build the model from an already decoded body"""
+        if trusted and isinstance(data, dict):
+            plan = _construction_plan(cls)
+            if plan is None:
+                return cls.model_construct(**data)
+            required, defaults, private = plan
+            if required <= data.keys():
+                # Same state model_construct leaves behind, minus its per-call overhead
+                values = {name: data.get(name, default) for name, default in defaults.items()}
+                for name in required:
+                    values[name] = data[name]
+                instance = cls.__new__(cls)
+                object.__setattr__(instance, "__dict__", values)
+                object.__setattr__(instance, "__pydantic_fields_set__", values.keys() & data.keys())
+                object.__setattr__(instance, "__pydantic_extra__", None)
+                object.__setattr__(instance, "__pydantic_private__", dict(private) if private else None)
+                return instance
+        return cls.model_validate(data)
+
 
 class GenerateOTPRequest(BaseModel):
     """Request model for Generate OTP API"""
@@ -15,7 +96,7 @@ class GenerateOTPRequest(BaseModel):
         return cls(data={"mobileNumber": mobile_number})
 
 
-class GenerateOTPResponse(BaseModel):
+class GenerateOTPResponse(UpstoxResponse):
     """Response model for Generate OTP API"""
     success: bool
     data: Optional[Dict[str, Any]] = None
@@ -28,14 +109,14 @@ class GenerateOTPResponse(BaseModel):
         """Check if response indicates success"""
         return self.success
     
-    @property
+    @cached_property
     def validate_otp_token(self) -> Optional[str]:
         """Get validateOTPToken from response"""
         if self.data:
             return self.data.get("validateOTPToken")
         return None
     
-    @property
+    @cached_property
     def message(self) -> str:
         """Get response message"""
         if self.data:
@@ -46,14 +127,14 @@ class GenerateOTPResponse(BaseModel):
             return self.errors[0].get("message", "Unknown error")
         return ""
     
-    @property
+    @cached_property
     def error_code(self) -> Optional[int]:
         """Get error code if present"""
         if self.error:
             return self.error.get("code")
         return None
     
-    @property
+    @cached_property
     def next_request_interval(self) -> Optional[int]:
         """Get next request interval in seconds"""
         if self.data:
@@ -94,57 +175,164 @@ class UpstoxDeviceDetails(BaseModel):
 
 
 # Token storage for sharing between APIs
+class SessionContext:
+    """
+    Tokens and user data for one flow (one user's login/onboarding).
+
+    Thread-safe, so a context can be read from worker threads. Make it the
+    active store for the current thread/asyncio task with session_scope().
+    """
+    
+    def __init__(self, name: Optional[str] = None):
+        self.name = name
+        self._tokens: Dict[str, str] = {}
+        self._user_data: Dict[str, Any] = {}  # Store profileId, etc.
+        self._lock = threading.RLock()
+    
+    def save_token(self, key: str, token: str):
+        """Save token with key"""
+        with self._lock:
+            self._tokens[key] = token
+    
+    def get_token(self, key: str) -> Optional[str]:
+        """Get token by key"""
+        with self._lock:
+            return self._tokens.get(key)
+    
+    def save_user_data(self, key: str, value: Any):
+        """Save user data (profileId, etc.)"""
+        with self._lock:
+            self._user_data[key] = value
+    
+    def get_user_data(self, key: str) -> Optional[Any]:
+        """Get user data by key"""
+        with self._lock:
+            return self._user_data.get(key)
+    
+    def clear_token(self, key: str):
+        """Clear specific token"""
+        with self._lock:
+            self._tokens.pop(key, None)
+    
+    def clear_user_data(self, key: str):
+        """Clear specific user data"""
+        with self._lock:
+            self._user_data.pop(key, None)
+    
+    def clear_all(self):
+        """Clear all tokens and user data"""
+        with self._lock:
+            self._tokens.clear()
+            self._user_data.clear()
+    
+    @property
+    def all_tokens(self) -> Dict[str, str]:
+        """Get all stored tokens"""
+        with self._lock:
+            return self._tokens.copy()
+    
+    @property
+    def all_user_data(self) -> Dict[str, Any]:
+        """Get all stored user data"""
+        with self._lock:
+            return self._user_data.copy()
+
+
+# Process-wide session used when no session_scope() is active (legacy behaviour)
+_default_session = SessionContext(name="default")
+_current_session: ContextVar[Optional[SessionContext]] = ContextVar("upstox_session", default=None)
+
+
+def current_session() -> SessionContext:
+    """Get the session active in this thread/asyncio task (falls back to the default session)"""
+    return _current_session.get() or _default_session
+
+
+@contextmanager
+def session_scope(session: Optional[SessionContext] = None) -> Iterator[SessionContext]:
+    """
+    Activate a session for the current thread/asyncio task.
+
+    Everything that goes through ``token_store`` (including UpstoxAuthClient
+    created without an explicit ``store``) reads and writes this session until
+    the block exits.
+
+    Example:
+        >>> with session_scope() as session:
+        ...     client.generate_otp("9870165199")
+        ...     client.verify_otp("123789")
+        >>> session.get_user_data("profile_id")
+    """
+    session = session or SessionContext()
+    reset_token = _current_session.set(session)
+    try:
+        yield session
+    finally:
+        _current_session.reset(reset_token)
+
+
 class TokenStore:
-    """Singleton to store tokens and user data across API calls"""
+    """
+    Singleton facade over the active SessionContext.
+
+    Kept for backward compatibility: ``token_store.get_token(...)`` etc. act on
+    current_session(), i.e. the session_scope() of the calling thread/task or
+    the shared default session outside any scope.
+    """
     _instance = None
-    _tokens: Dict[str, str] = {}
-    _user_data: Dict[str, Any] = {}  # Store profileId, etc.
     
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(TokenStore, cls).__new__(cls)
         return cls._instance
     
+    @classmethod
+    def isolated(cls) -> SessionContext:
+        """Create a private store (not the shared default session) for one flow"""
+        return SessionContext()
+    
+    @property
+    def session(self) -> SessionContext:
+        """Session the facade currently resolves to"""
+        return current_session()
+    
     def save_token(self, key: str, token: str):
         """Save token with key"""
-        self._tokens[key] = token
+        current_session().save_token(key, token)
     
     def get_token(self, key: str) -> Optional[str]:
         """Get token by key"""
-        return self._tokens.get(key)
+        return current_session().get_token(key)
     
     def save_user_data(self, key: str, value: Any):
         """Save user data (profileId, etc.)"""
-        self._user_data[key] = value
+        current_session().save_user_data(key, value)
     
     def get_user_data(self, key: str) -> Optional[Any]:
         """Get user data by key"""
-        return self._user_data.get(key)
+        return current_session().get_user_data(key)
     
     def clear_token(self, key: str):
         """Clear specific token"""
-        if key in self._tokens:
-            del self._tokens[key]
+        current_session().clear_token(key)
     
     def clear_user_data(self, key: str):
         """Clear specific user data"""
-        if key in self._user_data:
-            del self._user_data[key]
+        current_session().clear_user_data(key)
     
     def clear_all(self):
         """Clear all tokens and user data"""
-        self._tokens.clear()
-        self._user_data.clear()
+        current_session().clear_all()
     
     @property
     def all_tokens(self) -> Dict[str, str]:
         """Get all stored tokens"""
-        return self._tokens.copy()
+        return current_session().all_tokens
     
     @property
     def all_user_data(self) -> Dict[str, Any]:
         """Get all stored user data"""
-        return self._user_data.copy()
+        return current_session().all_user_data
 
 
 class VerifyOTPRequest(BaseModel):
@@ -160,7 +348,7 @@ class VerifyOTPRequest(BaseModel):
         })
 
 
-class VerifyOTPResponse(BaseModel):
+class VerifyOTPResponse(UpstoxResponse):
     """Response model for Verify OTP API"""
     success: bool
     data: Optional[Dict[str, Any]] = None
@@ -176,7 +364,7 @@ class VerifyOTPResponse(BaseModel):
         """Check if response indicates success"""
         return self.success
     
-    @property
+    @cached_property
     def message(self) -> str:
         """Get response message"""
         if self.data:
@@ -187,21 +375,21 @@ class VerifyOTPResponse(BaseModel):
             return self.errors[0].get("message", "Unknown error")
         return ""
     
-    @property
+    @cached_property
     def user_type(self) -> Optional[str]:
         """Get userType from response"""
         if self.data:
             return self.data.get("userType")
         return None
     
-    @property
+    @cached_property
     def is_secret_pin_set(self) -> Optional[bool]:
         """Get isSecretPinSet from response"""
         if self.data:
             return self.data.get("isSecretPinSet")
         return None
     
-    @property
+    @cached_property
     def profile_id(self) -> Optional[int]:
         """Get profileId from response (must be numeric)"""
         if self.data:
@@ -224,7 +412,7 @@ class VerifyOTPResponse(BaseModel):
                         return None
         return None
     
-    @property
+    @cached_property
     def error_code(self) -> Optional[int]:
         """Get error code if present"""
         if self.error:
@@ -292,7 +480,7 @@ class TwoFactorAuthRequest(BaseModel):
         })
 
 
-class TwoFactorAuthResponse(BaseModel):
+class TwoFactorAuthResponse(UpstoxResponse):
     """Response model for 2FA Authentication API"""
     success: bool
     data: Optional[Dict[str, Any]] = None
@@ -309,28 +497,28 @@ class TwoFactorAuthResponse(BaseModel):
         """Check if response indicates success"""
         return self.success
     
-    @property
+    @cached_property
     def redirect_uri(self) -> Optional[str]:
         """Get redirectUri from response"""
         if self.data:
             return self.data.get("redirectUri")
         return None
     
-    @property
+    @cached_property
     def user_type(self) -> Optional[str]:
         """Get userType from response"""
         if self.data:
             return self.data.get("userType")
         return None
     
-    @property
+    @cached_property
     def customer_status(self) -> Optional[str]:
         """Get customerStatus from response"""
         if self.data:
             return self.data.get("customerStatus")
         return None
     
-    @property
+    @cached_property
     def error_code(self) -> Optional[int]:
         """Get error code if present"""
         if self.error:
@@ -339,7 +527,7 @@ class TwoFactorAuthResponse(BaseModel):
             return self.errors[0].get("code")
         return None
     
-    @property
+    @cached_property
     def message(self) -> str:
         """Get response message"""
         if self.data:
@@ -398,7 +586,7 @@ class EmailSendOTPRequest(BaseModel):
         return v
 
 
-class EmailSendOTPResponse(BaseModel):
+class EmailSendOTPResponse(UpstoxResponse):
     """Response model for Email Send OTP API"""
     # The response is flat: {"EMAIL": "OTP sent successfully"}
     # No 'success' field or 'data' wrapper in actual API response
@@ -478,18 +666,18 @@ class EmailSendOTPResponse(BaseModel):
         return True, "Email OTP validation passed"
     
     @classmethod
-    def from_raw_response(cls, raw_data: Dict[str, Any]) -> "EmailSendOTPResponse":
+    def from_raw_response(cls, raw_data: Dict[str, Any], trusted: bool = False) -> "EmailSendOTPResponse":
         """
         Factory method to create response from raw API response.
         Handles flat format: {"EMAIL": "OTP sent successfully"}
         """
-        instance = cls(
-            success=raw_data.get("success"),  # May be None
-            data=raw_data.get("data"),  # May be None
-            error=raw_data.get("error"),
-            errors=raw_data.get("errors")
-        )
-        instance._raw_response = raw_data
+        return cls.from_data(raw_data, trusted=trusted)
+    
+    @classmethod
+    def from_data(cls, data: Dict[str, Any], trusted: bool = False) -> "EmailSendOTPResponse":
+        """Build the model, keeping the flat body for message lookups"""
+        instance = super().from_data(data, trusted=trusted)
+        instance._raw_response = data
         return instance
 
 
@@ -508,7 +696,7 @@ class EmailVerifyOTPRequest(BaseModel):
         return cls(email=email, otp=otp)
 
 
-class EmailVerifyOTPResponse(BaseModel):
+class EmailVerifyOTPResponse(UpstoxResponse):
     """Response model for Email Verify OTP API"""
     # Flat response format: {"EMAIL": "OTP verified successfully"}
     success: Optional[bool] = None
@@ -568,20 +756,38 @@ class EmailVerifyOTPResponse(BaseModel):
         return True, "Email OTP verification passed"
     
     @classmethod
-    def from_raw_response(cls, raw_data: Dict[str, Any]) -> "EmailVerifyOTPResponse":
+    def from_raw_response(cls, raw_data: Dict[str, Any], trusted: bool = False) -> "EmailVerifyOTPResponse":
         """
         Factory method to create response from raw API response.
         Handles flat format: {"EMAIL": "OTP verified successfully"}
         """
-        instance = cls(
-            success=raw_data.get("success"),
-            data=raw_data.get("data"),
-            error=raw_data.get("error"),
-            errors=raw_data.get("errors")
-        )
-        instance._raw_response = raw_data
+        return cls.from_data(raw_data, trusted=trusted)
+    
+    @classmethod
+    def from_data(cls, data: Dict[str, Any], trusted: bool = False) -> "EmailVerifyOTPResponse":
+        """Build the model, keeping the flat body for message lookups"""
+        instance = super().from_data(data, trusted=trusted)
+        instance._raw_response = data
         return instance
 
 
+# ═══════════════════════════════════════════════════════════════════
+# BATCH ONBOARDING
+# ═══════════════════════════════════════════════════════════════════
+
+class OnboardingResult(BaseModel):
+    """Outcome of one user's 5-stage onboarding in UpstoxAuthClient.onboard_many"""
+    mobile_number: str
+    email: str
+    success: bool
+    stage: str                                   # Last stage attempted
+    message: str = ""
+    profile_id: Optional[int] = None
+    customer_status: Optional[str] = None
+    duration: float = 0.0                        # Seconds for the whole flow
+    rate_limit_wait: float = 0.0                 # Seconds spent waiting for a Generate OTP slot
+    rate_limit_retries: int = 0                  # Generate OTP calls rejected as throttled
+
+
 # Global token store instance
 token_store = TokenStore()
@@ -2,12 +2,92 @@
 Custom Assertions for API Testing
 """
 import json
-from typing import Any, Dict, List, Optional, Union
-from jsonschema import validate, ValidationError
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple, Union
 import requests
 
 from src.utils.logger import logger
 
+if TYPE_CHECKING:
+    from jsonschema import ValidationError
+
+# jsonschema / fastjsonschema are imported on the first schema check
+# (they are the slowest imports in the package); see _schema_libraries()
+fastjsonschema = None
+_fastjsonschema_checked = False
+
+
+def _schema_libraries():
+    """Import the optional fast validator once"""
+    global fastjsonschema, _fastjsonschema_checked
+    if not _fastjsonschema_checked:
+        try:
+            import fastjsonschema as module
+            fastjsonschema = module
+        except ImportError:
+            pass
+        _fastjsonschema_checked = True
+
+
+def validator_for(schema: Dict[str, Any]):
+    """jsonschema's validator class for schema (jsonschema imported on first use)"""
+    from jsonschema.validators import validator_for as _validator_for
+    return _validator_for(schema)
+
+
+def best_match(errors: Iterable[Any]) -> Optional["ValidationError"]:
+    """jsonschema's most relevant error among errors"""
+    from jsonschema.exceptions import best_match as _best_match
+    return _best_match(errors)
+
+
+# ═══════════════════════════════════════════════════════════════════
+# SCHEMA VALIDATOR CACHE
+# ═══════════════════════════════════════════════════════════════════
+
+# id(schema) -> (schema, jsonschema validator, compiled fast validator or None).
+# The schema itself is kept so its id cannot be reused by another object.
+# Schemas are expected to be module-level constants that are not mutated.
+_schema_validators: Dict[int, Tuple[Dict[str, Any], Any, Any]] = {}
+_schema_lock = threading.Lock()
+
+
+def _get_schema_validators(schema: Dict[str, Any]) -> Tuple[Any, Any]:
+    """Get (validator, fast_validator) for a schema, building them on first use"""
+    entry = _schema_validators.get(id(schema))
+    if entry is None or entry[0] is not schema:
+        _schema_libraries()
+        validator_class = validator_for(schema)
+        validator_class.check_schema(schema)  # Checked once, not on every response
+        fast_validator = None
+        if fastjsonschema is not None:
+            try:
+                fast_validator = fastjsonschema.compile(schema)
+            except Exception as e:
+                logger.debug(f"fastjsonschema cannot compile schema, using jsonschema only: {e}")
+        entry = (schema, validator_class(schema), fast_validator)
+        with _schema_lock:
+            _schema_validators[id(schema)] = entry
+    return entry[1], entry[2]
+
+
+def schema_error(instance: Any, schema: Dict[str, Any]) -> Optional["ValidationError"]:
+    """Return the most relevant validation error for instance, or None if it is valid"""
+    validator, fast_validator = _get_schema_validators(schema)
+    if fast_validator is not None:
+        try:
+            fast_validator(instance)
+            return None
+        except fastjsonschema.JsonSchemaException:
+            pass  # Re-validate below for jsonschema's (consistent) error message
+    return best_match(validator.iter_errors(instance))
+
+
+def clear_schema_cache():
+    """Drop all cached validators"""
+    with _schema_lock:
+        _schema_validators.clear()
+
 
 class APIAssertions:
     """Custom assertion helpers for API testing"""
@@ -43,19 +123,49 @@ class APIAssertions:
     
     @staticmethod
     def assert_json_schema(response: requests.Response, schema: Dict[str, Any]):
-        """Assert response matches JSON schema"""
+        """Assert response matches JSON schema (validator compiled once per schema)"""
         try:
             data = response.json()
-            validate(instance=data, schema=schema)
-            logger.info("✓ JSON schema validation passed")
-        except ValidationError as e:
-            error_msg = f"JSON schema validation failed: {e.message}"
-            logger.error(error_msg)
-            raise AssertionError(error_msg)
         except json.JSONDecodeError as e:
             error_msg = f"Invalid JSON response: {e}"
             logger.error(error_msg)
             raise AssertionError(error_msg)
+        
+        error = schema_error(data, schema)
+        if error is not None:
+            error_msg = f"JSON schema validation failed: {error.message}"
+            logger.error(error_msg)
+            raise AssertionError(error_msg)
+        logger.info("✓ JSON schema validation passed")
+    
+    @staticmethod
+    def assert_json_schema_many(
+        responses: Iterable[Union[requests.Response, Any]],
+        schema: Dict[str, Any]
+    ):
+        """
+        Assert every response (or already-parsed JSON body) matches the schema.
+        All items are checked; one AssertionError lists every failure.
+        """
+        failures = []
+        count = 0
+        for index, item in enumerate(responses):
+            count += 1
+            if isinstance(item, requests.Response):
+                try:
+                    item = item.json()
+                except json.JSONDecodeError as e:
+                    failures.append(f"[{index}] Invalid JSON response: {e}")
+                    continue
+            error = schema_error(item, schema)
+            if error is not None:
+                failures.append(f"[{index}] {error.message}")
+        
+        if failures:
+            error_msg = f"JSON schema validation failed for {len(failures)}/{count} responses:\n" + "\n".join(failures[:20])
+            logger.error(error_msg)
+            raise AssertionError(error_msg)
+        logger.info(f"✓ JSON schema validation passed for {count} responses")
     
     @staticmethod
     def assert_response_time(
@@ -207,6 +317,7 @@ class APIAssertions:
 # Aliases for convenience
 assert_status = APIAssertions.assert_status_code
 assert_schema = APIAssertions.assert_json_schema
+assert_schema_many = APIAssertions.assert_json_schema_many
 assert_time = APIAssertions.assert_response_time
 assert_contains = APIAssertions.assert_json_contains
 assert_keys = APIAssertions.assert_json_keys_exist
@@ -0,0 +1,227 @@
+"""
+Record/Replay Cassettes for HTTPClient
+Persists request/response pairs to compact JSON files and serves them back
+with zero network.
+
+Record modes (VCR semantics, matching conftest's --record-mode):
+    none         - replay only; an unmatched request raises CassetteError
+    once         - record everything if the cassette file does not exist yet,
+                   otherwise behave like "none"
+    new_episodes - replay known requests, record new ones
+    all          - always hit the network and re-record
+"""
+import base64
+import hashlib
+import json
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from src.utils.logger import logger
+from src.utils.redaction import Redactor, redactor
+
+
+RECORD_MODES = ("none", "once", "new_episodes", "all")
+
+# Query params / JSON keys whose values change every run (masked for matching)
+DYNAMIC_QUERY_PARAMS = {"requestid", "validateotptoken"}
+DYNAMIC_BODY_KEYS = {"validateotptoken", "otp"}
+MASK = "<masked>"
+
+# Response headers worth keeping (the rest is noise in a cassette)
+KEPT_RESPONSE_HEADERS = ("Content-Type", "Retry-After", "Location")
+
+
+class CassetteError(Exception):
+    """Raised when a request cannot be served in replay-only mode"""
+
+
+def normalize_url(url: str) -> str:
+    """Sort query params and mask dynamic ones (requestId=QATest..., tokens)"""
+    parts = urlsplit(url)
+    query = sorted(
+        (key, MASK if key.lower() in DYNAMIC_QUERY_PARAMS else value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+    )
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ""))
+
+
+_dynamic_values = Redactor(keys=DYNAMIC_BODY_KEYS, key_patterns=(), mask=MASK, preserve_empty=False)
+
+
+def _mask_body(value: Any) -> Any:
+    """Recursively mask dynamic JSON keys"""
+    return _dynamic_values.redact(value)
+
+
+def body_hash(json_data: Any = None, data: Any = None) -> str:
+    """Stable short hash of a request body with dynamic values masked"""
+    if json_data is not None:
+        raw = json.dumps(_mask_body(json_data), sort_keys=True, separators=(",", ":"), default=str)
+    elif data is not None:
+        raw = data.decode("utf-8", "replace") if isinstance(data, bytes) else str(data)
+    else:
+        return "-"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def request_key(method: str, url: str, json_data: Any = None, data: Any = None) -> Tuple[str, str]:
+    """Return (exact_key, loose_key) used to index an interaction"""
+    loose = f"{method.upper()} {normalize_url(url)}"
+    return f"{loose} {body_hash(json_data, data)}", loose
+
+
+class Cassette:
+    """
+    In-memory index of recorded interactions backed by one JSON file.
+
+    Lookups first try an exact match (method + normalized URL + body hash)
+    and fall back to method + normalized URL in recorded order, so flows
+    that use random test data (mobile numbers, emails) still replay.
+
+    Recorded JSON bodies go through `redactor` (tokens, OTPs masked) unless
+    it is None, e.g. for new_episodes runs whose live requests must reuse
+    a recorded token.
+    """
+
+    def __init__(self, path: str, record_mode: str = "once", redactor: Optional[Redactor] = redactor):
+        if record_mode not in RECORD_MODES:
+            raise ValueError(f"record_mode must be one of {RECORD_MODES}, got: {record_mode}")
+        self.path = Path(path)
+        self.record_mode = record_mode
+        self.redactor = redactor
+        self._lock = threading.Lock()
+        self._interactions: List[Dict[str, Any]] = []
+        self._exact: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._loose: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._play_counts: Dict[int, int] = defaultdict(int)
+        self._dirty = False
+
+        existed = self.path.exists()
+        if existed and record_mode != "all":
+            self._load()
+        # "once" records only into a brand-new cassette
+        self.recording = record_mode in ("new_episodes", "all") or (record_mode == "once" and not existed)
+
+    def _load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for interaction in json.load(f)["interactions"]:
+                self._index(interaction)
+
+    def _index(self, interaction: Dict[str, Any]):
+        self._interactions.append(interaction)
+        self._exact[interaction["key"]].append(interaction)
+        self._loose[interaction["loose_key"]].append(interaction)
+
+    def _next(self, candidates: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Pick the first interaction not yet played (repeat the last one when exhausted)"""
+        if not candidates:
+            return None
+        for interaction in candidates:
+            if self._play_counts[id(interaction)] == 0:
+                return interaction
+        return candidates[-1]
+
+    def play(self, method: str, url: str, json_data: Any = None, data: Any = None) -> Optional[requests.Response]:
+        """
+        Return the recorded response for a request, or None if it must go to the network
+
+        Raises:
+            CassetteError: No match and the cassette is not recording
+        """
+        if self.record_mode == "all":
+            return None
+        exact, loose = request_key(method, url, json_data, data)
+        with self._lock:
+            interaction = self._next(self._exact.get(exact, [])) or self._next(self._loose.get(loose, []))
+            if interaction is None:
+                if self.recording:
+                    return None
+                raise CassetteError(f"No recorded response for {exact} in {self.path}")
+            self._play_counts[id(interaction)] += 1
+        return self._build_response(interaction, url)
+
+    def record(self, method: str, url: str, response: requests.Response, json_data: Any = None, data: Any = None):
+        """Store a live response"""
+        if not self.recording:
+            return
+        exact, loose = request_key(method, url, json_data, data)
+        # Tokens/OTPs never reach disk; replay matches them loosely anyway
+        body = self.redactor.redact_json_bytes(response.content) if self.redactor is not None else response.content
+        interaction = {
+            "key": exact,
+            "loose_key": loose,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {
+                name: response.headers[name] for name in KEPT_RESPONSE_HEADERS if name in response.headers
+            },
+            "body": base64.b64encode(body).decode("ascii"),
+        }
+        with self._lock:
+            self._index(interaction)
+            self._play_counts[id(interaction)] += 1
+            self._dirty = True
+
+    @staticmethod
+    def _build_response(interaction: Dict[str, Any], url: str) -> requests.Response:
+        """Rebuild a requests.Response from a stored interaction"""
+        response = requests.Response()
+        response.status_code = interaction["status"]
+        response.reason = interaction.get("reason")
+        response.headers = CaseInsensitiveDict(interaction.get("headers", {}))
+        response._content = base64.b64decode(interaction["body"])
+        response.encoding = "utf-8"
+        response.url = url
+        response.elapsed = timedelta(0)
+        response.replayed = True  # Lets clients skip revalidating the recorded body
+        return response
+
+    def save(self):
+        """Write the cassette to disk if anything new was recorded"""
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump({"version": 1, "interactions": self._interactions}, f, separators=(",", ":"))
+            self._dirty = False
+        logger.info(f"📼 Cassette saved: {self.path} ({len(self._interactions)} interactions)")
+
+    def __len__(self) -> int:
+        return len(self._interactions)
+
+
+# Cassette used by every HTTPClient that has none of its own
+_active_cassette: Optional[Cassette] = None
+
+
+def get_active_cassette() -> Optional[Cassette]:
+    """Get the process-wide active cassette (if any)"""
+    return _active_cassette
+
+
+@contextmanager
+def use_cassette(path: str, record_mode: str = "once", redactor: Optional[Redactor] = redactor) -> Iterator[Cassette]:
+    """
+    Activate a cassette for all HTTPClient instances inside the block
+
+    Example:
+        >>> with use_cassette("tests/cassettes/login_flow.json", "once"):
+        ...     complete_login_flow("9870165199")
+    """
+    global _active_cassette
+    cassette = Cassette(path, record_mode, redactor)
+    previous, _active_cassette = _active_cassette, cassette
+    try:
+        yield cassette
+    finally:
+        _active_cassette = previous
+        cassette.save()
@@ -3,13 +3,46 @@ HTTP Client with retry logic, authentication, and logging
 """
 import time
 import requests
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import Dict, Any, Optional, Callable
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from tenacity import retry, stop_after_attempt, wait_exponential
 
 from config.settings import Settings
 from src.utils.logger import logger, APILogger
+from src.utils.rate_limiter import RateLimitRegistry, rate_limit_registry
+from src.utils.cassette import Cassette, get_active_cassette
+from src.utils.metrics import MetricsCollector, metrics_collector
+
+
+def retry_after_seconds(value: Optional[str], default: float) -> float:
+    """
+    Seconds to wait from a Retry-After header
+
+    Accepts both forms RFC 9110 allows: delay-seconds ("120") and an
+    HTTP-date ("Wed, 21 Oct 2026 07:28:00 GMT"). Missing or unparseable
+    values give `default`; dates in the past give 0.
+    """
+    value = (value or "").strip()
+    if not value:
+        return default
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max((moment - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class _Retry(Retry):
+    """urllib3 retries, minus its own Retry-After handling of 429 (done in HTTPClient._send)"""
+    RETRY_AFTER_STATUS_CODES = frozenset({413, 503})
 
 
 class HTTPClient:
@@ -19,6 +52,9 @@ class HTTPClient:
     - Request/response logging
     - Session management
     - Authentication handling
+    - Proactive client-side rate limiting (opt-in token buckets from environments.yaml)
+    - Optional record/replay cassettes
+    - Per-endpoint latency/status metrics
     """
     
     def __init__(
@@ -26,12 +62,27 @@ class HTTPClient:
         base_url: Optional[str] = None,
         timeout: int = 30,
         retry_attempts: int = 3,
-        headers: Optional[Dict[str, str]] = None
+        headers: Optional[Dict[str, str]] = None,
+        pool_maxsize: int = 10,
+        cassette: Optional[Cassette] = None,
+        session: Optional[requests.Session] = None,
+        metrics: Optional[MetricsCollector] = None,
+        rate_limits: Optional[RateLimitRegistry] = None,
+        resend: bool = True
     ):
         self.base_url = base_url or Settings.get_base_url()
         self.timeout = timeout
         self.retry_attempts = retry_attempts
-        self.session = requests.Session()
+        # False: urllib3 only retries connection failures (the request never
+        # left), never a POST the server may already have processed
+        self.resend = resend
+        # Per host/endpoint quotas shared by every client in the process
+        self.rate_limits = rate_limits if rate_limits is not None else rate_limit_registry
+        self.pool_maxsize = pool_maxsize
+        self.cassette = cassette
+        self.metrics = metrics if metrics is not None else metrics_collector
+        # An existing session (e.g. Locust's HttpSession) can be reused
+        self.session = session or requests.Session()
         
         # Set default headers
         default_headers = {
@@ -52,16 +103,60 @@ class HTTPClient:
     
     def _setup_retries(self):
         """Configure retry strategy"""
-        retry_strategy = Retry(
-            total=self.retry_attempts,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS", "POST", "PUT", "DELETE", "PATCH"]
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        if self.resend:
+            retry_strategy = _Retry(
+                total=self.retry_attempts,
+                backoff_factor=1,
+                status_forcelist=[500, 502, 503, 504],  # 429s are retried in _send, through the rate limits
+                raise_on_status=False,  # Hand back the last response for raise_for_status
+                allowed_methods=["HEAD", "GET", "OPTIONS", "POST", "PUT", "DELETE", "PATCH"]
+            )
+        else:
+            retry_strategy = _Retry(
+                total=self.retry_attempts,
+                connect=self.retry_attempts,
+                read=0,
+                status=0,
+                other=0,
+                backoff_factor=1,
+                raise_on_status=False
+            )
+        adapter = HTTPAdapter(max_retries=retry_strategy, pool_maxsize=self.pool_maxsize)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
     
+    def without_resends(self) -> "HTTPClient":
+        """
+        A client for non-idempotent requests (e.g. bulk imports)
+
+        Same base URL, headers, auth, rate limits, metrics and cassette, but
+        urllib3 only retries connection failures: a request that may have
+        reached the server (read timeout, 5xx) is never sent again. 429s are
+        still retried, as the server did not process them. Close it when done.
+        """
+        client = HTTPClient(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            retry_attempts=self.retry_attempts,
+            headers=dict(self.session.headers),
+            pool_maxsize=self.pool_maxsize,
+            cassette=self.cassette,
+            metrics=self.metrics,
+            rate_limits=self.rate_limits,
+            resend=False
+        )
+        client.session.auth = self.session.auth
+        client.session.cookies.update(self.session.cookies)
+        client._auth_token = self._auth_token
+        client._auth_callback = self._auth_callback
+        return client
+    
+    def set_pool_size(self, maxsize: int):
+        """Grow the keep-alive connection pool (e.g. to match the number of worker threads)"""
+        if maxsize > self.pool_maxsize:
+            self.pool_maxsize = maxsize
+            self._setup_retries()
+    
     def set_auth_token(self, token: str):
         """Set bearer token for authentication"""
         self._auth_token = token
@@ -94,6 +189,7 @@ class HTTPClient:
         params = kwargs.pop('params', None)
         files = kwargs.pop('files', None)
         data = kwargs.pop('data', None)
+        retry_throttled = kwargs.pop('retry_throttled', True)
         
         # Merge headers
         request_headers = {**self.session.headers, **headers}
@@ -104,15 +200,14 @@ class HTTPClient:
         # Make request
         start_time = time.time()
         try:
-            response = self.session.request(
-                method=method,
-                url=url,
+            response = self._send(
+                method, url,
+                retry_throttled=retry_throttled,
                 headers=request_headers,
                 json=json_data,
                 params=params,
                 files=files,
                 data=data,
-                timeout=self.timeout,
                 **kwargs
             )
             response.raise_for_status()
@@ -121,15 +216,15 @@ class HTTPClient:
             # Handle 401 - Try to refresh token if callback is set
             if response.status_code == 401 and self._auth_callback:
                 logger.warning("Token expired, attempting refresh...")
+                self.metrics.record_auth_refresh(method, url)
                 self._auth_callback()
                 # Retry request
-                response = self.session.request(
-                    method=method,
-                    url=url,
+                response = self._send(
+                    method, url,
+                    retry_throttled=retry_throttled,
                     headers=request_headers,
                     json=json_data,
                     params=params,
-                    timeout=self.timeout,
                     **kwargs
                 )
                 response.raise_for_status()
@@ -141,6 +236,44 @@ class HTTPClient:
         
         return response
     
+    def _send(self, method: str, url: str, retry_throttled: bool = True, **kwargs) -> requests.Response:
+        """
+        Send one request, served from / recorded into the cassette if one is active.
+        Live requests are timed into self.metrics. With retry_throttled=False a 429
+        is handed straight back, for callers that schedule their own retries.
+        """
+        cassette = self.cassette if self.cassette is not None else get_active_cassette()
+        params = kwargs.get('params')
+        full_url = requests.Request(method, url, params=params).prepare().url if params else url
+        
+        if cassette is not None:
+            replayed = cassette.play(method, full_url, kwargs.get('json'), kwargs.get('data'))
+            if replayed is not None:
+                return replayed
+        
+        for attempt in range(self.retry_attempts + 1):
+            self.rate_limits.acquire(url)
+            start_time = time.perf_counter()
+            try:
+                response = self.session.request(method=method, url=url, timeout=self.timeout, **kwargs)
+            except requests.exceptions.RequestException:
+                self.metrics.record_error(method, url, time.perf_counter() - start_time)
+                raise
+            self.metrics.record_response(method, url, response, time.perf_counter() - start_time)
+            if response.status_code != 429 or not retry_throttled or attempt == self.retry_attempts:
+                break
+            
+            # Over quota anyway: hold every client on this host/endpoint, then
+            # retry through the same buckets instead of sleeping independently
+            delay = retry_after_seconds(response.headers.get("Retry-After"), 1.0)
+            logger.warning(f"⏸ 429 from {url}; retrying in {delay}s (attempt {attempt + 1}/{self.retry_attempts})")
+            if not self.rate_limits.pause(url, delay):
+                time.sleep(delay)
+        
+        if cassette is not None:
+            cassette.record(method, full_url, response, kwargs.get('json'), kwargs.get('data'))
+        return response
+    
     def get(self, endpoint: str, **kwargs) -> requests.Response:
         """Make GET request"""
         return self._make_request("GET", endpoint, **kwargs)
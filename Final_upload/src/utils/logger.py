@@ -1,10 +1,27 @@
 """
 Logging Utility for API Automation Framework
 """
+import random
 import sys
+import threading
+from contextvars import ContextVar
 from pathlib import Path
+from typing import Dict, Optional
 from loguru import logger as _logger
 from config.settings import Settings
+from src.utils.redaction import redactor
+
+
+# Lowest level any configured sink accepts (lets callers skip building records)
+_min_level_no = 0
+_configured = False
+_configure_lock = threading.Lock()
+
+
+def is_enabled(level: str) -> bool:
+    """Whether a record at `level` would reach any sink configured by setup_logger"""
+    _ensure_configured()
+    return _logger.level(level).no >= _min_level_no
 
 
 def setup_logger(
@@ -20,8 +37,12 @@ def setup_logger(
         log_to_file: Whether to log to file
         log_to_console: Whether to log to console
     """
+    global _min_level_no, _configured
+    _configured = True
+    
     # Remove default handler
     _logger.remove()
+    _min_level_no = _logger.level(log_level).no if (log_to_file or log_to_console) else float("inf")
     
     # Console handler with rich formatting
     if log_to_console:
@@ -35,7 +56,7 @@ def setup_logger(
             colorize=True
         )
     
-    # File handler
+    # File handler (written from a background thread so requests never wait on disk I/O)
     if log_to_file:
         log_file = Settings.LOGS_DIR / "api_automation_{time:YYYY-MM-DD}.log"
         _logger.add(
@@ -44,58 +65,123 @@ def setup_logger(
             level=log_level,
             rotation="10 MB",
             retention="30 days",
-            compression="zip"
+            compression="zip",
+            enqueue=True
         )
     
     return _logger
 
 
-# Create global logger instance
-logger = setup_logger(
-    log_level="DEBUG" if Settings.DEBUG else "INFO",
-    log_to_file=True,
-    log_to_console=True
-)
+def _ensure_configured():
+    """Install the default sinks the first time the logger is used"""
+    if _configured:
+        return
+    with _configure_lock:
+        if not _configured:
+            setup_logger(
+                log_level="DEBUG" if Settings.DEBUG else "INFO",
+                log_to_file=True,
+                log_to_console=True
+            )
+
+
+class _LazyLogger:
+    """
+    Stands in for loguru's logger until first use, so importing this
+    module opens no log file and starts no writer thread. Each attribute
+    is fetched from loguru once and cached here, so later calls cost the
+    same as calling loguru directly.
+    """
+    
+    def __getattr__(self, name: str):
+        _ensure_configured()
+        value = getattr(_logger, name)
+        self.__dict__[name] = value
+        return value
+
+
+# Global logger instance (configured on first use)
+logger = _LazyLogger()
 
 
 class APILogger:
-    """Helper class for API request/response logging"""
+    """
+    Helper class for API request/response logging
+
+    Each request/response is one structured DEBUG record (method, url,
+    status and duration are bound as extra fields). Nothing is formatted or
+    masked unless DEBUG is enabled and the endpoint is sampled; headers and
+    bodies are rendered lazily by loguru, with sensitive fields (tokens,
+    OTPs, Authorization) masked by src.utils.redaction.
+    """
     
-    @staticmethod
-    def log_request(method: str, url: str, headers: dict, body=None):
+    sample_rate: float = 1.0                     # Fraction of requests logged
+    endpoint_sample_rates: Dict[str, float] = {} # Per endpoint template, e.g. {"/api/v1/leads/{id}": 0.1}
+    _sampled: ContextVar[bool] = ContextVar("api_log_sampled", default=True)
+    
+    @classmethod
+    def configure_sampling(cls, rate: float = 1.0, endpoints: Optional[Dict[str, float]] = None):
+        """
+        Log only a fraction of requests (and their responses)
+        
+        Args:
+            rate: Default fraction (0..1) of requests logged
+            endpoints: Fractions per endpoint template (IDs replaced by {id})
+        
+        Example:
+            >>> APILogger.configure_sampling(1.0, {"/api/v1/leads": 0.05})
+        """
+        cls.sample_rate = rate
+        cls.endpoint_sample_rates = dict(endpoints or {})
+    
+    @classmethod
+    def _should_sample(cls, url: str) -> bool:
+        rate = cls.sample_rate
+        if cls.endpoint_sample_rates:
+            from src.utils.metrics import endpoint_template
+            rate = cls.endpoint_sample_rates.get(endpoint_template(url), rate)
+        return rate >= 1.0 or random.random() < rate
+    
+    @classmethod
+    def log_request(cls, method: str, url: str, headers: dict, body=None):
         """Log API request details"""
-        logger.debug(f"{'='*50}")
-        logger.debug(f"API REQUEST: {method} {url}")
-        logger.debug(f"Headers: {headers}")
-        if body:
-            # Mask sensitive data
-            safe_body = APILogger._mask_sensitive_data(body)
-            logger.debug(f"Body: {safe_body}")
-        logger.debug(f"{'='*50}")
+        if not is_enabled("DEBUG"):
+            return
+        sampled = cls._should_sample(url)
+        cls._sampled.set(sampled)
+        if not sampled:
+            return
+        logger.bind(event="api_request", method=method, url=url).opt(lazy=True).debug(
+            "API REQUEST: {} {}\nHeaders: {}\nBody: {}",
+            lambda: method,
+            lambda: url,
+            lambda: redactor.redact(headers),
+            lambda: cls._mask_sensitive_data(body) if body else None
+        )
+    
+    @classmethod
+    def log_response(cls, response, duration: float):
+        """Log API response details (skipped if its request was not sampled)"""
+        if not is_enabled("DEBUG") or not cls._sampled.get():
+            return
+        logger.bind(event="api_response", status=response.status_code, duration=duration).opt(lazy=True).debug(
+            "API RESPONSE: {} ({:.3f}s)\nHeaders: {}\nBody: {}",
+            lambda: response.status_code,
+            lambda: duration,
+            lambda: redactor.redact(dict(response.headers)),
+            lambda: cls._response_body(response)
+        )
     
     @staticmethod
-    def log_response(response, duration: float):
-        """Log API response details"""
-        logger.debug(f"{'='*50}")
-        logger.debug(f"API RESPONSE: {response.status_code} ({duration:.3f}s)")
-        logger.debug(f"Headers: {dict(response.headers)}")
+    def _response_body(response) -> str:
         try:
-            logger.debug(f"Body: {response.text[:1000]}...")  # Limit output
-        except:
-            logger.debug(f"Body: <binary content>")
-        logger.debug(f"{'='*50}")
+            return f"{redactor.redact_text(response.text[:1000])}..."  # Limit output
+        except Exception:
+            return "<binary content>"
     
     @staticmethod
     def _mask_sensitive_data(data):
-        """Mask sensitive fields in request body"""
-        if not isinstance(data, dict):
-            return data
-        
-        sensitive_fields = ['password', 'token', 'api_key', 'secret', 'authorization']
-        masked = data.copy()
-        
-        for key in masked:
-            if any(sf in key.lower() for sf in sensitive_fields):
-                masked[key] = '***MASKED***'
-        
-        return masked
+        """Mask sensitive fields in request body (at any depth)"""
+        if isinstance(data, (str, bytes)):
+            return redactor.redact_text(data.decode("utf-8", "replace") if isinstance(data, bytes) else data)
+        return redactor.redact(data)
@@ -0,0 +1,244 @@
+"""
+HTTP Request Metrics
+Per-endpoint latency histograms, status codes, retries, bytes and 401
+refreshes, collected by HTTPClient and exportable as JSON or Prometheus text.
+"""
+import json
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+
+# Path segments replaced by a placeholder so "/leads/42" and "/leads/43" share metrics
+_ID_SEGMENT = re.compile(
+    r"^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|[0-9a-fA-F]{24,})$"
+)
+
+DEFAULT_QUANTILES = (0.5, 0.9, 0.95, 0.99, 0.999)
+
+
+def endpoint_template(url: str) -> str:
+    """
+    Reduce a URL or endpoint to its template (no query, IDs replaced)
+
+    Example:
+        >>> endpoint_template("https://api.example.com/api/v1/leads/42?x=1")
+        '/api/v1/leads/{id}'
+    """
+    path = urlsplit(url).path or "/"
+    return "/".join("{id}" if _ID_SEGMENT.match(segment) else segment for segment in path.split("/"))
+
+
+class LatencyHistogram:
+    """
+    HDR-style log-linear histogram of latencies in microseconds.
+
+    Values are bucketed by power of two, each split into 16 linear
+    sub-buckets, so any recorded value is reported within ~6% and memory
+    stays fixed (~600 counters) however many samples are recorded.
+    """
+
+    SUB_BUCKETS = 16                 # Linear buckets per power of two
+    MAX_EXPONENT = 36                # 2^36 us ≈ 19 hours; larger values are clamped
+
+    def __init__(self):
+        self.counts = [0] * ((self.MAX_EXPONENT + 2) * self.SUB_BUCKETS)
+        self.count = 0
+        self.total_us = 0
+        self.min_us: Optional[int] = None
+        self.max_us = 0
+
+    @classmethod
+    def _index(cls, value: int) -> int:
+        if value < 2 * cls.SUB_BUCKETS:
+            return value
+        shift = min(value.bit_length() - 5, cls.MAX_EXPONENT)
+        return cls.SUB_BUCKETS * (shift + 1) + min((value >> shift) - cls.SUB_BUCKETS, cls.SUB_BUCKETS - 1)
+
+    @classmethod
+    def _value_at(cls, index: int) -> int:
+        """Upper bound (inclusive) of the values falling into bucket `index`"""
+        if index < 2 * cls.SUB_BUCKETS:
+            return index
+        shift = index // cls.SUB_BUCKETS - 1
+        top = index % cls.SUB_BUCKETS + cls.SUB_BUCKETS
+        return ((top + 1) << shift) - 1
+
+    def record(self, seconds: float):
+        """Record one latency given in seconds"""
+        value = max(int(seconds * 1_000_000), 0)
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.total_us += value
+        self.min_us = value if self.min_us is None else min(self.min_us, value)
+        self.max_us = max(self.max_us, value)
+
+    def percentile(self, quantile: float) -> float:
+        """Latency (ms) at the given quantile (0..1)"""
+        if not self.count:
+            return 0.0
+        target = max(1, int(round(quantile * self.count)))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                if index == len(self.counts) - 1:    # Clamped bucket
+                    return self.max_us / 1000
+                return min(self._value_at(index), self.max_us) / 1000
+        return self.max_us / 1000
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_us / self.count / 1000 if self.count else 0.0
+
+    def to_dict(self, quantiles: Tuple[float, ...] = DEFAULT_QUANTILES) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "min_ms": (self.min_us or 0) / 1000,
+            "max_ms": self.max_us / 1000,
+            "mean_ms": round(self.mean_ms, 3),
+            "percentiles_ms": {f"p{q * 100:g}": self.percentile(q) for q in quantiles},
+        }
+
+
+class EndpointMetrics:
+    """Counters for one method + endpoint template"""
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.status_counts: Dict[str, int] = {}
+        self.retries = 0
+        self.auth_refreshes = 0
+        self.errors = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "latency": self.latency.to_dict(),
+            "status_counts": dict(sorted(self.status_counts.items())),
+            "retries": self.retries,
+            "auth_refreshes": self.auth_refreshes,
+            "errors": self.errors,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+        }
+
+
+class MetricsCollector:
+    """
+    Thread-safe metrics store keyed by (method, endpoint template).
+
+    Example:
+        >>> collector = MetricsCollector()
+        >>> client = HTTPClient(base_url=..., metrics=collector)
+        >>> ...
+        >>> collector.write("reports/http_metrics")   # .json + .prom
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[Tuple[str, str], EndpointMetrics] = {}
+
+    def _get(self, method: str, url: str) -> EndpointMetrics:
+        key = (method.upper(), endpoint_template(url))
+        endpoint = self._endpoints.get(key)
+        if endpoint is None:
+            endpoint = self._endpoints[key] = EndpointMetrics()
+        return endpoint
+
+    def record_response(self, method: str, url: str, response: requests.Response, duration: float):
+        """Record a completed request"""
+        retries = getattr(getattr(response.raw, "retries", None), "history", ())
+        body = response.request.body if response.request is not None else None
+        with self._lock:
+            endpoint = self._get(method, url)
+            endpoint.latency.record(duration)
+            status = str(response.status_code)
+            endpoint.status_counts[status] = endpoint.status_counts.get(status, 0) + 1
+            endpoint.retries += len(retries)
+            endpoint.bytes_sent += len(body) if body else 0
+            endpoint.bytes_received += len(response.content or b"")
+
+    def record_error(self, method: str, url: str, duration: float):
+        """Record a request that failed without a response (timeout, connection error)"""
+        with self._lock:
+            endpoint = self._get(method, url)
+            endpoint.latency.record(duration)
+            endpoint.errors += 1
+
+    def record_auth_refresh(self, method: str, url: str):
+        """Record a 401 that triggered the auth refresh callback"""
+        with self._lock:
+            self._get(method, url).auth_refreshes += 1
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+    def __len__(self) -> int:
+        return len(self._endpoints)
+
+    # ═══════════════════════════════════════════════════════════════════
+    # EXPORT
+    # ═══════════════════════════════════════════════════════════════════
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Snapshot as {"METHOD /template": {...}}"""
+        with self._lock:
+            return {
+                f"{method} {template}": endpoint.to_dict()
+                for (method, template), endpoint in sorted(self._endpoints.items())
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self, prefix: str = "http_client") -> str:
+        """Prometheus text exposition format (one block per metric family)"""
+        families: Dict[str, list] = {
+            "request_duration_seconds": [],
+            "responses_total": [],
+            "errors_total": [],
+            "retries_total": [],
+            "auth_refreshes_total": [],
+            "bytes_sent_total": [],
+            "bytes_received_total": [],
+        }
+        with self._lock:
+            for (method, template), endpoint in sorted(self._endpoints.items()):
+                labels = f'method="{method}",endpoint="{template}"'
+                latency = endpoint.latency
+                duration = families["request_duration_seconds"]
+                for q in DEFAULT_QUANTILES:
+                    duration.append(f'{{{labels},quantile="{q}"}} {latency.percentile(q) / 1000}')
+                duration.append(f"_sum{{{labels}}} {latency.total_us / 1_000_000}")
+                duration.append(f"_count{{{labels}}} {latency.count}")
+                for status, count in sorted(endpoint.status_counts.items()):
+                    families["responses_total"].append(f'{{{labels},status="{status}"}} {count}')
+                families["errors_total"].append(f"{{{labels}}} {endpoint.errors}")
+                families["retries_total"].append(f"{{{labels}}} {endpoint.retries}")
+                families["auth_refreshes_total"].append(f"{{{labels}}} {endpoint.auth_refreshes}")
+                families["bytes_sent_total"].append(f"{{{labels}}} {endpoint.bytes_sent}")
+                families["bytes_received_total"].append(f"{{{labels}}} {endpoint.bytes_received}")
+
+        lines = []
+        for family, samples in families.items():
+            metric_type = "summary" if family == "request_duration_seconds" else "counter"
+            lines.append(f"# TYPE {prefix}_{family} {metric_type}")
+            lines.extend(f"{prefix}_{family}{sample}" for sample in samples)
+        return "\n".join(lines) + "\n"
+
+    def write(self, path_prefix: str):
+        """Write <path_prefix>.json and <path_prefix>.prom"""
+        Path(path_prefix).parent.mkdir(parents=True, exist_ok=True)
+        Path(f"{path_prefix}.json").write_text(self.to_json())
+        Path(f"{path_prefix}.prom").write_text(self.to_prometheus())
+
+
+# Default collector shared by every HTTPClient
+metrics_collector = MetricsCollector()
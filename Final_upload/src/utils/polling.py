@@ -0,0 +1,117 @@
+"""
+Polling Engine
+Repeats a call until a condition holds, with exponential backoff, jitter,
+a hard deadline and per-attempt timing.
+"""
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, List, Optional, Tuple, Type
+
+from src.utils.logger import logger
+
+
+@dataclass
+class PollAttempt:
+    """One call made by poll()"""
+    number: int
+    started_at: float                 # Seconds since polling began
+    duration: float                   # Seconds the call took
+    error: Optional[str] = None
+
+
+@dataclass
+class PollResult:
+    """Outcome of poll()"""
+    success: bool
+    value: Any = None                 # Last value returned by the call
+    elapsed: float = 0.0
+    attempts: List[PollAttempt] = field(default_factory=list)
+
+
+def backoff_intervals(
+    initial: float = 0.25,
+    factor: float = 2.0,
+    maximum: float = 5.0,
+    jitter: float = 0.5,
+    rng: Optional[random.Random] = None
+) -> Iterator[float]:
+    """
+    Yield sleep intervals: initial * factor^n capped at maximum, each
+    randomly reduced by up to `jitter` (0..1) of its value so many pollers
+    started together do not stay in lock-step.
+
+    Example:
+        >>> list(islice(backoff_intervals(1, 2, 8, jitter=0), 5))
+        [1, 2, 4, 8, 8]
+    """
+    rng = rng or random
+    interval = initial
+    while True:
+        yield interval * (1 - jitter * rng.random())
+        interval = min(interval * factor, maximum)
+
+
+def poll(
+    func: Callable[[], Any],
+    until: Callable[[Any], bool] = lambda value: value is not None,
+    timeout: float = 30.0,
+    initial_interval: float = 0.25,
+    max_interval: float = 5.0,
+    factor: float = 2.0,
+    jitter: float = 0.5,
+    retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+    description: str = "condition",
+    sleep: Callable[[float], None] = time.sleep,
+    clock: Callable[[], float] = time.monotonic
+) -> PollResult:
+    """
+    Call func() until until(value) is true or the deadline passes
+
+    Exceptions listed in retry_on count as a failed attempt; anything else
+    propagates. Sleeps never run past the deadline, and one final attempt
+    is made right at the deadline.
+
+    Args:
+        func: Call to repeat
+        until: Predicate on func's return value
+        timeout: Deadline in seconds from now
+        initial_interval / max_interval / factor / jitter: Backoff settings
+        retry_on: Exceptions that mean "not ready yet"
+        description: Used in log messages
+
+    Returns:
+        PollResult with the last value and every attempt's timing
+    """
+    start = clock()
+    deadline = start + timeout
+    intervals = backoff_intervals(initial_interval, factor, max_interval, jitter)
+    result = PollResult(success=False)
+
+    while True:
+        attempt_start = clock()
+        error = None
+        try:
+            result.value = func()
+            result.success = until(result.value)
+        except retry_on as e:
+            error = f"{type(e).__name__}: {e}"
+        now = clock()
+        result.attempts.append(PollAttempt(
+            number=len(result.attempts) + 1,
+            started_at=attempt_start - start,
+            duration=now - attempt_start,
+            error=error
+        ))
+        result.elapsed = now - start
+
+        if result.success:
+            logger.debug(f"✓ {description} met after {len(result.attempts)} attempts ({result.elapsed:.2f}s)")
+            return result
+
+        remaining = deadline - now
+        if remaining <= 0:
+            logger.warning(f"⏱ Timed out after {result.elapsed:.2f}s waiting for {description} "
+                           f"({len(result.attempts)} attempts, last error: {error})")
+            return result
+        sleep(min(next(intervals), remaining))
@@ -0,0 +1,282 @@
+"""
+Client-side Rate Limiter for API Automation Framework
+"""
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+try:
+    import fcntl  # POSIX only; without it buckets are shared within one process
+except ImportError:
+    fcntl = None
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` requests/second on average, bursts of
+    up to `burst`.
+
+    acquire() reserves a token and sleeps until it is available, so waiting
+    callers are served in order and the bucket never goes above its quota.
+    Given `state_file`, the bucket lives in that file under an exclusive
+    file lock, so every process using the same file shares one quota
+    (e.g. pytest-xdist workers or several Locust processes on one machine).
+
+    Example:
+        >>> bucket = TokenBucket(rate=5, burst=10)
+        >>> bucket.acquire()
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None, state_file: Optional[str] = None):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got: {rate}")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.state_file = Path(state_file) if state_file and fcntl is not None else None
+        self._lock = threading.Lock()
+        self._tokens = self.burst
+        self._updated = time.time()
+        if self.state_file is not None:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Block until `tokens` are available and take them
+
+        Returns:
+            Seconds spent waiting
+        """
+        def take(available: float) -> float:
+            return available - tokens
+
+        available = self._update(take)
+        wait = -available / self.rate if available < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def pause(self, seconds: float):
+        """Hand out no tokens for `seconds` (e.g. after a 429 with Retry-After)"""
+        self._update(lambda available: min(available, -seconds * self.rate))
+
+    def _update(self, change) -> float:
+        """Refill, apply change(tokens) -> tokens, store and return the new level"""
+        with self._lock:
+            if self.state_file is None:
+                self._tokens = change(self._refill(self._tokens, self._updated))
+                self._updated = time.time()
+                return self._tokens
+
+            with open(self.state_file, "a+") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    try:
+                        stored_tokens, stored_at = (float(v) for v in f.read().split())
+                    except ValueError:
+                        stored_tokens, stored_at = self.burst, time.time()
+                    tokens = change(self._refill(stored_tokens, stored_at))
+                    f.seek(0)
+                    f.truncate()
+                    f.write(f"{tokens!r} {time.time()!r}")
+                    f.flush()
+                    return tokens
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _refill(self, tokens: float, updated: float) -> float:
+        return min(self.burst, tokens + (time.time() - updated) * self.rate)
+
+
+class RateLimitRegistry:
+    """
+    Process-wide token buckets per host and per endpoint, built from the
+    `rate_limits` section of config/environments.yaml.
+
+    A request takes a token from the overall bucket (top-level `rate`, all
+    hosts combined), from its host's bucket and, if the path matches a
+    configured endpoint, from that endpoint's bucket too. Every
+    HTTPClient uses the shared `rate_limit_registry`, so all clients in a
+    process draw from the same quota; set `shared_dir` (or RATE_LIMIT_DIR)
+    to share it across processes as well. No hosts are configured by
+    default, so nothing is throttled until quotas are opted into.
+
+    Example config:
+        rate_limits:
+          shared_dir: null
+          rate: 50            # all hosts combined (generate_test_report.py --rps)
+          burst: 1
+          hosts:
+            service-uat.upstox.com:
+              rate: 20        # requests/second
+              burst: 20
+              endpoints:
+                /login/open/v8/auth/1fa/otp-step/generate: {rate: 2, burst: 2}
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self._config = config
+        self._lock = threading.Lock()
+        self._buckets: Optional[Dict[Tuple[str, Optional[str]], TokenBucket]] = None
+        self._endpoints: Dict[str, List[Tuple[re.Pattern, str]]] = {}
+        self._subscribed = False
+
+    def configure(self, config: Optional[Dict[str, Any]]):
+        """Replace the configuration (None = reload from environments.yaml on next use)"""
+        with self._lock:
+            self._config = config
+            self._buckets = None
+
+    def buckets_for(self, url: str) -> List[TokenBucket]:
+        """Buckets a request to url must take a token from (overall, host, endpoint)"""
+        buckets = self._buckets if self._buckets is not None else self._build()
+        if not buckets:
+            return []
+        parts = urlsplit(url)
+        host = parts.hostname or ""
+        matched = [buckets[key] for key in (("*", None), (host, None)) if key in buckets]
+        for pattern, endpoint in self._endpoints.get(host, ()):
+            if pattern.fullmatch(parts.path):
+                matched.append(buckets[(host, endpoint)])
+                break
+        return matched
+
+    def acquire(self, url: str) -> float:
+        """
+        Block until a request to url is within every matching quota
+
+        Returns:
+            Seconds spent waiting
+        """
+        return sum(bucket.acquire() for bucket in self.buckets_for(url))
+
+    def pause(self, url: str, seconds: float) -> bool:
+        """
+        Pause the most specific bucket matching url (the server answered 429),
+        so a throttled endpoint does not stall the rest of the host
+
+        Returns:
+            False if no bucket matches (the caller has to wait itself)
+        """
+        buckets = self.buckets_for(url)
+        if buckets:
+            buckets[-1].pause(seconds)
+        return bool(buckets)
+
+    def _build(self) -> Dict[Tuple[str, Optional[str]], TokenBucket]:
+        with self._lock:
+            if self._buckets is not None:
+                return self._buckets
+            from config.settings import Settings, load_env
+            if self._config is None and not self._subscribed:
+                # Rebuild from the new limits after a config hot reload
+                from config.registry import config_registry
+                config_registry.subscribe(self._on_config_reload)
+                self._subscribed = True
+            config = self._config if self._config is not None else Settings.get_rate_limit_config()
+            load_env()
+            shared_dir = os.getenv("RATE_LIMIT_DIR") or config.get("shared_dir")
+
+            def make(name: str, limits: Dict[str, Any]) -> TokenBucket:
+                state_file = None
+                if shared_dir:
+                    state_file = os.path.join(shared_dir, re.sub(r"[^\w.-]+", "_", name) + ".bucket")
+                return TokenBucket(limits["rate"], limits.get("burst"), state_file)
+
+            buckets, endpoints = {}, {}
+            if "rate" in config:
+                buckets[("*", None)] = make("all-hosts", config)
+            for host, limits in (config.get("hosts") or {}).items():
+                limits = limits or {}
+                if "rate" in limits:
+                    buckets[(host, None)] = make(host, limits)
+                for endpoint, endpoint_limits in (limits.get("endpoints") or {}).items():
+                    # "{id}"-style placeholders match one path segment
+                    pattern = re.compile(re.sub(r"\\\{\w+\\\}", "[^/]+", re.escape(endpoint)))
+                    buckets[(host, endpoint)] = make(host + endpoint, endpoint_limits)
+                    endpoints.setdefault(host, []).append((pattern, endpoint))
+            self._endpoints = endpoints
+            self._buckets = buckets
+            return buckets
+
+    def _on_config_reload(self, snapshot):
+        with self._lock:
+            if self._config is None:
+                self._buckets = None
+
+
+# Global registry used by every HTTPClient
+rate_limit_registry = RateLimitRegistry()
+
+
+class NextAllowedScheduler:
+    """
+    Thread-safe "not before" timestamps per key (e.g. mobile number) plus a
+    global one, fed by server hints such as nextRequestInterval / Retry-After.
+
+    acquire(key) blocks until neither the key nor the global hold forbids a
+    request and marks the key in flight, so two workers never send for the
+    same key at once; release(key, interval) records when the next request
+    for that key is allowed.
+
+    Example:
+        >>> scheduler = NextAllowedScheduler()
+        >>> scheduler.acquire("9870165199")
+        >>> response = send()
+        >>> scheduler.release("9870165199", response.next_request_interval)
+    """
+
+    def __init__(self, default_interval: float = 30.0, max_keys: int = 100_000):
+        self.default_interval = default_interval
+        self.max_keys = max_keys
+        self._condition = threading.Condition()
+        self._next_allowed: Dict[str, float] = {}
+        self._in_flight: Set[str] = set()
+        self._global_next_allowed = 0.0
+
+    def ready_at(self, key: str) -> float:
+        """Monotonic time at which a request for key may be sent (inf while in flight)"""
+        with self._condition:
+            if key in self._in_flight:
+                return float("inf")
+            return max(self._global_next_allowed, self._next_allowed.get(key, 0.0))
+
+    def acquire(self, key: str) -> float:
+        """
+        Block until a request for key may be sent, and mark it in flight
+
+        Returns:
+            Seconds spent waiting
+        """
+        start = time.monotonic()
+        with self._condition:
+            while True:
+                if key in self._in_flight:
+                    self._condition.wait()
+                    continue
+                delay = max(self._global_next_allowed, self._next_allowed.get(key, 0.0)) - time.monotonic()
+                if delay <= 0:
+                    self._in_flight.add(key)
+                    return time.monotonic() - start
+                self._condition.wait(delay)
+
+    def release(self, key: str, interval: Optional[float] = None):
+        """Finish the in-flight request for key; hold the key for `interval` seconds"""
+        with self._condition:
+            self._in_flight.discard(key)
+            now = time.monotonic()
+            if interval:
+                self._next_allowed[key] = max(self._next_allowed.get(key, 0.0), now + interval)
+            if len(self._next_allowed) > self.max_keys:
+                self._next_allowed = {k: t for k, t in self._next_allowed.items() if t > now}
+            self._condition.notify_all()
+
+    def defer_all(self, seconds: float):
+        """Hold every key for `seconds` from now (server-wide throttling)"""
+        with self._condition:
+            self._global_next_allowed = max(self._global_next_allowed, time.monotonic() + seconds)
+            self._condition.notify_all()
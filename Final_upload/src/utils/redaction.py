@@ -0,0 +1,141 @@
+"""
+Sensitive-Field Redaction
+One engine, compiled once, shared by the logger, cassettes and reports.
+
+Walks nested JSON (dicts/lists) and header mappings in a single pass.
+Untouched subtrees are returned as-is (never copied); only the containers
+on the path to a redacted value are rebuilt.
+"""
+import json
+import re
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Optional, Pattern
+
+MASK = "***MASKED***"
+
+# Keys masked wherever they appear (case-insensitive, exact name)
+DEFAULT_KEYS = ("otp", "authorization", "proxy-authorization", "cookie", "set-cookie", "x-api-key")
+
+# Keys masked if any pattern is found in the name (e.g. validateOTPToken, access_token)
+DEFAULT_KEY_PATTERNS = (r"token", r"passw(or)?d", r"secret", r"api_?key")
+
+
+class Redactor:
+    """
+    Masks values of sensitive keys and dotted paths in nested data.
+
+    Args:
+        keys: Exact key names (case-insensitive)
+        key_patterns: Regexes searched in key names (case-insensitive)
+        paths: Dotted paths from the root, "*" matching one level
+               (e.g. "data.otp", "*.validateOTPToken"); list items keep
+               their parent's path
+        mask: Replacement value
+        preserve_empty: Leave None/bool/"" values alone (nothing to hide,
+                        and flags such as token_generated stay readable)
+
+    Example:
+        >>> redactor = Redactor()
+        >>> redactor.redact({"data": {"otp": "123789", "mobileNumber": "9870165199"}})
+        {'data': {'otp': '***MASKED***', 'mobileNumber': '9870165199'}}
+    """
+
+    def __init__(
+        self,
+        keys: Iterable[str] = DEFAULT_KEYS,
+        key_patterns: Iterable[str] = DEFAULT_KEY_PATTERNS,
+        paths: Iterable[str] = (),
+        mask: Any = MASK,
+        preserve_empty: bool = True
+    ):
+        self.mask = mask
+        self.preserve_empty = preserve_empty
+        self._keys = frozenset(key.lower() for key in keys)
+        patterns = [f"(?:{pattern})" for pattern in key_patterns]
+        self._key_re: Optional[Pattern] = re.compile("|".join(patterns), re.IGNORECASE) if patterns else None
+        paths = [re.escape(path).replace(r"\*", r"[^.]+") for path in paths]
+        self._path_re: Optional[Pattern] = re.compile("|".join(paths), re.IGNORECASE) if paths else None
+        self._decisions: Dict[str, bool] = {}
+        self._text_re = re.compile(r'("([^"\\]+)"\s*:\s*)("(?:[^"\\]|\\.)*"|-?\d+(?:\.\d+)?)')
+
+    def is_sensitive_key(self, key: Any) -> bool:
+        """Whether values under key are masked (independent of path)"""
+        key = str(key)
+        decision = self._decisions.get(key)
+        if decision is None:
+            decision = key.lower() in self._keys or bool(self._key_re and self._key_re.search(key))
+            if len(self._decisions) < 10_000:  # Key names are few; never grow unbounded
+                self._decisions[key] = decision
+        return decision
+
+    def redact(self, value: Any) -> Any:
+        """Return value with sensitive fields masked (value itself if nothing matched)"""
+        return self._walk(value, "" if self._path_re is not None else None)
+
+    def redact_text(self, text: str) -> str:
+        """
+        Mask "key": value pairs in serialized JSON (e.g. a response body
+        logged as text, possibly truncated) without parsing it
+        """
+        def replace(match):
+            if not self.is_sensitive_key(match.group(2)):
+                return match.group(0)
+            return f'{match.group(1)}"{self.mask}"'
+
+        return self._text_re.sub(replace, text)
+
+    def redact_json_bytes(self, content: bytes) -> bytes:
+        """Redact a JSON document; non-JSON or untouched content is returned unchanged"""
+        try:
+            document = json.loads(content)
+        except ValueError:
+            return content
+        redacted = self.redact(document)
+        if redacted is document:
+            return content
+        return json.dumps(redacted, separators=(",", ":")).encode("utf-8")
+
+    def _walk(self, value: Any, path: Optional[str]) -> Any:
+        if isinstance(value, Mapping):
+            copied = None
+            for key, item in value.items():
+                key_path = None if path is None else (f"{path}.{key}" if path else str(key))
+                if self.is_sensitive_key(key) or (key_path is not None and self._path_re.fullmatch(key_path)):
+                    new = self._masked(item)
+                elif isinstance(item, (Mapping, list, tuple)):
+                    new = self._walk(item, key_path)
+                else:
+                    continue
+                if new is not item:
+                    if copied is None:
+                        copied = dict(value)
+                    copied[key] = new
+            return value if copied is None else copied
+
+        if isinstance(value, (list, tuple)):
+            copied = None
+            for index, item in enumerate(value):
+                if not isinstance(item, (Mapping, list, tuple)):
+                    continue
+                new = self._walk(item, path)
+                if new is not item:
+                    if copied is None:
+                        copied = list(value)
+                    copied[index] = new
+            return value if copied is None else copied
+
+        return value
+
+    def _masked(self, value: Any) -> Any:
+        if self.preserve_empty and (value is None or isinstance(value, bool) or value == ""):
+            return value
+        return self.mask
+
+
+# Shared default redactor
+redactor = Redactor()
+
+
+def redact(value: Any) -> Any:
+    """Mask sensitive fields with the default redactor"""
+    return redactor.redact(value)
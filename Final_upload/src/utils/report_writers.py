@@ -0,0 +1,154 @@
+"""
+Streaming Report Writers
+Append each finished flow to NDJSON + CSV as it completes, so a bulk run
+never holds its whole report in memory and a crash loses at most the
+line being written. A run restarted with resume=True skips the flows
+already on disk and keeps appending.
+"""
+import csv
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Set, Union
+
+from src.utils.logger import logger
+from src.utils.redaction import redact
+
+CSV_HEADER = ['Test #', 'Mobile Number', 'Email', 'Profile ID', 'User Type', 'Customer Status', 'Overall Status']
+
+
+def csv_row(result: Dict[str, Any]) -> List[Any]:
+    """One bulk result as a CSV_HEADER row"""
+    return [
+        result['test_number'],
+        result.get('mobile_number', ''),
+        result.get('email', ''),
+        result.get('profile_id', ''),
+        result.get('user_type', ''),
+        result.get('customer_status', ''),
+        result.get('status', 'FAIL')
+    ]
+
+
+def iter_ndjson(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """
+    Read results back one line at a time
+
+    A torn last line (the process died mid-write) is skipped.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            if line.strip():
+                yield json.loads(line)
+
+
+class StreamingReportWriter:
+    """
+    Append-only NDJSON (one JSON result per line) and CSV report of a bulk run.
+
+    Every write is flushed, so the files are complete up to the last
+    finished flow even if the process is killed. With resume=True the
+    existing NDJSON is scanned once: a torn last line is cut off, the CSV is
+    rebuilt from it, and `completed` tells the runner which flows to skip.
+
+    Args:
+        prefix: Path without extension; writes <prefix>.ndjson and <prefix>.csv
+        resume: Continue an existing report instead of starting a new one
+        fsync: Also fsync after every write (survives an OS crash; slower)
+
+    Example:
+        >>> with StreamingReportWriter("reports/soak", resume=True) as writer:
+        ...     for n in range(1, 50_001):
+        ...         if n not in writer.completed:
+        ...             writer.write(run_flow(n))
+    """
+
+    def __init__(self, prefix: Union[str, Path], resume: bool = False, fsync: bool = False):
+        self.ndjson_path = Path(f"{prefix}.ndjson")
+        self.csv_path = Path(f"{prefix}.csv")
+        self.fsync = fsync
+        self.completed: Set[int] = set()
+        self.passed = 0
+        self._lock = threading.Lock()
+        self.ndjson_path.parent.mkdir(parents=True, exist_ok=True)
+
+        if resume and self.ndjson_path.exists():
+            self._recover()
+        else:
+            self.ndjson_path.write_text("", encoding='utf-8')
+            self._rewrite_csv(())
+
+        self._ndjson = open(self.ndjson_path, 'a', encoding='utf-8')
+        self._csv_file = open(self.csv_path, 'a', newline='', encoding='utf-8')
+        self._csv = csv.writer(self._csv_file)
+
+    def _recover(self):
+        """Index the flows already written and drop a torn last line"""
+        valid_bytes = 0
+        with open(self.ndjson_path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    result = json.loads(line) if line.strip() else None
+                except ValueError:
+                    break
+                valid_bytes += len(line)
+                if result is not None:
+                    self._count(result)
+        if valid_bytes != self.ndjson_path.stat().st_size:
+            logger.warning(f"⚠️  Dropping torn last line of {self.ndjson_path}")
+            with open(self.ndjson_path, 'r+b') as f:
+                f.truncate(valid_bytes)
+        self._rewrite_csv(iter_ndjson(self.ndjson_path))
+        logger.info(f"↩️  Resuming {self.ndjson_path}: {len(self.completed)} flows already done")
+
+    def _rewrite_csv(self, results: Iterable[Dict[str, Any]]):
+        with open(self.csv_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADER)
+            for result in results:
+                writer.writerow(csv_row(result))
+
+    def _count(self, result: Dict[str, Any]):
+        if result['test_number'] in self.completed:  # First result of a flow wins
+            return
+        self.completed.add(result['test_number'])
+        self.passed += result.get('status') == 'PASS'
+
+    def write(self, result: Dict[str, Any]):
+        """Append one finished flow (redacted) to both files"""
+        line = json.dumps(redact(result), ensure_ascii=False, default=str)
+        with self._lock:
+            self._ndjson.write(line + "\n")
+            self._ndjson.flush()
+            self._csv.writerow(csv_row(result))
+            self._csv_file.flush()
+            if self.fsync:
+                os.fsync(self._ndjson.fileno())
+                os.fsync(self._csv_file.fileno())
+            self._count(result)
+
+    @property
+    def total(self) -> int:
+        return len(self.completed)
+
+    def results(self) -> Iterator[Dict[str, Any]]:
+        """Stream every result written so far (including resumed ones)"""
+        with self._lock:
+            self._ndjson.flush()
+        return iter_ndjson(self.ndjson_path)
+
+    def close(self):
+        with self._lock:
+            self._ndjson.close()
+            self._csv_file.close()
+
+    def __enter__(self) -> "StreamingReportWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,301 @@
+"""
+Compact Result Records
+Columnar storage for stage and flow results of long bulk/soak runs.
+
+Numbers live in typed arrays (1-8 bytes per value instead of a Python
+object), repeated strings (API names, statuses, messages) are interned
+once, and timestamps are integer microseconds. The dicts reports expect
+are only built when a record is read, so a 100k-flow run costs tens of
+MB instead of a nested dict tree per flow.
+
+Both stores behave like read-only lists of those dicts (len, index,
+iterate), so existing report code keeps working.
+"""
+import threading
+from array import array
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, Hashable, Iterator, List, Optional
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_NO_STATUS_CODE = 0
+_NO_LATENCY = -1.0
+_MISSING = object()
+
+
+def _to_micros(moment: datetime) -> int:
+    """Naive local datetime -> exact integer microseconds (no float rounding)"""
+    return (moment - _EPOCH) // _MICROSECOND
+
+
+def _to_iso(micros: int) -> str:
+    return (_EPOCH + timedelta(microseconds=micros)).isoformat()
+
+
+class Interner:
+    """Stores each distinct value once; records keep its integer id"""
+
+    def __init__(self):
+        self.values: List[Any] = []
+        self._ids: Dict[Hashable, int] = {}
+
+    def id(self, value: Hashable) -> int:
+        value_id = self._ids.get(value)
+        if value_id is None:
+            value_id = self._ids[value] = len(self.values)
+            self.values.append(value)
+        return value_id
+
+    def __getitem__(self, value_id: int) -> Any:
+        return self.values[value_id]
+
+
+# ═══════════════════════════════════════════════════════════════════
+# STAGE RECORDS
+# ═══════════════════════════════════════════════════════════════════
+
+class StageRecords:
+    """
+    Stage results (one per API call) in parallel columns.
+
+    details dicts are split into an interned key tuple (shared by every
+    record of the same stage) and their values. Appending is thread-safe,
+    so one store can collect the stages of many concurrent flows.
+
+    Example:
+        >>> records = StageRecords()
+        >>> records.add(1, "Generate OTP", True, 200, "OTP sent", latency=0.21)
+        >>> records[0]["status"]
+        'PASS'
+        >>> records.summary()["Generate OTP"]["passed"]
+        1
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.strings = Interner()
+        self.flow = array('l')            # Flow/test number (-1 = none)
+        self.stage = array('B')
+        self.api_name = array('I')        # Interned
+        self.passed = array('b')
+        self.status_code = array('H')     # 0 = unknown
+        self.latency = array('d')         # Seconds, -1 = not measured
+        self.timestamp = array('q')       # Microseconds since epoch (local time)
+        self.message = array('I')         # Interned
+        self.detail_keys = array('I')     # Interned tuple of details keys
+        self.detail_values: List[Any] = []  # Single value, or tuple for 2+ keys
+
+    def add(
+        self,
+        stage: int,
+        api_name: str,
+        passed: bool,
+        status_code: Optional[int] = None,
+        message: Optional[str] = "",
+        details: Optional[Dict[str, Any]] = None,
+        latency: Optional[float] = None,
+        flow: int = -1,
+        timestamp: Optional[datetime] = None
+    ) -> int:
+        """Append one stage result; returns its index"""
+        keys = tuple(details) if details else ()
+        values = tuple(details.values()) if details else ()
+        micros = _to_micros(timestamp if timestamp is not None else datetime.now())
+        with self._lock:
+            self.flow.append(flow)
+            self.stage.append(stage)
+            self.api_name.append(self.strings.id(api_name))
+            self.passed.append(bool(passed))
+            self.status_code.append(status_code if status_code is not None else _NO_STATUS_CODE)
+            self.latency.append(latency if latency is not None else _NO_LATENCY)
+            self.timestamp.append(micros)
+            self.message.append(self.strings.id(message))
+            self.detail_keys.append(self.strings.id(keys))
+            self.detail_values.append(values[0] if len(values) == 1 else values)
+            return len(self.stage) - 1
+
+    def __len__(self) -> int:
+        return len(self.stage)
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        """The record as the dict StageManager used to append"""
+        status_code = self.status_code[index]
+        return {
+            "stage": self.stage[index],
+            "api_name": self.strings[self.api_name[index]],
+            "status": "PASS" if self.passed[index] else "FAIL",
+            "status_code": status_code if status_code != _NO_STATUS_CODE else None,
+            "message": self.strings[self.message[index]],
+            "details": self.details(index),
+            "timestamp": _to_iso(self.timestamp[index])
+        }
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def details(self, index: int) -> Dict[str, Any]:
+        keys = self.strings[self.detail_keys[index]]
+        values = self.detail_values[index]
+        if len(keys) == 1:
+            return {keys[0]: values}
+        return dict(zip(keys, values))
+
+    def latency_of(self, index: int) -> Optional[float]:
+        latency = self.latency[index]
+        return latency if latency != _NO_LATENCY else None
+
+    # ─── Aggregation (single C-level passes over the columns) ───
+
+    def passed_count(self) -> int:
+        return sum(self.passed)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-API totals: {api_name: {total, passed, failed, avg_latency}}
+        (avg_latency over measured records only, None if none was)
+        """
+        outcomes = Counter(zip(self.api_name, self.passed))
+        timed = [(api, latency) for api, latency in zip(self.api_name, self.latency) if latency != _NO_LATENCY]
+        latency_counts = Counter(api for api, _ in timed)
+        latency_sums: Dict[int, float] = {}
+        for api, latency in timed:
+            latency_sums[api] = latency_sums.get(api, 0.0) + latency
+
+        summary = {}
+        for api in sorted({api for api, _ in outcomes}):  # First-seen order
+            passed, failed = outcomes.get((api, 1), 0), outcomes.get((api, 0), 0)
+            summary[self.strings[api]] = {
+                "total": passed + failed,
+                "passed": passed,
+                "failed": failed,
+                "avg_latency": latency_sums[api] / latency_counts[api] if latency_counts[api] else None
+            }
+        return summary
+
+    def for_flow(self, flow: int) -> List[int]:
+        """Indexes of the records of one flow (test number)"""
+        return [index for index, value in enumerate(self.flow) if value == flow]
+
+
+# ═══════════════════════════════════════════════════════════════════
+# FLOW RECORDS
+# ═══════════════════════════════════════════════════════════════════
+
+class FlowRecords:
+    """
+    Per-flow results of TestReportGenerator (bulk_results), one column per field.
+
+    append() takes the result dict run_single_test builds and stores it
+    column-wise; its stages go to a shared StageRecords. Reading a record
+    rebuilds the same dict (keys the flow never set stay absent).
+
+    Example:
+        >>> results = FlowRecords()
+        >>> results.append({"test_number": 1, "status": "PASS", "stages": [...], ...})
+        >>> results.passed_count()
+        1
+    """
+
+    # Free-text fields, stored as-is
+    TEXT_FIELDS = ("mobile_number", "email", "profile_id", "error")
+    # Fields with few distinct values, interned
+    CATEGORY_FIELDS = ("otp_used", "user_type", "customer_status", "overall")
+
+    def __init__(self):
+        self.strings = Interner()
+        self.stages = StageRecords()
+        self.test_number = array('l')
+        self.timestamp = array('q')
+        self.passed = array('b')
+        self.columns: Dict[str, List[Any]] = {name: [] for name in self.TEXT_FIELDS + self.CATEGORY_FIELDS}
+        self.stage_start = array('q')     # Stages of flow i: stages[stage_start[i]:stage_end[i]]
+        self.stage_end = array('q')
+        self.extras: List[Optional[Dict[str, Any]]] = []  # Any other keys (rare)
+
+    def append(self, result: Dict[str, Any]):
+        result = dict(result)
+        stages = result.pop("stages", None) or []
+        timestamp = result.pop("timestamp", None)
+        test_number = result.pop("test_number")
+
+        self.test_number.append(test_number)
+        self.timestamp.append(_to_micros(datetime.fromisoformat(timestamp)) if timestamp else -1)
+        self.passed.append(result.pop("status", "FAIL") == "PASS")
+        for name in self.TEXT_FIELDS:
+            self.columns[name].append(result.pop(name, _MISSING))
+        for name in self.CATEGORY_FIELDS:
+            value = result.pop(name, _MISSING)
+            self.columns[name].append(self.strings[self.strings.id(value)] if value is not _MISSING else _MISSING)
+
+        start = len(self.stages)
+        for stage in stages:
+            self.stages.add(
+                stage["stage"], stage["api_name"], stage["status"] == "PASS",
+                details=stage.get("details"), latency=stage.get("latency"), flow=test_number
+            )
+        self.stage_start.append(start)
+        self.stage_end.append(len(self.stages))
+        self.extras.append(result or None)
+
+    def extend(self, results):
+        for result in results:
+            self.append(result)
+
+    def __len__(self) -> int:
+        return len(self.test_number)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        if index < 0:
+            index += len(self)
+        timestamp = self.timestamp[index]
+        result = {
+            "test_number": self.test_number[index],
+            "timestamp": _to_iso(timestamp) if timestamp != -1 else None,
+            "status": "PASS" if self.passed[index] else "FAIL",
+            "stages": [self._stage(i) for i in range(self.stage_start[index], self.stage_end[index])]
+        }
+        for name, column in self.columns.items():
+            if column[index] is not _MISSING:
+                result[name] = column[index]
+        if self.extras[index]:
+            result.update(self.extras[index])
+        return result
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def _stage(self, index: int) -> Dict[str, Any]:
+        stages = self.stages
+        stage = {
+            "stage": stages.stage[index],
+            "api_name": stages.strings[stages.api_name[index]],
+            "status": "PASS" if stages.passed[index] else "FAIL",
+            "details": stages.details(index)
+        }
+        latency = stages.latency_of(index)
+        if latency is not None:
+            stage["latency"] = latency
+        return stage
+
+    def passed_count(self) -> int:
+        return sum(self.passed)
+
+    def sort(self):
+        """Order flows by test_number (concurrent runs finish out of order)"""
+        order = sorted(range(len(self)), key=self.test_number.__getitem__)
+        if order == list(range(len(self))):
+            return
+        self.test_number = array('l', (self.test_number[i] for i in order))
+        self.timestamp = array('q', (self.timestamp[i] for i in order))
+        self.passed = array('b', (self.passed[i] for i in order))
+        for name, column in self.columns.items():
+            self.columns[name] = [column[i] for i in order]
+        self.stage_start = array('q', (self.stage_start[i] for i in order))
+        self.stage_end = array('q', (self.stage_end[i] for i in order))
+        self.extras = [self.extras[i] for i in order]
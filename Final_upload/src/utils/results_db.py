@@ -0,0 +1,519 @@
+"""
+Historical Results Store
+Append-only SQLite history of every run (auto flow, bulk report runs,
+Upstox_Automation reports, test logs and Allure results), indexed by run,
+API/stage, environment and timestamp, so trend questions ("did Verify OTP
+get slower this month?") are one indexed query instead of a pass over
+hundreds of JSON files.
+
+Upstox_Automation's runners write here directly with --results-db
+(reports/results_history.py there); ingest covers older report files.
+
+Usage:
+    python -m src.utils.results_db ingest reports/allure-results ../Upstox_Automation/reports/test_report.json
+    python -m src.utils.results_db latency "Verify OTP" --period month
+    python -m src.utils.results_db failures --days 7
+    python -m src.utils.results_db flaky --min-runs 5
+"""
+import argparse
+import json
+import re
+import sqlite3
+import sys
+import threading
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from src.utils.report_writers import iter_ndjson
+from src.utils.result_records import StageRecords
+
+DEFAULT_DB_PATH = "reports/results_history.db"
+
+# Name the 5-stage onboarding flow is recorded under, whichever runner ran it
+LEAD_FLOW_TEST = "UAT_Onboarding Lead Generation"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id      TEXT PRIMARY KEY,
+    source      TEXT NOT NULL,
+    environment TEXT,
+    started_at  TEXT,
+    finished_at TEXT,
+    recorded_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    id          INTEGER PRIMARY KEY,
+    run_id      TEXT NOT NULL REFERENCES runs(run_id),
+    environment TEXT,
+    test_id     TEXT NOT NULL,
+    stage       INTEGER,
+    api_name    TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    latency_ms  REAL,
+    timestamp   TEXT NOT NULL,
+    message     TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_env_time ON runs(environment, started_at);
+CREATE INDEX IF NOT EXISTS idx_results_run ON results(run_id);
+CREATE INDEX IF NOT EXISTS idx_results_api_time ON results(api_name, timestamp);
+CREATE INDEX IF NOT EXISTS idx_results_env_time ON results(environment, timestamp);
+CREATE INDEX IF NOT EXISTS idx_results_test ON results(test_id, api_name, timestamp);
+CREATE TRIGGER IF NOT EXISTS runs_no_update BEFORE UPDATE ON runs
+    BEGIN SELECT RAISE(ABORT, 'results history is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS runs_no_delete BEFORE DELETE ON runs
+    BEGIN SELECT RAISE(ABORT, 'results history is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS results_no_update BEFORE UPDATE ON results
+    BEGIN SELECT RAISE(ABORT, 'results history is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS results_no_delete BEFORE DELETE ON results
+    BEGIN SELECT RAISE(ABORT, 'results history is append-only'); END;
+"""
+
+_RESULT_COLUMNS = ("test_id", "stage", "api_name", "status", "latency_ms", "timestamp", "message")
+
+# SQLite expressions grouping an ISO timestamp into a trend period
+_PERIODS = {
+    "hour": "substr(timestamp, 1, 13)",
+    "day": "substr(timestamp, 1, 10)",
+    "week": "strftime('%Y-W%W', timestamp)",
+    "month": "substr(timestamp, 1, 7)",
+}
+
+_ALLURE_STATUS = {"passed": "PASS", "failed": "FAIL", "broken": "FAIL", "skipped": "SKIP"}
+_STAGE_PREFIX = re.compile(r"^Stage (\d+):\s*")
+
+
+def _iso(moment: Union[datetime, str, None]) -> Optional[str]:
+    if moment is None or isinstance(moment, str):
+        return moment
+    return moment.isoformat()
+
+
+def _from_millis(millis: Optional[int]) -> Optional[str]:
+    return datetime.fromtimestamp(millis / 1000).isoformat() if millis else None
+
+
+def _status(value: Optional[str]) -> str:
+    value = value or "UNKNOWN"
+    return _ALLURE_STATUS.get(value, value.upper())
+
+
+def _stage_and_api(name: str):
+    """'Stage 2: Verify OTP' -> (2, 'Verify OTP'), so Allure steps match API names"""
+    match = _STAGE_PREFIX.match(name)
+    return (int(match.group(1)), name[match.end():]) if match else (None, name)
+
+
+# ═══════════════════════════════════════════════════════════════════
+# CONVERTERS (runner output -> result rows)
+# ═══════════════════════════════════════════════════════════════════
+
+def rows_from_stage_records(records: StageRecords, test_id: str = LEAD_FLOW_TEST) -> Iterator[Dict[str, Any]]:
+    """Rows for a StageManager's results (with measured latency)"""
+    for index, record in enumerate(records):
+        latency = records.latency_of(index)
+        yield {
+            "test_id": test_id,
+            "stage": record["stage"],
+            "api_name": record["api_name"],
+            "status": record["status"],
+            "latency_ms": latency * 1000 if latency is not None else None,
+            "timestamp": record["timestamp"],
+            "message": record["message"],
+        }
+
+
+def rows_from_flow_results(results: Iterable[Dict[str, Any]], test_id: str = LEAD_FLOW_TEST) -> Iterator[Dict[str, Any]]:
+    """Rows for TestReportGenerator results (bulk_results / streamed NDJSON); latency if measured"""
+    for result in results:
+        for stage in result.get("stages", []):
+            latency = stage.get("latency")
+            yield {
+                "test_id": test_id,
+                "stage": stage.get("stage"),
+                "api_name": stage["api_name"],
+                "status": stage["status"],
+                "latency_ms": latency * 1000 if latency is not None else None,
+                "timestamp": result.get("timestamp") or datetime.now().isoformat(),
+                "message": result.get("error") if stage["status"] != "PASS" else None,
+            }
+
+
+def rows_from_upstox_report(report: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Rows for an Upstox_Automation reports/test_report.json"""
+    timestamp = report.get("metadata", {}).get("generated_at") or datetime.now().isoformat()
+    for result in report.get("results", []):
+        details = result.get("details", {})
+        exec_time = details.get("execution_time")
+        yield {
+            "test_id": result.get("tc_id", "N/A"),
+            "stage": None,
+            "api_name": result.get("description") or details.get("step") or result.get("tc_id", "N/A"),
+            "status": _status(result.get("status")),
+            "latency_ms": float(exec_time) * 1000 if exec_time is not None else None,
+            "timestamp": timestamp,
+            "message": result.get("error") or details.get("message"),
+        }
+
+
+def rows_from_test_log(log: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Rows for an Upstox_Automation logs.json (step latency = time to the next step)"""
+    steps = log.get("logs", [])
+    end_time = log.get("end_time")
+    for index, step in enumerate(steps):
+        following = steps[index + 1]["timestamp"] if index + 1 < len(steps) else end_time
+        latency = None
+        if following:
+            latency = (datetime.fromisoformat(following) - datetime.fromisoformat(step["timestamp"])).total_seconds() * 1000
+        yield {
+            "test_id": log.get("test_name", "N/A"),
+            "stage": step.get("step_number"),
+            "api_name": step.get("title", "N/A"),
+            "status": _status(step.get("status")),
+            "latency_ms": latency,
+            "timestamp": step["timestamp"],
+            "message": step.get("details", {}).get("message"),
+        }
+
+
+def rows_from_allure_result(result: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Rows for one Allure *-result.json: the test itself, then each step"""
+    test_id = result.get("fullName") or result.get("name", "N/A")
+    for entry in [result] + result.get("steps", []):
+        stage, api_name = _stage_and_api(entry.get("name", "N/A"))
+        start, stop = entry.get("start"), entry.get("stop")
+        yield {
+            "test_id": test_id,
+            "stage": stage,
+            "api_name": api_name,
+            "status": _status(entry.get("status")),
+            "latency_ms": float(stop - start) if start and stop else None,
+            "timestamp": _from_millis(start) or datetime.now().isoformat(),
+            "message": entry.get("statusDetails", {}).get("message"),
+        }
+
+
+# ═══════════════════════════════════════════════════════════════════
+# RESULTS STORE
+# ═══════════════════════════════════════════════════════════════════
+
+class ResultsStore:
+    """
+    Append-only SQLite store of run results with trend queries.
+
+    Runs are keyed by run_id; recording a run_id that is already stored
+    is a no-op, so re-ingesting the same report files never double counts.
+    UPDATE/DELETE are rejected by triggers. Writes are serialised with a
+    lock, so one store can be shared by concurrent flows.
+
+    Args:
+        path: SQLite file (created on first use); ":memory:" for a scratch store
+
+    Example:
+        >>> store = ResultsStore()
+        >>> store.record_run("auto_flow", rows_from_stage_records(stage_manager.results), environment="uat")
+        >>> store.latency_trend("Verify OTP", period="month")
+        [{'period': '2026-09', 'count': 412, 'avg_ms': 231.4, ...}, {'period': '2026-10', ...}]
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_DB_PATH):
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        if self.path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")  # Readers don't block a running suite
+        self._db.executescript(_SCHEMA)
+
+    # ─── Writing ───
+
+    def record_run(
+        self,
+        source: str,
+        rows: Iterable[Dict[str, Any]],
+        environment: Optional[str] = None,
+        run_id: Optional[str] = None,
+        started_at: Union[datetime, str, None] = None,
+        finished_at: Union[datetime, str, None] = None
+    ) -> Optional[str]:
+        """
+        Append one run and its result rows
+
+        Args:
+            source: Runner that produced the run ("auto_flow", "bulk", "allure", ...)
+            rows: Result dicts with the keys test_id, stage, api_name, status,
+                  latency_ms, timestamp, message (see the rows_from_* converters)
+            environment: Environment name (e.g. Settings.ENV)
+            run_id: Stable id; defaults to a new UUID
+            started_at, finished_at: Defaults to the first/last row timestamp
+
+        Returns:
+            The run_id, or None if that run was already recorded
+        """
+        with self._lock, self._db:
+            return self._insert_run(source, rows, environment, run_id, started_at, finished_at)
+
+    def _insert_run(self, source, rows, environment, run_id, started_at, finished_at) -> Optional[str]:
+        run_id = run_id or str(uuid.uuid4())
+        if self._db.execute("SELECT 1 FROM runs WHERE run_id = ?", (run_id,)).fetchone():
+            return None
+        rows = [tuple(row.get(column) for column in _RESULT_COLUMNS) for row in rows]
+        timestamps = sorted(row[5] for row in rows)
+        self._db.execute(
+            "INSERT INTO runs (run_id, source, environment, started_at, finished_at, recorded_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (run_id, source, environment,
+             _iso(started_at) or (timestamps[0] if timestamps else None),
+             _iso(finished_at) or (timestamps[-1] if timestamps else None),
+             datetime.now().isoformat())
+        )
+        self._db.executemany(
+            "INSERT INTO results (run_id, environment, test_id, stage, api_name, status, latency_ms, timestamp, message)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(run_id, environment) + row for row in rows]
+        )
+        return run_id
+
+    def ingest(self, path: Union[str, Path], environment: Optional[str] = None) -> int:
+        """
+        Import runner output files; returns the number of new runs
+
+        Accepts an Allure results directory, an Allure *-result.json, an
+        Upstox_Automation test_report.json or logs.json, or a
+        TestReportGenerator JSON/NDJSON report. Already imported runs are
+        skipped (import a streamed NDJSON once its run has finished).
+        """
+        path = Path(path)
+        files = sorted(path.glob("*-result.json")) if path.is_dir() else [path]
+        added = 0
+        with self._lock, self._db:
+            for file in files:
+                added += self._ingest_file(file, environment) is not None
+        return added
+
+    def _ingest_file(self, path: Path, environment: Optional[str]) -> Optional[str]:
+        if path.suffix == ".ndjson":
+            results = list(iter_ndjson(path))
+            run_id = f"bulk:{path.resolve()}:{results[0].get('timestamp') if results else ''}"
+            return self._insert_run("bulk", rows_from_flow_results(results), environment, run_id, None, None)
+
+        data = json.loads(path.read_text(encoding='utf-8'))
+        if "uuid" in data and "status" in data:
+            return self._insert_run("allure", rows_from_allure_result(data), environment,
+                                    f"allure:{data['uuid']}", None, None)
+        if "session_id" in data and "logs" in data:
+            return self._insert_run("test_log", rows_from_test_log(data), environment,
+                                    f"log:{data['session_id']}", data.get("start_time"), data.get("end_time"))
+        if "metadata" in data:
+            return self._insert_run("upstox_automation", rows_from_upstox_report(data), environment,
+                                    f"upstox_automation:{data['metadata'].get('generated_at')}", None, None)
+        if "test_execution" in data:
+            execution = data["test_execution"]
+            results = data.get("results") or []
+            return self._insert_run("bulk", rows_from_flow_results(results if isinstance(results, list) else [results]),
+                                    environment or execution.get("environment"),
+                                    f"bulk:{execution.get('timestamp')}", execution.get("timestamp"), None)
+        raise ValueError(f"Unrecognised results file: {path}")
+
+    # ─── Queries ───
+
+    @staticmethod
+    def _filters(environment: Optional[str], since, until, **columns) -> tuple:
+        clauses, params = [], []
+        if environment is not None:
+            clauses.append("environment = ?")
+            params.append(environment)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(_iso(since))
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(_iso(until))
+        for column, value in columns.items():
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        return (" AND ".join(clauses) or "1"), params
+
+    def latency_trend(
+        self,
+        api_name: str,
+        period: str = "day",
+        environment: Optional[str] = None,
+        since: Union[datetime, str, None] = None,
+        until: Union[datetime, str, None] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Latency of one API per hour/day/week/month (measured results only)
+
+        Returns:
+            [{period, count, avg_ms, min_ms, max_ms}, ...] oldest first
+        """
+        if period not in _PERIODS:
+            raise ValueError(f"period must be one of {sorted(_PERIODS)}, got '{period}'")
+        where, params = self._filters(environment, since, until, api_name=api_name)
+        query = (f"SELECT {_PERIODS[period]} AS period, COUNT(*) AS count, AVG(latency_ms) AS avg_ms,"
+                 f" MIN(latency_ms) AS min_ms, MAX(latency_ms) AS max_ms"
+                 f" FROM results WHERE {where} AND latency_ms IS NOT NULL GROUP BY period ORDER BY period")
+        return [dict(row) for row in self._db.execute(query, params)]
+
+    def failure_rates(
+        self,
+        environment: Optional[str] = None,
+        since: Union[datetime, str, None] = None,
+        until: Union[datetime, str, None] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Per-API {total, failed, failure_rate} over PASS/FAIL results"""
+        where, params = self._filters(environment, since, until)
+        query = (f"SELECT api_name, COUNT(*) AS total, SUM(status = 'FAIL') AS failed FROM results"
+                 f" WHERE {where} AND status IN ('PASS', 'FAIL') GROUP BY api_name ORDER BY api_name")
+        return {
+            row["api_name"]: {"total": row["total"], "failed": row["failed"], "failure_rate": row["failed"] / row["total"]}
+            for row in self._db.execute(query, params)
+        }
+
+    def failure_rate_delta(
+        self,
+        days: int = 7,
+        environment: Optional[str] = None,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Failure rate of each API in the last `days` vs the `days` before
+
+        Returns:
+            {api_name: {previous, current, delta}}; a rate is None when
+            the API has no results in that window. Sorted by delta, worst first.
+        """
+        now = now or datetime.now()
+        window = timedelta(days=days)
+        current = self.failure_rates(environment, now - window, now)
+        previous = self.failure_rates(environment, now - 2 * window, now - window)
+
+        deltas = {}
+        for api_name in sorted(set(current) | set(previous)):
+            before = previous[api_name]["failure_rate"] if api_name in previous else None
+            after = current[api_name]["failure_rate"] if api_name in current else None
+            deltas[api_name] = {
+                "previous": before,
+                "current": after,
+                "delta": after - before if before is not None and after is not None else None
+            }
+        return dict(sorted(deltas.items(), key=lambda item: -(item[1]["delta"] or 0)))
+
+    def flaky_tests(
+        self,
+        min_runs: int = 3,
+        environment: Optional[str] = None,
+        since: Union[datetime, str, None] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Tests/APIs that both pass and fail across runs
+
+        Each run counts once per test/API: it failed if any of its results
+        failed (so one bulk run with many flows is a single run). flips
+        counts PASS<->FAIL changes between runs in start order; a
+        consistently broken test has failures == runs and is not reported.
+
+        Returns:
+            [{test_id, api_name, runs, failures, flips, failure_rate}, ...] most flips first
+        """
+        where, params = self._filters(environment, since, None)
+        query = f"""
+            WITH per_run AS (
+                SELECT test_id, api_name, run_id, MAX(status = 'FAIL') AS failed, MIN(timestamp) AS first_seen
+                FROM results WHERE {where} AND status IN ('PASS', 'FAIL')
+                GROUP BY test_id, api_name, run_id
+            ), ordered AS (
+                SELECT per_run.test_id, per_run.api_name, per_run.failed,
+                       LAG(per_run.failed) OVER (
+                           PARTITION BY per_run.test_id, per_run.api_name
+                           ORDER BY COALESCE(runs.started_at, per_run.first_seen), per_run.first_seen, per_run.run_id
+                       ) AS previous
+                FROM per_run JOIN runs ON runs.run_id = per_run.run_id
+            )
+            SELECT test_id, api_name, COUNT(*) AS runs, SUM(failed) AS failures,
+                   SUM(previous IS NOT NULL AND previous != failed) AS flips
+            FROM ordered
+            GROUP BY test_id, api_name
+            HAVING runs >= ? AND failures > 0 AND failures < runs
+            ORDER BY flips DESC, failures DESC
+        """
+        return [
+            {**dict(row), "failure_rate": row["failures"] / row["runs"]}
+            for row in self._db.execute(query, params + [min_runs])
+        ]
+
+    def runs(self, source: Optional[str] = None, environment: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Recorded runs, oldest first"""
+        where, params = self._filters(environment, None, None, source=source)
+        query = f"SELECT * FROM runs WHERE {where} ORDER BY started_at"
+        return [dict(row) for row in self._db.execute(query, params)]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ═══════════════════════════════════════════════════════════════════
+# CLI
+# ═══════════════════════════════════════════════════════════════════
+
+def _ms(value: Optional[float]) -> str:
+    return f"{value:.1f}" if value is not None else "-"
+
+
+def _rate(value: Optional[float]) -> str:
+    return f"{value * 100:.1f}%" if value is not None else "-"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Upstox results history')
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help=f'SQLite store (default: {DEFAULT_DB_PATH})')
+    parser.add_argument('--env', default=None, help='Only this environment')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest = commands.add_parser('ingest', help='Import Allure results, test_report.json, logs.json or NDJSON files')
+    ingest.add_argument('paths', nargs='+')
+    latency = commands.add_parser('latency', help='Latency trend of one API')
+    latency.add_argument('api_name')
+    latency.add_argument('--period', choices=sorted(_PERIODS), default='day')
+    failures = commands.add_parser('failures', help='Failure-rate change: last N days vs the N before')
+    failures.add_argument('--days', type=int, default=7)
+    flaky = commands.add_parser('flaky', help='Tests that both pass and fail')
+    flaky.add_argument('--min-runs', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    with ResultsStore(args.db) as store:
+        if args.command == 'ingest':
+            for path in args.paths:
+                print(f"📥 {path}: {store.ingest(path, environment=args.env)} new runs")
+        elif args.command == 'latency':
+            print(f"\n⏱️  {args.api_name} latency per {args.period}")
+            print(f"  {'Period':<12} {'Count':>7} {'Avg ms':>10} {'Min ms':>10} {'Max ms':>10}")
+            for row in store.latency_trend(args.api_name, args.period, args.env):
+                print(f"  {row['period']:<12} {row['count']:>7} {_ms(row['avg_ms']):>10} "
+                      f"{_ms(row['min_ms']):>10} {_ms(row['max_ms']):>10}")
+        elif args.command == 'failures':
+            print(f"\n📉 Failure rate: last {args.days} days vs previous {args.days}")
+            print(f"  {'API':<30} {'Previous':>9} {'Current':>9} {'Delta':>9}")
+            for api_name, row in store.failure_rate_delta(args.days, args.env).items():
+                print(f"  {api_name:<30} {_rate(row['previous']):>9} {_rate(row['current']):>9} {_rate(row['delta']):>9}")
+        else:
+            print(f"\n🎲 Flaky tests (at least {args.min_runs} runs)")
+            for row in store.flaky_tests(args.min_runs, args.env):
+                print(f"  {row['test_id']} | {row['api_name']}: failed in {row['failures']}/{row['runs']} runs, "
+                      f"{row['flips']} flips")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
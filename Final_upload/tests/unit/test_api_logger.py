@@ -0,0 +1,64 @@
+"""
+Unit Tests for APILogger (lazy formatting, level check, per-endpoint sampling)
+"""
+import pytest
+import requests
+
+from src.utils import logger as logger_module
+from src.utils.logger import APILogger, logger
+
+
+@pytest.fixture
+def records(monkeypatch):
+    """Collect DEBUG records in a list (as if DEBUG logging were enabled)"""
+    collected = []
+    sink_id = logger.add(collected.append, level="DEBUG", format="{message}")
+    monkeypatch.setattr(logger_module, "_min_level_no", logger.level("DEBUG").no)
+    monkeypatch.setattr(APILogger, "sample_rate", 1.0)
+    monkeypatch.setattr(APILogger, "endpoint_sample_rates", {})
+    yield collected
+    logger.remove(sink_id)
+
+
+def make_response(status: int = 200, text: str = '{"ok": true}') -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = text.encode()
+    response.headers["Content-Type"] = "application/json"
+    return response
+
+
+class TestAPILogger:
+
+    def test_one_structured_record_per_request_and_response(self, records):
+        APILogger.log_request("POST", "https://h/api/v1/leads", {"Accept": "json"}, {"password": "x", "a": 1})
+        APILogger.log_response(make_response(201), 0.0123)
+
+        request, response = (message.record for message in records)
+        assert request["extra"]["event"] == "api_request"
+        assert request["extra"]["url"] == "https://h/api/v1/leads"
+        assert "***MASKED***" in request["message"] and "'x'" not in request["message"]
+        assert response["extra"]["status"] == 201
+        assert "API RESPONSE: 201 (0.012s)" in response["message"]
+
+    def test_nothing_is_formatted_when_debug_is_disabled(self, monkeypatch):
+        monkeypatch.setattr(logger_module, "_min_level_no", logger.level("INFO").no)
+
+        def fail(*args):
+            raise AssertionError("masked although DEBUG is disabled")
+
+        monkeypatch.setattr(APILogger, "_mask_sensitive_data", staticmethod(fail))
+        monkeypatch.setattr(APILogger, "_response_body", staticmethod(fail))
+        APILogger.log_request("POST", "https://h/x", {}, {"token": "t"})
+        APILogger.log_response(make_response(), 0.1)
+
+    def test_per_endpoint_sampling_skips_request_and_its_response(self, records):
+        APILogger.configure_sampling(1.0, {"/api/v1/leads/{id}": 0.0})
+
+        APILogger.log_request("GET", "https://h/api/v1/leads/42", {})
+        APILogger.log_response(make_response(), 0.1)
+        assert records == []
+
+        APILogger.log_request("GET", "https://h/api/v1/leads", {})
+        APILogger.log_response(make_response(), 0.1)
+        assert len(records) == 2
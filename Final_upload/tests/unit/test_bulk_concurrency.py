@@ -0,0 +1,137 @@
+"""
+Unit Tests for concurrent bulk onboarding building blocks
+"""
+import threading
+import time
+
+import generate_test_report
+from generate_test_report import TestReportGenerator as ReportGenerator
+from src.api_clients.client_pool import ClientPool
+from src.models.upstox_models import TokenStore, token_store
+
+
+class FakeClient:
+    """Stand-in for UpstoxAuthClient that records lifecycle calls"""
+    BASE_URL = "https://mock.local"
+
+    def __init__(self, http_client=None):
+        self.http = http_client
+        self.token_store = token_store
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestClientPool:
+
+    def test_reuses_clients_up_to_size(self):
+        pool = ClientPool(FakeClient, size=2)
+        with pool.client() as first:
+            pass
+        with pool.client() as second:
+            pass
+        assert first is second
+
+        pool.close()
+        assert first.closed
+
+    def test_blocks_until_client_released(self):
+        pool = ClientPool(FakeClient, size=1)
+        held = pool.acquire()
+        acquired = []
+
+        waiter = threading.Thread(target=lambda: acquired.append(pool.acquire()))
+        waiter.start()
+        time.sleep(0.05)
+        assert acquired == []
+
+        pool.release(held)
+        waiter.join(timeout=1)
+        assert acquired == [held]
+
+
+class TestIsolatedTokenStore:
+
+    def test_isolated_store_does_not_touch_global(self):
+        token_store.clear_all()
+        store = TokenStore.isolated()
+        store.save_token("validate_otp_token", "flow-token")
+        store.save_user_data("profile_id", 42)
+
+        assert token_store.get_token("validate_otp_token") is None
+        assert token_store.get_user_data("profile_id") is None
+        assert TokenStore() is token_store
+
+
+class TestConcurrentBulkRun:
+
+    def test_runs_flows_concurrently_with_isolated_stores(self, monkeypatch):
+        monkeypatch.setattr(generate_test_report, "UpstoxAuthClient", FakeClient)
+        generator = ReportGenerator()
+        stores = []
+        active = {"now": 0, "peak": 0}
+        lock = threading.Lock()
+
+        def fake_single_test(test_number=1, client=None):
+            with lock:
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+            client.token_store = TokenStore.isolated()
+            stores.append(client.token_store)
+            time.sleep(0.02)
+            with lock:
+                active["now"] -= 1
+            return {"test_number": test_number, "status": "PASS"}
+
+        monkeypatch.setattr(generator, "run_single_test", fake_single_test)
+        generator.run_bulk_tests(count=12, concurrency=4)
+
+        assert [r["test_number"] for r in generator.bulk_results] == list(range(1, 13))
+        assert generator.report_data["bulk_summary"]["passed"] == 12
+        assert 1 < active["peak"] <= 4
+        assert len({id(store) for store in stores}) == 12
+
+    def test_submits_through_a_bounded_window(self, monkeypatch):
+        monkeypatch.setattr(generate_test_report, "UpstoxAuthClient", FakeClient)
+        generator = ReportGenerator()
+        counts = {"submitted": 0, "stored": 0, "peak": 0}
+
+        class CountingExecutor(generate_test_report.ThreadPoolExecutor):
+            def submit(self, *args, **kwargs):
+                counts["submitted"] += 1
+                counts["peak"] = max(counts["peak"], counts["submitted"] - counts["stored"])
+                return super().submit(*args, **kwargs)
+
+        store_result = generator._store_result
+
+        def counting_store(result):
+            counts["stored"] += 1
+            store_result(result)
+
+        monkeypatch.setattr(generate_test_report, "ThreadPoolExecutor", CountingExecutor)
+        monkeypatch.setattr(generator, "_store_result", counting_store)
+        monkeypatch.setattr(generator, "run_single_test",
+                            lambda test_number=1, client=None: {"test_number": test_number, "status": "PASS"})
+        generator.run_bulk_tests(count=200, concurrency=4)
+
+        assert counts["submitted"] == counts["stored"] == 200
+        assert counts["peak"] <= 4
+        assert [r["test_number"] for r in generator.bulk_results] == list(range(1, 201))
+
+    def test_rps_caps_sequential_runs_too(self, monkeypatch):
+        monkeypatch.setattr(generate_test_report, "UpstoxAuthClient", FakeClient)
+        generator = ReportGenerator()
+        clients = []
+
+        def fake_single_test(test_number=1, client=None):
+            clients.append(generator._make_client())   # What a sequential flow gets
+            return {"test_number": test_number, "status": "PASS"}
+
+        monkeypatch.setattr(generator, "run_single_test", fake_single_test)
+        generator.run_bulk_tests(count=3, rps=50)
+
+        limits = {id(client.http.rate_limits) for client in clients}
+        assert len(limits) == 1
+        bucket = clients[0].http.rate_limits.buckets_for("https://mock.local/")[0]
+        assert (bucket.rate, bucket.burst) == (50, 1)
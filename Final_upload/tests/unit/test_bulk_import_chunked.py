@@ -0,0 +1,144 @@
+"""
+Unit Tests for LeadAPIClient.bulk_import_chunked (fake bulk_import, no network)
+"""
+import threading
+import time
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+from src.api_clients.lead_client import LeadAPIClient
+from src.models.lead_models import BulkImportResponse, CreateLeadRequest
+
+
+def make_leads(count: int):
+    return (
+        CreateLeadRequest(firstName="Bulk", lastName=str(n), email=f"bulk{n}@example.com")
+        for n in range(count)
+    )
+
+
+def http_error(status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status} Error", response=response)
+
+
+def refused() -> requests.ConnectionError:
+    """Connection refused: the request never reached the server"""
+    reason = NewConnectionError(None, "Connection refused")
+    return requests.ConnectionError(type("MaxRetryError", (), {"reason": reason})())
+
+
+class FakeBulkClient(LeadAPIClient):
+    """bulk_import fails according to `failures` ({first lead number: [exceptions...]})"""
+
+    def __init__(self, failures=None, delay=0.0, replies=None):
+        super().__init__(base_url="http://127.0.0.1:9")
+        self.failures = failures or {}
+        self.delay = delay
+        self.replies = replies or {}
+        self.calls = []
+        self.headers = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def bulk_import(self, leads, skip_validation=False, validate_response=True, headers=None):
+        first = int(leads[0].last_name)
+        with self.lock:
+            self.calls.append(first)
+            self.headers.append(headers)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            pending = self.failures.get(first)
+            if pending:
+                raise pending.pop(0)
+            if first in self.replies:
+                return self._handle_response(self.replies[first], BulkImportResponse)
+            # The server rejects every lead whose number ends in 7
+            errors = [{"index": i, "message": "rejected"} for i, lead in enumerate(leads) if lead.last_name.endswith("7")]
+            return BulkImportResponse(imported=len(leads) - len(errors), failed=len(errors), errors=errors)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+class TestBulkImportChunked:
+
+    def test_merges_chunk_results(self):
+        client = FakeBulkClient(delay=0.01)
+        result = client.bulk_import_chunked(make_leads(1000), chunk_size=100, max_workers=4)
+
+        assert result.imported + result.failed == 1000
+        assert result.failed == 100
+        assert sorted(client.calls) == list(range(0, 1000, 100))
+        assert client.max_in_flight <= 4
+        # Error indexes refer to positions in the full input
+        assert sorted(e["index"] for e in result.errors) == [n for n in range(1000) if n % 10 == 7]
+
+    def test_retries_only_the_failed_chunk(self):
+        client = FakeBulkClient(failures={200: [refused(), http_error(429)]})
+        result = client.bulk_import_chunked(make_leads(300), chunk_size=100, retry_backoff=0)
+
+        assert client.calls.count(200) == 3
+        assert client.calls.count(0) == client.calls.count(100) == 1
+        assert result.imported == 270
+
+    def test_possibly_imported_chunk_is_not_resent(self):
+        # The server may have created these leads before failing: resending would duplicate them
+        for error in (http_error(503), requests.ReadTimeout("read timed out"), requests.ConnectionError("reset")):
+            client = FakeBulkClient(failures={0: [error]})
+            result = client.bulk_import_chunked(make_leads(100), chunk_size=100, retry_backoff=0)
+            assert client.calls == [0]
+            assert result.failed == 100
+
+    def test_idempotency_key_allows_retrying_5xx_with_the_same_key(self):
+        client = FakeBulkClient(failures={0: [http_error(503), requests.ReadTimeout("read timed out")]})
+        result = client.bulk_import_chunked(make_leads(200), chunk_size=100, retry_backoff=0,
+                                            idempotency_header="Idempotency-Key")
+
+        assert client.calls.count(0) == 3
+        assert result.imported == 180
+        keys = [headers["Idempotency-Key"] for first, headers in zip(client.calls, client.headers) if first == 0]
+        assert len(set(keys)) == 1
+        other = [headers["Idempotency-Key"] for first, headers in zip(client.calls, client.headers) if first == 100]
+        assert other[0] != keys[0]
+
+    def test_chunks_are_sent_without_urllib3_resends(self):
+        client = FakeBulkClient()
+        sender = client.http.without_resends()
+        retry = sender.session.get_adapter("http://127.0.0.1:9").max_retries
+        assert (retry.read, retry.status, retry.connect) == (0, 0, client.http.retry_attempts)
+        sender.close()
+
+    def test_chunk_that_keeps_failing_counts_as_failed(self):
+        client = FakeBulkClient(failures={100: [http_error(429)] * 3})
+        result = client.bulk_import_chunked(make_leads(300), chunk_size=100, chunk_retries=2, retry_backoff=0)
+
+        assert result.failed == 10 + 100 + 10
+        chunk_errors = [e for e in result.errors if "chunk" in e]
+        assert len(chunk_errors) == 1
+        assert (chunk_errors[0]["chunk"], chunk_errors[0]["offset"], chunk_errors[0]["size"]) == (1, 100, 100)
+
+    def test_client_errors_are_not_retried(self):
+        client = FakeBulkClient(failures={0: [http_error(413)]})
+        result = client.bulk_import_chunked(make_leads(50), chunk_size=100, retry_backoff=0)
+
+        assert client.calls == [0]
+        assert result.imported == 0 and result.failed == 50
+
+    def test_unparseable_or_broken_chunk_does_not_abort_the_import(self):
+        html = requests.Response()
+        html.status_code = 200
+        html.headers["Content-Type"] = "text/html"
+        html._content = b"<html>Service temporarily unavailable</html>"
+        client = FakeBulkClient(failures={200: [RuntimeError("boom")]}, replies={100: html})
+        result = client.bulk_import_chunked(make_leads(300), chunk_size=100, retry_backoff=0)
+
+        assert client.calls.count(100) == 1
+        assert result.imported == 90
+        assert result.failed == 10 + 100 + 100
+        assert sorted(e["chunk"] for e in result.errors if "chunk" in e) == [1, 2]
@@ -0,0 +1,83 @@
+"""
+Unit Tests for HTTP record/replay cassettes (recorded against the local mock server)
+"""
+import pytest
+
+from src.api_clients.upstox_auth_client import UpstoxAuthClient
+from src.mock_server import UpstoxMockServer
+from src.models.upstox_models import session_scope
+from src.utils.cassette import Cassette, CassetteError, normalize_url, request_key, use_cassette
+
+
+def run_login_flow(base_url, mobile):
+    """Generate + verify OTP with a fresh client and session"""
+    client = UpstoxAuthClient(request_id="QATest1234", base_url=base_url)
+    with session_scope():
+        generate = client.generate_otp(mobile)
+        verify = client.verify_otp("123789")
+    client.close()
+    return generate, verify
+
+
+class TestCassetteKeys:
+
+    def test_dynamic_query_params_are_masked(self):
+        a = normalize_url("https://h/x?requestId=QATest1111&b=2&a=1")
+        b = normalize_url("https://h/x?a=1&requestId=QATest9999&b=2")
+        assert a == b
+        assert "QATest" not in a
+
+    def test_tokens_in_body_do_not_change_key(self):
+        body_a = {"data": {"otp": "123789", "validateOtpToken": "tok-a"}}
+        body_b = {"data": {"otp": "000000", "validateOtpToken": "tok-b"}}
+        assert request_key("POST", "https://h/x", body_a) == request_key("POST", "https://h/x", body_b)
+
+    def test_other_body_fields_change_exact_key_only(self):
+        exact_a, loose_a = request_key("POST", "https://h/x", {"mobileNumber": "9000000001"})
+        exact_b, loose_b = request_key("POST", "https://h/x", {"mobileNumber": "9000000002"})
+        assert exact_a != exact_b
+        assert loose_a == loose_b
+
+    def test_rejects_unknown_record_mode(self, tmp_path):
+        with pytest.raises(ValueError):
+            Cassette(str(tmp_path / "c.json"), "sometimes")
+
+
+class TestRecordReplay:
+
+    def test_replays_with_server_stopped(self, tmp_path):
+        path = tmp_path / "login.json"
+        with UpstoxMockServer() as server:
+            base_url = server.base_url
+            with use_cassette(str(path), "once") as cassette:
+                run_login_flow(base_url, "9870165199")
+            assert len(cassette) == 2
+        assert path.exists()
+
+        # Server is gone: the flow must be served entirely from the cassette,
+        # even with a different mobile number and request id
+        with use_cassette(str(path), "once") as cassette:
+            assert not cassette.recording
+            generate, verify = run_login_flow(base_url, "9870165100")
+        assert generate.is_success
+        assert verify.validate_success_response()[0]
+
+    def test_none_mode_raises_on_unrecorded_request(self, tmp_path):
+        with use_cassette(str(tmp_path / "empty.json"), "none"):
+            with pytest.raises(CassetteError):
+                run_login_flow("http://127.0.0.1:9", "9870165199")
+
+    def test_new_episodes_appends(self, upstox_mock_server, tmp_path):
+        upstox_mock_server.state.reset()
+        path = tmp_path / "episodes.json"
+        # The live Verify OTP below reuses the recorded token, so keep it unmasked
+        with use_cassette(str(path), "once", redactor=None):
+            client = UpstoxAuthClient(base_url=upstox_mock_server.base_url)
+            with session_scope():
+                client.generate_otp("9870165199")
+            client.close()
+
+        # A different mobile still replays Generate OTP (and is not held by its throttle)
+        with use_cassette(str(path), "new_episodes", redactor=None) as cassette:
+            run_login_flow(upstox_mock_server.base_url, "9870165100")
+        assert len(Cassette(str(path), "none")) == len(cassette) == 2
@@ -0,0 +1,159 @@
+"""
+Unit Tests for the config registry (typed snapshot, multi-environment clients, hot reload)
+"""
+import os
+import time
+
+import pytest
+import yaml
+
+from config.registry import ConfigRegistry, build_snapshot, config_registry
+from config.settings import Settings
+from src.api_clients.base_client import BaseAPIClient
+from src.api_clients.lead_client import LeadAPIClient
+
+ENVIRONMENTS_YAML = """
+environments:
+  dev:
+    base_url: "http://dev.local"
+    timeout: 5
+    retry_attempts: 1
+apis:
+  lead_generation:
+    endpoints:
+      get_lead:
+        path: "/api/v1/leads/{lead_id}"
+        method: get
+rate_limits:
+  hosts: {}
+"""
+
+
+def write_config(path, text):
+    path.write_text(text)
+    # Make the change visible even on filesystems with coarse mtimes
+    stamp = time.time() + len(text)
+    os.utime(path, (stamp, stamp))
+
+
+class TestSnapshot:
+
+    def test_typed_environments_and_endpoints(self):
+        snapshot = config_registry.snapshot
+        production = snapshot.env("production")
+        assert production.timeout == 60 and production.retry_attempts == 5
+
+        get_lead = snapshot.endpoint("lead_generation", "get_lead")
+        assert get_lead.method == "GET"
+        assert get_lead.params == ("lead_id",)
+        assert get_lead.url(lead_id=42) == "/api/v1/leads/42"
+        assert snapshot.endpoint("lead_generation", "list_leads").url() == "/api/v1/leads"
+
+    def test_snapshot_is_immutable(self):
+        snapshot = config_registry.snapshot
+        with pytest.raises(TypeError):
+            snapshot.environments["qa"] = snapshot.env("staging")
+        with pytest.raises(AttributeError):
+            snapshot.env("staging").timeout = 1
+
+    def test_raw_config_is_read_only(self):
+        raw = config_registry.snapshot.raw
+        with pytest.raises(TypeError):
+            raw["environments"] = {}
+        with pytest.raises(TypeError):
+            raw["environments"]["staging"]["timeout"] = 1
+        with pytest.raises(TypeError):
+            Settings.get_rate_limit_config()["hosts"] = {"api.example.com": {"rate": 1}}
+
+    def test_unknown_names_list_the_known_ones(self):
+        with pytest.raises(KeyError, match="staging"):
+            config_registry.snapshot.env("nowhere")
+        with pytest.raises(KeyError, match="create_lead"):
+            config_registry.snapshot.endpoint("lead_generation", "nothing")
+
+    def test_upstox_config_becomes_an_api(self):
+        upstox = config_registry.snapshot.api("upstox")
+        assert upstox.base_url
+        assert upstox.endpoint("generate_otp").method == "POST"
+
+    def test_settings_dict_api_reads_the_registry(self):
+        assert Settings.load_config() is config_registry.snapshot.raw
+        assert Settings.get_base_url("staging") == config_registry.snapshot.env("staging").base_url
+
+
+class TestMultiEnvironmentClients:
+
+    def test_clients_for_different_environments_side_by_side(self):
+        staging = BaseAPIClient(env="staging")
+        production = BaseAPIClient(env="production")
+
+        assert staging.http.base_url == config_registry.snapshot.env("staging").base_url
+        assert production.http.base_url == config_registry.snapshot.env("production").base_url
+        assert (staging.http.timeout, staging.http.retry_attempts) == (30, 3)
+        assert (production.http.timeout, production.http.retry_attempts) == (60, 5)
+
+    def test_base_url_overrides_environment(self):
+        client = BaseAPIClient(base_url="http://127.0.0.1:9", env="production")
+        assert client.http.base_url == "http://127.0.0.1:9"
+        assert client.http.timeout == 60
+
+    def test_lead_client_paths_come_from_config(self):
+        client = LeadAPIClient(base_url="http://127.0.0.1:9")
+        endpoints = config_registry.snapshot.api("lead_generation").endpoints
+        assert client.CREATE_LEAD == endpoints["create_lead"].path
+        assert client.LEAD_STATUS == endpoints["lead_status"].path
+        assert client.BULK_IMPORT == endpoints["bulk_import"].path
+
+
+    def test_endpoint_paths_stay_available_on_the_class(self, monkeypatch):
+        assert LeadAPIClient.BULK_IMPORT == "/api/v1/leads/bulk-import"
+
+        # A configured path overrides the default for that client only
+        snapshot = build_snapshot([yaml.safe_load(ENVIRONMENTS_YAML.replace("/api/v1/leads/{lead_id}", "/v2/leads/{lead_id}"))])
+        monkeypatch.setattr(config_registry, "_snapshot", snapshot)
+        client = LeadAPIClient(base_url="http://127.0.0.1:9")
+        assert client.GET_LEAD == "/v2/leads/{lead_id}"
+        assert client.BULK_IMPORT == LeadAPIClient.BULK_IMPORT == "/api/v1/leads/bulk-import"
+        assert LeadAPIClient.GET_LEAD == "/api/v1/leads/{lead_id}"
+
+class TestHotReload:
+
+    def test_reload_only_when_files_change(self, tmp_path):
+        path = tmp_path / "environments.yaml"
+        write_config(path, ENVIRONMENTS_YAML)
+        registry = ConfigRegistry(files=[path])
+        seen = []
+        registry.subscribe(seen.append)
+
+        first = registry.snapshot
+        assert first.env("dev").timeout == 5
+        assert registry.reload() is False
+        assert registry.snapshot is first
+
+        write_config(path, ENVIRONMENTS_YAML.replace("timeout: 5", "timeout: 7"))
+        assert registry.reload() is True
+        assert registry.snapshot.env("dev").timeout == 7
+        assert registry.snapshot.version == first.version + 1
+        # The old snapshot is untouched for readers still holding it
+        assert first.env("dev").timeout == 5
+        assert [s.version for s in seen] == [0, 1]
+
+    def test_watcher_picks_up_changes_and_survives_bad_files(self, tmp_path):
+        path = tmp_path / "environments.yaml"
+        write_config(path, ENVIRONMENTS_YAML)
+        registry = ConfigRegistry(files=[path])
+        assert registry.snapshot.env("dev").base_url == "http://dev.local"
+
+        registry.watch(interval=0.01)
+        try:
+            write_config(path, "environments: [unclosed")
+            time.sleep(0.1)
+            assert registry.snapshot.env("dev").base_url == "http://dev.local"
+
+            write_config(path, ENVIRONMENTS_YAML.replace("dev.local", "dev2.local"))
+            deadline = time.monotonic() + 2
+            while registry.snapshot.env("dev").base_url != "http://dev2.local" and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert registry.snapshot.env("dev").base_url == "http://dev2.local"
+        finally:
+            registry.stop_watching()
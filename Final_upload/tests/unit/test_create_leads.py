@@ -0,0 +1,98 @@
+"""
+Unit Tests for LeadAPIClient.create_leads (fake create_lead, no network)
+"""
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+from src.api_clients.lead_client import LeadAPIClient
+from src.models.lead_models import CreateLeadRequest, LeadResponse
+
+
+def make_leads(count: int):
+    return (
+        CreateLeadRequest(firstName="Lead", lastName=str(n), email=f"lead{n}@example.com")
+        for n in range(count)
+    )
+
+
+class FakeLeadClient(LeadAPIClient):
+    """create_lead fails for lead numbers in `failures` ({number: exception}) and returns `replies` raw"""
+
+    def __init__(self, failures=None, delay=0.0, replies=None):
+        super().__init__(base_url="http://127.0.0.1:9")
+        self.failures = failures or {}
+        self.replies = replies or {}
+        self.delay = delay
+        self.senders = set()
+        # Shared with the copy create_leads sends through (ints would be copied)
+        self.in_flight = {"now": 0, "max": 0}
+        self.lock = threading.Lock()
+
+    def create_lead(self, lead_data, validate_response=True):
+        number = int(lead_data.last_name)
+        with self.lock:
+            self.senders.add(self.http)
+            self.in_flight["now"] += 1
+            self.in_flight["max"] = max(self.in_flight["max"], self.in_flight["now"])
+        try:
+            time.sleep(self.delay)
+            if number in self.failures:
+                raise self.failures[number]
+            if number in self.replies:
+                return self._handle_response(self.replies[number], LeadResponse)
+            now = datetime.now().isoformat()
+            return LeadResponse.model_validate({
+                "id": f"lead-{number}", "firstName": lead_data.first_name, "lastName": lead_data.last_name,
+                "email": lead_data.email, "jobTitle": None, "source": "website", "status": "new",
+                "createdAt": now, "updatedAt": now
+            })
+        finally:
+            with self.lock:
+                self.in_flight["now"] -= 1
+
+
+class TestCreateLeads:
+
+    def test_creates_every_lead_with_bounded_concurrency(self):
+        client = FakeLeadClient(delay=0.01)
+        results = list(client.create_leads(make_leads(200), concurrency=8))
+
+        assert sorted(r.index for r in results) == list(range(200))
+        assert all(r.success and r.lead_id == f"lead-{r.index}" for r in results)
+        assert 1 < client.in_flight["max"] <= 8
+
+    def test_concurrent_requests_beat_sequential_round_trips(self):
+        client = FakeLeadClient(delay=0.05)
+        start = time.monotonic()
+        list(client.create_leads(make_leads(40), concurrency=20))
+        # Sequentially this would take 40 × 50ms = 2s
+        assert time.monotonic() - start < 1.0
+
+    def test_failed_lead_does_not_stop_the_others(self):
+        html = requests.Response()
+        html.status_code = 200
+        html.headers["Content-Type"] = "text/html"
+        html._content = b"<html>Service maintenance</html>"
+        client = FakeLeadClient(
+            failures={3: requests.ConnectionError("reset"), 5: RuntimeError("boom")},
+            replies={7: html}
+        )
+        results = {r.index: r for r in client.create_leads(make_leads(10), concurrency=4)}
+
+        assert len(results) == 10
+        assert {i for i, r in results.items() if not r.success} == {3, 5, 7}
+        assert "ConnectionError" in results[3].message
+        assert "unparseable" in results[7].message
+
+    def test_leads_are_sent_without_resends(self):
+        # Creating a lead is not idempotent: a sent request must never be replayed
+        client = FakeLeadClient()
+        list(client.create_leads(make_leads(5), concurrency=2))
+
+        assert len(client.senders) == 1
+        sender = client.senders.pop()
+        assert sender is not client.http and sender.resend is False
+        assert sender.pool_maxsize >= 2
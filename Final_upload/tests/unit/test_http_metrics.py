@@ -0,0 +1,89 @@
+"""
+Unit Tests for HTTPClient metrics (histogram accuracy, collection against the mock server)
+"""
+import random
+
+import pytest
+import requests
+
+from src.api_clients.upstox_auth_client import UpstoxAuthClient
+from src.models.upstox_models import session_scope
+from src.utils.http_client import HTTPClient
+from src.utils.metrics import LatencyHistogram, MetricsCollector, endpoint_template
+
+
+class TestLatencyHistogram:
+
+    def test_percentiles_within_bucket_precision(self):
+        rng = random.Random(7)
+        samples = sorted(rng.uniform(0.001, 2.0) for _ in range(20000))
+        histogram = LatencyHistogram()
+        for sample in samples:
+            histogram.record(sample)
+
+        for q in (0.5, 0.95, 0.99):
+            exact_ms = samples[int(q * len(samples)) - 1] * 1000
+            assert histogram.percentile(q) == pytest.approx(exact_ms, rel=0.07)
+        assert histogram.count == 20000
+
+    def test_memory_is_fixed(self):
+        histogram = LatencyHistogram()
+        size = len(histogram.counts)
+        for value in (0, 1e-6, 0.5, 3600.0, 10 ** 9):
+            histogram.record(value)
+        assert len(histogram.counts) == size
+        assert histogram.percentile(1.0) == histogram.max_us / 1000
+
+    def test_empty_histogram(self):
+        assert LatencyHistogram().percentile(0.99) == 0.0
+
+
+class TestEndpointTemplate:
+
+    @pytest.mark.parametrize("url, expected", [
+        ("https://h/api/v1/leads/42?x=1", "/api/v1/leads/{id}"),
+        ("/api/v1/leads/6f1c2b3a-1d2e-4f50-8a9b-0c1d2e3f4a5b/status", "/api/v1/leads/{id}/status"),
+        ("/login/open/v8/auth/1fa/otp-step/generate?requestId=QATest1", "/login/open/v8/auth/1fa/otp-step/generate"),
+    ])
+    def test_ids_and_query_are_stripped(self, url, expected):
+        assert endpoint_template(url) == expected
+
+
+class TestHTTPClientMetrics:
+
+    def test_flow_is_recorded_per_endpoint(self, upstox_mock_server):
+        upstox_mock_server.state.reset()
+        collector = MetricsCollector()
+        http = HTTPClient(base_url=upstox_mock_server.base_url, metrics=collector)
+        client = UpstoxAuthClient(http_client=http, base_url=upstox_mock_server.base_url)
+        with session_scope():
+            client.generate_otp("9870165199")
+            client.verify_otp("123789")
+        with pytest.raises(requests.HTTPError):
+            client.generate_otp_raw("12345")
+        client.close()
+
+        snapshot = collector.to_dict()
+        generate = snapshot[f"POST {UpstoxAuthClient.GENERATE_OTP_ENDPOINT}"]
+        assert generate["status_counts"] == {"200": 1, "400": 1}
+        assert generate["latency"]["count"] == 2
+        assert generate["bytes_sent"] > 0 and generate["bytes_received"] > 0
+        assert f"POST {UpstoxAuthClient.VERIFY_OTP_ENDPOINT}" in snapshot
+
+        prometheus = collector.to_prometheus()
+        assert f'endpoint="{UpstoxAuthClient.GENERATE_OTP_ENDPOINT}",status="400"}} 1' in prometheus
+        assert 'quantile="0.99"' in prometheus
+
+    def test_connection_errors_are_counted(self):
+        collector = MetricsCollector()
+        http = HTTPClient(base_url="http://127.0.0.1:9", retry_attempts=0, metrics=collector)
+        with pytest.raises(requests.ConnectionError):
+            http.get("/leads/7")
+        assert collector.to_dict()["GET /leads/{id}"]["errors"] == 1
+
+    def test_write_exports_json_and_prometheus(self, tmp_path):
+        collector = MetricsCollector()
+        collector.record_auth_refresh("GET", "/leads/1")
+        collector.write(str(tmp_path / "metrics"))
+        assert (tmp_path / "metrics.json").exists()
+        assert "http_client_auth_refreshes_total" in (tmp_path / "metrics.prom").read_text()
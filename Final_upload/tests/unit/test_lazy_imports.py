@@ -0,0 +1,37 @@
+"""
+Unit Tests for lazy startup: importing the framework opens no files, starts
+no threads and skips heavy optional imports until they are needed
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def run(code: str) -> str:
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+class TestLazyImports:
+
+    def test_import_has_no_side_effects(self):
+        output = run(
+            "import sys, threading\n"
+            "import src.api_clients.upstox_auth_client\n"
+            "from src.utils import logger\n"
+            "print(logger._configured, threading.active_count(),"
+            " sorted(m for m in ('yaml', 'dotenv', 'jsonschema', 'tenacity') if m in sys.modules))"
+        )
+        assert output == "False 1 []"
+
+    def test_first_use_configures_logger_and_settings(self):
+        output = run(
+            "from src.utils.logger import logger, _LazyLogger\n"
+            "from src.utils import logger as module\n"
+            "from config.settings import Settings\n"
+            "logger.debug('first record')\n"
+            "print(module._configured, isinstance(Settings.__dict__['DEBUG'], bool), 'debug' in vars(logger))"
+        )
+        assert output.splitlines()[-1] == "True True True"
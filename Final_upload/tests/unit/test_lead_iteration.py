@@ -0,0 +1,76 @@
+"""
+Unit Tests for LeadAPIClient.iter_leads (fake list_leads, no network)
+"""
+import threading
+import time
+
+from src.api_clients.lead_client import LeadAPIClient
+from src.models.lead_models import LeadListResponse
+
+
+def make_lead(n: int) -> dict:
+    return {
+        "id": str(n), "firstName": "Lead", "lastName": str(n), "email": f"lead{n}@example.com",
+        "jobTitle": None, "source": "website", "status": "new",
+        "createdAt": "2024-01-01T00:00:00Z", "updatedAt": "2024-01-01T00:00:00Z",
+    }
+
+
+class FakeLeadClient(LeadAPIClient):
+    """LeadAPIClient whose list_leads serves `total` leads from memory"""
+
+    def __init__(self, total: int, delay: float = 0.0):
+        super().__init__(base_url="http://127.0.0.1:9")
+        self.total = total
+        self.delay = delay
+        self.pages = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def list_leads(self, page=1, page_size=20, validate_response=True, **filters):
+        with self.lock:
+            self.pages.append(page)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        start = (page - 1) * page_size
+        leads = [make_lead(n) for n in range(start, min(start + page_size, self.total))]
+        with self.lock:
+            self.in_flight -= 1
+        return LeadListResponse(leads=leads, total=self.total, page=page, pageSize=page_size)
+
+
+class TestIterLeads:
+
+    def test_yields_every_lead_in_order(self):
+        client = FakeLeadClient(total=95)
+        ids = [lead.id for lead in client.iter_leads(page_size=10, prefetch=3)]
+        assert ids == [str(n) for n in range(95)]
+        assert sorted(client.pages) == list(range(1, 11))
+
+    def test_prefetch_overlaps_page_latency(self):
+        serial = FakeLeadClient(total=100, delay=0.05)
+        start = time.perf_counter()
+        assert len(list(serial.iter_leads(page_size=10, prefetch=0))) == 100
+        serial_time = time.perf_counter() - start
+
+        prefetched = FakeLeadClient(total=100, delay=0.05)
+        start = time.perf_counter()
+        assert len(list(prefetched.iter_leads(page_size=10, prefetch=5))) == 100
+        assert time.perf_counter() - start < serial_time / 2
+        assert prefetched.max_in_flight <= 5
+
+    def test_limit_and_early_break_stop_fetching(self):
+        client = FakeLeadClient(total=10_000, delay=0.01)
+        assert len(list(client.iter_leads(page_size=10, prefetch=2, limit=25))) == 25
+
+        client = FakeLeadClient(total=10_000, delay=0.01)
+        for lead in client.iter_leads(page_size=10, prefetch=2):
+            if lead.id == "5":
+                break
+        time.sleep(0.05)
+        assert len(client.pages) <= 3
+
+    def test_empty_listing(self):
+        assert list(FakeLeadClient(total=0).iter_leads(page_size=10)) == []
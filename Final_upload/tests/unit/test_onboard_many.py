@@ -0,0 +1,51 @@
+"""
+Unit Tests for UpstoxAuthClient.onboard_many (against the local mock server)
+"""
+from src.api_clients.upstox_auth_client import UpstoxAuthClient
+from src.mock_server import MockConfig, UpstoxMockServer
+from src.utils.http_client import HTTPClient
+from src.utils.rate_limiter import NextAllowedScheduler
+
+
+class TestOnboardMany:
+
+    def test_onboards_every_user_with_isolated_sessions(self, upstox_mock_server):
+        upstox_mock_server.state.reset()
+        mobiles = [f"98701{n:05d}" for n in range(20)]
+        with UpstoxAuthClient(base_url=upstox_mock_server.base_url) as client:
+            results = list(client.onboard_many(mobiles, concurrency=8))
+
+        assert sorted(r.mobile_number for r in results) == mobiles
+        assert all(r.success and r.stage == "Email Verify OTP" for r in results), \
+            [r.message for r in results if not r.success]
+        # Each user got its own profile (tokens did not leak between sessions)
+        assert len({r.profile_id for r in results}) == 20
+        assert client.http.pool_maxsize >= 8
+
+    def test_uses_given_emails_and_reports_failed_stage(self, upstox_mock_server):
+        upstox_mock_server.state.reset()
+        with UpstoxAuthClient(base_url=upstox_mock_server.base_url) as client:
+            results = {r.mobile_number: r for r in client.onboard_many(
+                ["9870100001", "9870100002"], emails=["first_@gmail.com", "second_@gmail.com"], otp="000000"
+            )}
+
+        assert results["9870100001"].email == "first_@gmail.com"
+        assert not results["9870100002"].success
+        assert results["9870100002"].stage == "Verify OTP"
+
+    def test_repeated_mobile_waits_for_its_slot_instead_of_being_throttled(self):
+        config = MockConfig(enforce_rate_limit=True, next_request_interval=1)
+        with UpstoxMockServer(config=config) as server:
+            http = HTTPClient(base_url=server.base_url, retry_attempts=0)
+            client = UpstoxAuthClient(http_client=http, base_url=server.base_url,
+                                      otp_scheduler=NextAllowedScheduler())
+            results = list(client.onboard_many(
+                ["9870200001", "9870200001", "9870200002", "9870200003"], concurrency=2
+            ))
+            client.close()
+
+        assert all(r.success for r in results), [r.message for r in results]
+        assert all(r.rate_limit_retries == 0 for r in results)
+        # The other mobiles were moved ahead of the repeat, which then waited for its slot
+        assert [r.mobile_number for r in results][-1] == "9870200001"
+        assert sum(r.rate_limit_wait > 0.5 for r in results) == 1
@@ -0,0 +1,161 @@
+"""
+Unit Tests for NextAllowedScheduler and Generate OTP scheduling in UpstoxAuthClient
+"""
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+
+from src.api_clients.upstox_auth_client import UpstoxAuthClient
+from src.mock_server import MockConfig, UpstoxMockServer
+from src.models.upstox_models import UpstoxErrorCodes
+from src.utils.http_client import HTTPClient, retry_after_seconds
+from src.utils.rate_limiter import NextAllowedScheduler
+
+
+class TestNextAllowedScheduler:
+
+    def test_release_holds_only_that_key(self):
+        scheduler = NextAllowedScheduler()
+        assert scheduler.acquire("a") < 0.05
+        scheduler.release("a", 0.2)
+
+        assert scheduler.ready_at("a") > time.monotonic()
+        assert scheduler.acquire("b") < 0.05
+        start = time.monotonic()
+        scheduler.acquire("a")
+        assert time.monotonic() - start >= 0.15
+
+    def test_key_in_flight_is_never_sent_twice(self):
+        scheduler = NextAllowedScheduler()
+        active, peak, lock = [0], [0], threading.Lock()
+
+        def worker():
+            scheduler.acquire("a")
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.01)
+            with lock:
+                active[0] -= 1
+            scheduler.release("a")
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert peak[0] == 1
+        assert scheduler.ready_at("a") == 0
+
+    def test_defer_all_holds_every_key(self):
+        scheduler = NextAllowedScheduler()
+        scheduler.defer_all(0.2)
+        assert scheduler.ready_at("never-seen") > time.monotonic()
+        assert scheduler.acquire("x") >= 0.15
+
+    def test_expired_keys_are_pruned(self):
+        scheduler = NextAllowedScheduler(max_keys=10)
+        for n in range(50):
+            scheduler.acquire(str(n))
+            scheduler.release(str(n), 0.0001 if n < 49 else 60)
+        time.sleep(0.01)
+        scheduler.acquire("last")
+        scheduler.release("last")
+        assert len(scheduler._next_allowed) <= 11
+
+
+class TestGenerateOTPScheduling:
+
+    def test_waits_for_next_request_interval_instead_of_being_throttled(self):
+        config = MockConfig(enforce_rate_limit=True, next_request_interval=1)
+        with UpstoxMockServer(config=config) as server:
+            client = UpstoxAuthClient(http_client=HTTPClient(base_url=server.base_url, retry_attempts=0),
+                                      base_url=server.base_url, otp_scheduler=NextAllowedScheduler())
+            first = client.generate_otp("9870300001")
+            second = client.generate_otp("9870300001")
+            client.close()
+
+        assert first.is_success and second.is_success
+        assert client.last_otp_wait >= 0.9
+
+    def test_429_from_another_client_is_recorded(self):
+        config = MockConfig(enforce_rate_limit=True, next_request_interval=1)
+        scheduler = NextAllowedScheduler()
+        with UpstoxMockServer(config=config) as server:
+            # An unscheduled caller uses up the mobile's slot first
+            other = UpstoxAuthClient(http_client=HTTPClient(base_url=server.base_url, retry_attempts=0),
+                                     base_url=server.base_url)
+            other.generate_otp_raw("9870300002")
+
+            client = UpstoxAuthClient(http_client=HTTPClient(base_url=server.base_url, retry_attempts=0),
+                                      base_url=server.base_url, otp_scheduler=scheduler)
+            with pytest.raises(requests.exceptions.RequestException):
+                client.generate_otp("9870300002")
+            assert scheduler.ready_at("9870300002") > time.monotonic()
+            assert client.generate_otp("9870300002").is_success
+            other.close()
+            client.close()
+
+    def test_429_is_left_to_the_scheduler_not_resent(self):
+        config = MockConfig(enforce_rate_limit=True, next_request_interval=1)
+        with UpstoxMockServer(config=config) as server:
+            other = UpstoxAuthClient(http_client=HTTPClient(base_url=server.base_url, retry_attempts=0),
+                                     base_url=server.base_url)
+            other.generate_otp_raw("9870300003")
+
+            client = UpstoxAuthClient(http_client=HTTPClient(base_url=server.base_url, retry_attempts=3),
+                                      base_url=server.base_url, otp_scheduler=NextAllowedScheduler())
+            with pytest.raises(requests.exceptions.HTTPError):
+                client.generate_otp("9870300003")
+            assert sum(server.state.request_counts.values()) == 2
+            other.close()
+            client.close()
+
+    def test_429_without_mobile_error_code_holds_all_mobiles(self):
+        scheduler = NextAllowedScheduler()
+        client = UpstoxAuthClient(base_url="http://127.0.0.1:9", otp_scheduler=scheduler)
+        response = requests.Response()
+        response.status_code = 429
+        response.headers["Retry-After"] = "5"
+        response._content = b'{"success": false, "error": {"code": 1, "message": "slow down"}}'
+
+        assert client._next_otp_interval(response) is None
+        assert scheduler.ready_at("any-mobile") > time.monotonic() + 4
+
+        response._content = (b'{"success": false, "error": {"code": %d, "message": "wait"}}'
+                             % UpstoxErrorCodes.RATE_LIMIT_EXCEEDED)
+        assert client._next_otp_interval(response) == 5.0
+        client.close()
+
+    def test_429_with_http_date_retry_after(self):
+        scheduler = NextAllowedScheduler()
+        client = UpstoxAuthClient(base_url="http://127.0.0.1:9", otp_scheduler=scheduler)
+        response = requests.Response()
+        response.status_code = 429
+        response.headers["Retry-After"] = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+        response._content = (b'{"success": false, "error": {"code": %d, "message": "wait"}}'
+                             % UpstoxErrorCodes.RATE_LIMIT_EXCEEDED)
+
+        assert 25 < client._next_otp_interval(response) <= 30
+        client.close()
+
+
+class TestRetryAfterSeconds:
+
+    def test_delay_seconds(self):
+        assert retry_after_seconds("120", 1.0) == 120.0
+        assert retry_after_seconds(" 2.5 ", 1.0) == 2.5
+        assert retry_after_seconds("-3", 1.0) == 0.0
+
+    def test_http_date(self):
+        future = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=60), usegmt=True)
+        assert 55 < retry_after_seconds(future, 1.0) <= 60
+        assert retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT", 1.0) == 0.0
+
+    def test_missing_or_garbage_gives_default(self):
+        for value in (None, "", "soon", "Wed, 99 Foo 2015"):
+            assert retry_after_seconds(value, 7.0) == 7.0
@@ -0,0 +1,131 @@
+"""
+Unit Tests for the polling engine and LeadAPIClient.wait_for_lead(s)
+"""
+import random
+import threading
+from itertools import islice
+
+import pytest
+import requests
+
+from src.api_clients.lead_client import LeadAPIClient
+from src.models.lead_models import LeadResponse
+from src.utils.polling import backoff_intervals, poll
+
+
+class FakeClock:
+    """Deterministic clock + sleep for poll()"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestBackoff:
+
+    def test_grows_exponentially_and_caps(self):
+        assert list(islice(backoff_intervals(1, 2, 8, jitter=0), 6)) == [1, 2, 4, 8, 8, 8]
+
+    def test_jitter_only_shortens(self):
+        intervals = list(islice(backoff_intervals(1, 2, 8, jitter=0.5, rng=random.Random(3)), 20))
+        caps = [1, 2, 4] + [8] * 17
+        assert all(cap * 0.5 <= value <= cap for value, cap in zip(intervals, caps))
+
+
+class TestPoll:
+
+    def test_returns_when_condition_met(self):
+        clock = FakeClock()
+        values = iter([None, None, "ready"])
+        result = poll(lambda: next(values), timeout=10, jitter=0, initial_interval=1,
+                      sleep=clock.sleep, clock=clock.clock)
+        assert result.success and result.value == "ready"
+        assert len(result.attempts) == 3
+        assert clock.sleeps == [1, 2]
+
+    def test_never_sleeps_past_deadline(self):
+        clock = FakeClock()
+        result = poll(lambda: None, timeout=5, jitter=0, initial_interval=1, max_interval=10,
+                      sleep=clock.sleep, clock=clock.clock)
+        assert not result.success
+        assert clock.sleeps == [1, 2, 2]     # 1 + 2 + (capped at remaining 2) = 5
+        assert clock.now == 5
+        assert len(result.attempts) == 4
+
+    def test_retryable_errors_are_recorded(self):
+        clock = FakeClock()
+        calls = iter([requests.ConnectionError("down"), "ok"])
+
+        def func():
+            value = next(calls)
+            if isinstance(value, Exception):
+                raise value
+            return value
+
+        result = poll(func, retry_on=(requests.RequestException,), sleep=clock.sleep, clock=clock.clock)
+        assert result.success
+        assert result.attempts[0].error == "ConnectionError: down"
+
+    def test_other_errors_propagate(self):
+        with pytest.raises(KeyError):
+            poll(lambda: {}["x"], retry_on=(requests.RequestException,))
+
+
+def make_lead(lead_id: str, status: str) -> LeadResponse:
+    return LeadResponse.model_validate({
+        "id": lead_id, "firstName": "A", "lastName": "B", "email": "a@b.c", "jobTitle": None,
+        "source": "website", "status": status,
+        "createdAt": "2024-01-01T00:00:00Z", "updatedAt": "2024-01-01T00:00:00Z",
+    })
+
+
+class FakeStatusClient(LeadAPIClient):
+    """A lead becomes 'qualified' after `ready_after[id]` get_lead calls; 404 before its first"""
+
+    def __init__(self, ready_after):
+        super().__init__(base_url="http://127.0.0.1:9")
+        self.ready_after = ready_after
+        self.calls = {lead_id: 0 for lead_id in ready_after}
+        self.lock = threading.Lock()
+
+    def get_lead(self, lead_id, validate_response=True):
+        with self.lock:
+            self.calls[lead_id] += 1
+            count = self.calls[lead_id]
+        if count == 1:
+            response = requests.Response()
+            response.status_code = 404
+            raise requests.HTTPError("404 Not Found", response=response)
+        return make_lead(lead_id, "qualified" if count >= self.ready_after[lead_id] else "new")
+
+
+class TestWaitForLeads:
+
+    def test_wait_for_lead_ignores_not_found(self):
+        client = FakeStatusClient({"a": 3})
+        lead = client.wait_for_lead("a", expected_status="qualified", timeout=5, interval=0.01)
+        assert lead.status == "qualified"
+
+    def test_wait_for_lead_times_out(self):
+        client = FakeStatusClient({"a": 10 ** 6})
+        assert client.wait_for_lead("a", expected_status="qualified", timeout=0.1, interval=0.01) is None
+
+    def test_batch_polls_only_pending_leads(self):
+        ready_after = {f"lead-{n}": 2 + n % 4 for n in range(100)}
+        ready_after["stuck"] = 10 ** 6
+        client = FakeStatusClient(ready_after)
+
+        results = client.wait_for_leads(list(ready_after), expected_status="qualified",
+                                        timeout=1, interval=0.01, max_interval=0.05)
+
+        assert results["stuck"] is None
+        assert all(results[f"lead-{n}"].status == "qualified" for n in range(100))
+        # A lead stops being polled once it is ready
+        assert all(client.calls[f"lead-{n}"] == 2 + n % 4 for n in range(100))
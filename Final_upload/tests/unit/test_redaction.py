@@ -0,0 +1,75 @@
+"""
+Unit Tests for the redaction engine and its use by the logger and cassettes
+"""
+import base64
+import json
+
+from src.utils.cassette import Cassette, body_hash
+from src.utils.logger import APILogger
+from src.utils.redaction import MASK, Redactor, redact
+
+
+GENERATE_OTP_RESPONSE = {
+    "success": True,
+    "data": {"validateOTPToken": "f3a9c1", "message": "OTP sent", "nextRequestInterval": 30},
+}
+
+
+class TestRedactor:
+
+    def test_masks_nested_upstox_fields(self):
+        body = {"data": {"mobileNumber": "9870165199", "otp": "123789", "validateOTPToken": "abc"}}
+        assert redact(body) == {"data": {"mobileNumber": "9870165199", "otp": MASK, "validateOTPToken": MASK}}
+        assert body["data"]["otp"] == "123789"  # input untouched
+
+    def test_untouched_subtrees_are_not_copied(self):
+        clean = {"leads": [{"email": "a@b.c"}], "meta": {"page": 1}}
+        assert redact(clean) is clean
+
+        mixed = {"meta": {"page": 1}, "auth": {"access_token": "x"}, "items": [{"id": 1}]}
+        result = redact(mixed)
+        assert result["auth"] == {"access_token": MASK}
+        assert result["meta"] is mixed["meta"] and result["items"] is mixed["items"]
+
+    def test_headers_and_lists(self):
+        headers = {"Authorization": "Bearer eyJ", "X-Device-Details": "platform=WEB"}
+        assert redact(headers) == {"Authorization": MASK, "X-Device-Details": "platform=WEB"}
+        assert redact([{"otp": "1"}, "plain"]) == [{"otp": MASK}, "plain"]
+
+    def test_empty_values_and_flags_stay_readable(self):
+        assert redact({"token_generated": True, "token": None}) == {"token_generated": True, "token": None}
+
+    def test_paths_with_wildcards(self):
+        redactor = Redactor(keys=(), key_patterns=(), paths=("data.mobileNumber", "*.email"))
+        result = redactor.redact({"data": {"mobileNumber": "9870165199", "email": "a@b.c"}, "mobileNumber": "1"})
+        assert result == {"data": {"mobileNumber": MASK, "email": MASK}, "mobileNumber": "1"}
+
+    def test_redact_text_handles_truncated_json(self):
+        text = json.dumps(GENERATE_OTP_RESPONSE)[:-5]
+        redacted = Redactor().redact_text(text)
+        assert "f3a9c1" not in redacted and "OTP sent" in redacted
+
+
+class TestRedactionUsers:
+
+    def test_logger_masks_nested_body(self):
+        masked = APILogger._mask_sensitive_data({"data": {"otp": "123789", "mobileNumber": "9870165199"}})
+        assert masked == {"data": {"otp": MASK, "mobileNumber": "9870165199"}}
+
+    def test_cassette_body_hash_still_ignores_dynamic_values(self):
+        assert body_hash({"data": {"otp": "1"}}) == body_hash({"data": {"otp": "2"}})
+        assert body_hash({"data": {"otp": None}}) == body_hash({"data": {"otp": "2"}})
+
+    def test_cassette_never_stores_tokens(self, tmp_path):
+        import requests
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(GENERATE_OTP_RESPONSE).encode()
+        cassette = Cassette(str(tmp_path / "c.json"), "all")
+        cassette.record("POST", "https://h/generate", response, {"data": {"mobileNumber": "9870165199"}})
+        cassette.save()
+
+        stored = json.loads((tmp_path / "c.json").read_text())["interactions"][0]["body"]
+        body = json.loads(base64.b64decode(stored))
+        assert body["data"]["validateOTPToken"] == MASK
+        assert body["data"]["nextRequestInterval"] == 30
@@ -0,0 +1,64 @@
+"""
+Unit Tests for the virtualised HTML report viewer
+"""
+import json
+from pathlib import Path
+
+import pytest
+
+from src.utils import report_viewer
+from src.utils.report_viewer import write_report_viewer
+
+
+def report_data(path) -> dict:
+    html = open(path, encoding="utf-8").read()
+    start = html.index('id="report-data">') + len('id="report-data">')
+    return json.loads(html[start:html.index("</script>", start)])
+
+
+class TestReportViewer:
+
+    def test_rows_are_embedded_as_columnar_blob(self, tmp_path):
+        path = write_report_viewer(
+            tmp_path / "report.html", "Bulk run", ["#", "Mobile", "Status"],
+            ([n, f"98701{n:05d}", "PASS" if n % 3 else "FAIL"] for n in range(1, 1001)),
+            status_column="Status", charts=("Status",)
+        )
+        data = report_data(path)
+
+        assert data["columns"] == ["#", "Mobile", "Status"]
+        assert len(data["rows"]) == 1000
+        assert data["rows"][2] == [3, "9870100003", "FAIL"]
+        assert data["meta"] == {"status_column": "Status", "charts": ["Status"], "widths": {}}
+
+    def test_page_does_not_grow_a_table_row_per_result(self, tmp_path):
+        small = write_report_viewer(tmp_path / "small.html", "Run", ["#"], ([n] for n in range(10)))
+        large = write_report_viewer(tmp_path / "large.html", "Run", ["#"], ([n] for n in range(10000)))
+        small_html, large_html = (open(p, encoding="utf-8").read() for p in (small, large))
+
+        assert "<tr" not in large_html
+        assert large_html.count("<div") == small_html.count("<div")
+
+    def test_values_cannot_break_out_of_the_page(self, tmp_path):
+        hostile = "</script><script>alert(1)</script>"
+        path = write_report_viewer(tmp_path / "report.html", "<b>Run</b>", ["Message"], [[hostile]])
+        html = open(path, encoding="utf-8").read()
+
+        assert hostile not in html
+        assert "&lt;b&gt;Run&lt;/b&gt;" in html
+        assert report_data(path)["rows"] == [[hostile]]
+
+    def test_empty_report(self, tmp_path):
+        path = write_report_viewer(tmp_path / "nested" / "report.html", "Run", ["#"], iter(()))
+        assert report_data(path)["rows"] == []
+
+    def test_vendored_copy_matches(self):
+        # Upstox_Automation ships a copy of this module; only its header note may differ
+        source = Path(report_viewer.__file__)
+        vendored = source.parents[3] / "Upstox_Automation" / "reports" / "report_viewer.py"
+        if not vendored.exists():
+            pytest.skip("Upstox_Automation is not checked out next to Final_upload")
+        lines = vendored.read_text(encoding="utf-8").splitlines(keepends=True)
+        while lines and lines[0].startswith("#"):
+            lines.pop(0)
+        assert "".join(lines) == source.read_text(encoding="utf-8")
@@ -0,0 +1,129 @@
+"""
+Unit Tests for streaming bulk report writers (NDJSON/CSV, crash resume, streamed HTML/JSON)
+"""
+import csv
+import json
+
+from generate_test_report import TestReportGenerator as ReportGenerator
+from src.utils.report_writers import StreamingReportWriter, iter_ndjson
+
+
+def result(test_number: int, passed: bool = True) -> dict:
+    return {
+        "test_number": test_number,
+        "status": "PASS" if passed else "FAIL",
+        "mobile_number": f"98701{test_number:05d}",
+        "email": f"user{test_number}_@gmail.com",
+        "otp_used": "123789",
+        "stages": [{"stage": 1, "api_name": "Generate OTP", "status": "PASS", "details": {}}],
+    }
+
+
+def report_data(path) -> dict:
+    """The JSON blob embedded in a viewer report"""
+    html = open(path, encoding="utf-8").read()
+    start = html.index('id="report-data">') + len('id="report-data">')
+    return json.loads(html[start:html.index("</script>", start)])
+
+
+def read_csv(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.reader(f))
+
+
+class TestStreamingReportWriter:
+
+    def test_each_write_is_on_disk_immediately(self, tmp_path):
+        writer = StreamingReportWriter(tmp_path / "run")
+        writer.write(result(1))
+        writer.write(result(2, passed=False))
+
+        # Readable before close, as another process (or a post-crash run) would see it
+        assert [r["test_number"] for r in iter_ndjson(tmp_path / "run.ndjson")] == [1, 2]
+        assert len(read_csv(tmp_path / "run.csv")) == 3
+        assert (writer.total, writer.passed) == (2, 1)
+        writer.close()
+
+    def test_results_are_redacted(self, tmp_path):
+        with StreamingReportWriter(tmp_path / "run") as writer:
+            writer.write({**result(1), "validate_otp_token": "secret-token"})
+        assert next(iter_ndjson(tmp_path / "run.ndjson"))["validate_otp_token"] == "***MASKED***"
+
+    def test_resume_drops_torn_line_and_skips_done_flows(self, tmp_path):
+        with StreamingReportWriter(tmp_path / "run") as writer:
+            for n in (1, 2, 3):
+                writer.write(result(n, passed=n != 2))
+        # Process killed half-way through writing flow 4
+        with open(tmp_path / "run.ndjson", "a", encoding="utf-8") as f:
+            f.write(json.dumps(result(4))[:25])
+        with open(tmp_path / "run.csv", "a", encoding="utf-8") as f:
+            f.write("4,98701")
+
+        with StreamingReportWriter(tmp_path / "run", resume=True) as writer:
+            assert writer.completed == {1, 2, 3}
+            assert writer.passed == 2
+            writer.write(result(4))
+
+        assert [r["test_number"] for r in iter_ndjson(tmp_path / "run.ndjson")] == [1, 2, 3, 4]
+        rows = read_csv(tmp_path / "run.csv")
+        assert [row[0] for row in rows[1:]] == ["1", "2", "3", "4"]
+
+    def test_without_resume_starts_over(self, tmp_path):
+        with StreamingReportWriter(tmp_path / "run") as writer:
+            writer.write(result(1))
+        with StreamingReportWriter(tmp_path / "run") as writer:
+            assert writer.completed == set()
+        assert list(iter_ndjson(tmp_path / "run.ndjson")) == []
+
+
+class TestStreamingBulkRun:
+
+    def run(self, generator, count, fail=()):
+        generator.run_single_test = lambda test_number=1, client=None: result(test_number, test_number not in fail)
+        generator.run_bulk_tests(count=count)
+
+    def test_bulk_run_streams_instead_of_keeping_results(self, tmp_path):
+        generator = ReportGenerator(stream_to=tmp_path / "soak")
+        self.run(generator, 5, fail={3})
+
+        assert len(generator.bulk_results) == 0
+        assert generator.report_data["bulk_summary"]["passed"] == 4
+
+        html_path = generator.generate_html_report(str(tmp_path / "soak.html"))
+        report = report_data(html_path)
+        assert [row[-1] for row in report["rows"]] == ["PASS", "PASS", "FAIL", "PASS", "PASS"]
+        assert open(html_path, encoding="utf-8").read().rstrip().endswith("</html>")
+
+        data = json.load(open(generator.generate_json_report(str(tmp_path / "soak.json")), encoding="utf-8"))
+        assert [r["test_number"] for r in data["results"]] == [1, 2, 3, 4, 5]
+        assert data["bulk_summary"]["failed"] == 1
+
+        assert len(read_csv(generator.generate_csv_report(str(tmp_path / "copy.csv")))) == 6
+        generator.stream.close()
+
+    def test_resumed_run_only_runs_missing_flows(self, tmp_path):
+        first = ReportGenerator(stream_to=tmp_path / "soak")
+        self.run(first, 3)
+        first.stream.close()
+
+        ran = []
+        second = ReportGenerator(stream_to=tmp_path / "soak", resume=True)
+        second.run_single_test = lambda test_number=1, client=None: ran.append(test_number) or result(test_number)
+        second.run_bulk_tests(count=6)
+        second.stream.close()
+
+        assert ran == [4, 5, 6]
+        assert second.report_data["bulk_summary"]["passed"] == 6
+
+    def test_resumed_summary_counts_what_the_stream_holds(self, tmp_path):
+        first = ReportGenerator(stream_to=tmp_path / "soak")
+        self.run(first, 5, fail={2})
+        first.stream.write(result(3))   # A flow written twice counts once
+        first.stream.close()
+
+        second = ReportGenerator(stream_to=tmp_path / "soak", resume=True)
+        self.run(second, 3)
+        second.stream.close()
+
+        summary = second.report_data["bulk_summary"]
+        assert (summary["total_tests"], summary["passed"], summary["failed"]) == (5, 4, 1)
@@ -0,0 +1,102 @@
+"""
+Unit Tests for Upstox response decoding (bytes parsing, cached accessors, trusted mode)
+"""
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from src.api_clients.upstox_auth_client import UpstoxAuthClient
+from src.models.upstox_models import (
+    EmailSendOTPResponse,
+    GenerateOTPResponse,
+    VerifyOTPResponse,
+)
+from src.utils.cassette import use_cassette
+from src.utils.rate_limiter import NextAllowedScheduler
+
+VERIFY_BODY = json.dumps({
+    "success": True,
+    "data": {
+        "message": VerifyOTPResponse.SUCCESS_MESSAGE,
+        "userType": "LEAD",
+        "isSecretPinSet": False,
+        "userProfile": {"profileId": "12345"},
+    },
+}).encode()
+
+
+class TestParse:
+
+    def test_parses_bytes_and_str(self):
+        from_bytes = VerifyOTPResponse.parse(VERIFY_BODY)
+        from_str = VerifyOTPResponse.parse(VERIFY_BODY.decode())
+        assert from_bytes == from_str
+        assert from_bytes.profile_id == 12345
+        assert from_bytes.validate_success_response() == (True, "All validations passed")
+
+    def test_invalid_json_is_a_value_error(self):
+        with pytest.raises(ValueError):
+            GenerateOTPResponse.parse(b"<html>502</html>")
+
+    def test_untrusted_bodies_are_validated(self):
+        with pytest.raises(ValidationError):
+            GenerateOTPResponse.parse(b'{"success": "maybe"}')
+
+    def test_flat_email_body_keeps_raw_response(self):
+        response = EmailSendOTPResponse.parse(b'{"EMAIL": "OTP sent successfully"}')
+        assert response.is_success
+        assert response.validate_success_response()[0]
+        assert EmailSendOTPResponse.from_raw_response({"EMAIL": "OTP sent successfully"}).is_success
+
+
+class TestCachedAccessors:
+
+    def test_accessors_are_computed_once(self):
+        response = VerifyOTPResponse.parse(VERIFY_BODY)
+        assert response.profile_id == 12345
+        response.data["userProfile"]["profileId"] = "999"
+        assert response.profile_id == 12345
+
+    def test_cached_values_stay_out_of_serialisation(self):
+        response = GenerateOTPResponse.parse(b'{"success": true, "data": {"validateOTPToken": "t"}}')
+        assert response.validate_otp_token == "t"
+        assert response.model_dump() == {
+            "success": True, "data": {"validateOTPToken": "t"},
+            "error": None, "errors": None, "request_id": None,
+        }
+
+
+class TestTrusted:
+
+    def test_trusted_skips_validation(self):
+        response = GenerateOTPResponse.parse(b'{"success": "yes", "data": null}', trusted=True)
+        assert response.success == "yes"   # Not coerced: no validation ran
+        assert response.error is None       # Defaults still filled in
+
+    def test_trusted_with_missing_required_field_is_still_validated(self):
+        with pytest.raises(ValidationError):
+            GenerateOTPResponse.parse(b'{"data": {}}', trusted=True)
+
+    def test_client_trusts_cassette_replays(self, tmp_path, upstox_mock_server):
+        upstox_mock_server.state.reset()
+        path = tmp_path / "otp.json"
+        with use_cassette(str(path), "all"):
+            with UpstoxAuthClient(base_url=upstox_mock_server.base_url) as client:
+                client.generate_otp("9870300001")
+
+        parsed = []
+        original = GenerateOTPResponse.parse.__func__
+
+        def spy(cls, content, trusted=False):
+            parsed.append(trusted)
+            return original(cls, content, trusted)
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(GenerateOTPResponse, "parse", classmethod(spy))
+            with use_cassette(str(path), "none"):
+                # Own scheduler: the shared one holds this mobile for nextRequestInterval
+                with UpstoxAuthClient(base_url=upstox_mock_server.base_url,
+                                      otp_scheduler=NextAllowedScheduler()) as client:
+                    assert client.generate_otp("9870300001").validate_otp_token
+        assert parsed and all(parsed)
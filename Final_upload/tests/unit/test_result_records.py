@@ -0,0 +1,120 @@
+"""
+Unit Tests for the columnar result records (StageRecords / FlowRecords)
+"""
+import threading
+from datetime import datetime
+
+import pytest
+
+from src.auto_flow.stages import StageManager
+from src.utils.result_records import FlowRecords, StageRecords
+
+
+def flow_result(test_number: int, passed: bool = True) -> dict:
+    result = {
+        "test_number": test_number,
+        "timestamp": datetime(2026, 3, 1, 12, 0, 0, 123457).isoformat(),
+        "status": "PASS" if passed else "FAIL",
+        "stages": [
+            {"stage": 1, "api_name": "Generate OTP", "status": "PASS", "details": {"token_generated": True}},
+            {"stage": 2, "api_name": "Verify OTP", "status": "PASS" if passed else "FAIL",
+             "details": {"user_type": "LEAD", "profile_id": 1000 + test_number}},
+        ],
+        "mobile_number": f"98701{test_number:05d}",
+        "email": f"user{test_number}_@gmail.com",
+        "otp_used": "123789",
+    }
+    if passed:
+        result.update(profile_id=1000 + test_number, user_type="LEAD", overall="✅ ALL PASS")
+    else:
+        result.update(error="Stage 2 Failed", overall="❌ FAILED")
+    return result
+
+
+class TestStageRecords:
+
+    def test_reads_back_the_stage_manager_dict(self):
+        records = StageRecords()
+        moment = datetime(2026, 3, 1, 12, 0, 0, 1)
+        records.add(2, "Verify OTP", True, 200, "verified", {"user_type": "LEAD", "profile_id": 7},
+                    latency=0.25, timestamp=moment)
+        records.add(1, "Generate OTP", False, None, None)
+
+        assert records[0] == {
+            "stage": 2, "api_name": "Verify OTP", "status": "PASS", "status_code": 200,
+            "message": "verified", "details": {"user_type": "LEAD", "profile_id": 7},
+            "timestamp": moment.isoformat(),
+        }
+        assert records[1]["status_code"] is None and records[1]["details"] == {}
+        assert records.latency_of(0) == 0.25 and records.latency_of(1) is None
+        assert len(list(records)) == 2
+
+    def test_repeated_strings_are_stored_once(self):
+        records = StageRecords()
+        for n in range(1000):
+            records.add(1, "Generate OTP", True, 200, "OTP sent", {"email_used": f"u{n}@x"})
+        assert len(records.strings.values) == 3       # api name, message, details keys
+
+    def test_summary_per_api(self):
+        records = StageRecords()
+        for n in range(10):
+            records.add(1, "Generate OTP", n % 5 != 0, latency=0.1)
+            records.add(2, "Verify OTP", True)
+
+        summary = records.summary()
+        assert list(summary) == ["Generate OTP", "Verify OTP"]
+        assert summary["Generate OTP"] == {"total": 10, "passed": 8, "failed": 2, "avg_latency": pytest.approx(0.1)}
+        assert summary["Verify OTP"]["avg_latency"] is None
+        assert records.passed_count() == 18
+
+    def test_concurrent_adds_keep_columns_aligned(self):
+        records = StageRecords()
+
+        def add(flow):
+            for stage in range(1, 6):
+                records.add(stage, f"Stage {stage}", True, 200, "ok", {"flow": flow}, flow=flow)
+
+        threads = [threading.Thread(target=add, args=(flow,)) for flow in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(records) == 100
+        for flow in range(20):
+            assert [records[i]["details"] for i in records.for_flow(flow)] == [{"flow": flow}] * 5
+
+    def test_stage_managers_can_share_a_store(self):
+        shared = StageRecords()
+        first = StageManager(None, "9870100001", "a_@gmail.com", results=shared, flow=1)
+        second = StageManager(None, "9870100002", "b_@gmail.com", results=shared, flow=2)
+        first._record_result(1, "Generate OTP", True, 200, "sent", latency=0.01)
+        second._record_result(1, "Generate OTP", False, 200, "throttled")
+
+        assert [r["message"] for r in second.get_results()] == ["throttled"]
+        assert len(shared) == 2
+
+
+class TestFlowRecords:
+
+    def test_round_trips_result_dicts(self):
+        results = FlowRecords()
+        passed, failed = flow_result(1), flow_result(2, passed=False)
+        results.extend([passed, failed])
+
+        assert results[0] == passed
+        assert results[-1] == failed
+        assert "profile_id" not in results[1]          # Keys never set stay absent
+        assert results.passed_count() == 1
+
+    def test_sort_orders_by_test_number(self):
+        results = FlowRecords()
+        results.extend(flow_result(n) for n in (3, 1, 2))
+        results.sort()
+        assert [r["test_number"] for r in results] == [1, 2, 3]
+        assert results[0]["stages"][1]["details"]["profile_id"] == 1001
+
+    def test_unknown_keys_are_kept(self):
+        results = FlowRecords()
+        results.append({**flow_result(1), "retries": 2})
+        assert results[0]["retries"] == 2
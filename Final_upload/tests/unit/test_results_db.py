@@ -0,0 +1,191 @@
+"""
+Unit Tests for the historical results store (SQLite, append-only, trend queries)
+"""
+import importlib.util
+import json
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from generate_test_report import TestReportGenerator as ReportGenerator
+from src.api_clients.upstox_auth_client import UpstoxAuthClient
+from src.models.upstox_models import session_scope
+from src.utils.result_records import StageRecords
+from src.utils import results_db
+from src.utils.results_db import ResultsStore, rows_from_stage_records, rows_from_upstox_report
+
+NOW = datetime(2026, 10, 15, 12, 0, 0)
+
+
+def row(api_name, status="PASS", latency_ms=None, when=NOW, test_id="lead_flow"):
+    return {"test_id": test_id, "stage": 2, "api_name": api_name, "status": status,
+            "latency_ms": latency_ms, "timestamp": when.isoformat(), "message": None}
+
+
+@pytest.fixture
+def store(tmp_path):
+    with ResultsStore(tmp_path / "history.db") as store:
+        yield store
+
+
+class TestRecording:
+
+    def test_history_is_append_only(self, store, tmp_path):
+        store.record_run("auto_flow", [row("Verify OTP")], environment="uat")
+
+        db = sqlite3.connect(tmp_path / "history.db")
+        with pytest.raises(sqlite3.DatabaseError, match="append-only"):
+            db.execute("DELETE FROM results")
+        with pytest.raises(sqlite3.DatabaseError, match="append-only"):
+            db.execute("UPDATE runs SET environment = 'prod'")
+
+    def test_recording_the_same_run_twice_is_a_no_op(self, store):
+        assert store.record_run("bulk", [row("Verify OTP")], run_id="bulk:1") == "bulk:1"
+        assert store.record_run("bulk", [row("Verify OTP")], run_id="bulk:1") is None
+        assert len(store.runs()) == 1
+
+    def test_stage_records_keep_latency(self, store):
+        records = StageRecords()
+        records.add(2, "Verify OTP", True, 200, "ok", latency=0.25, timestamp=NOW)
+        store.record_run("auto_flow", rows_from_stage_records(records), environment="uat")
+
+        assert store.latency_trend("Verify OTP")[0]["avg_ms"] == pytest.approx(250)
+        assert store.runs()[0]["started_at"] == NOW.isoformat()
+
+
+    def test_bulk_runs_record_stage_latency(self, upstox_mock_server, tmp_path):
+        generator = ReportGenerator()
+        with UpstoxAuthClient(base_url=upstox_mock_server.base_url) as client, session_scope():
+            generator._store_result(generator.run_single_test(client=client))
+        generator.record_history(tmp_path / "history.db")
+
+        with ResultsStore(tmp_path / "history.db") as store:
+            trend = store.latency_trend("Verify OTP")
+        assert trend[0]["count"] == 1 and trend[0]["avg_ms"] > 0
+
+class TestQueries:
+
+    def test_latency_trend_per_month(self, store):
+        september, october = datetime(2026, 9, 10), datetime(2026, 10, 10)
+        store.record_run("auto_flow", [row("Verify OTP", latency_ms=200, when=september),
+                                       row("Verify OTP", latency_ms=220, when=september)], environment="uat")
+        store.record_run("auto_flow", [row("Verify OTP", latency_ms=300, when=october),
+                                       row("Generate OTP", latency_ms=900, when=october)], environment="uat")
+        store.record_run("auto_flow", [row("Verify OTP", latency_ms=5000, when=october)], environment="prod")
+
+        trend = store.latency_trend("Verify OTP", period="month", environment="uat")
+        assert [(r["period"], r["count"], r["avg_ms"]) for r in trend] == [("2026-09", 2, 210), ("2026-10", 1, 300)]
+        with pytest.raises(ValueError):
+            store.latency_trend("Verify OTP", period="fortnight")
+
+    def test_failure_rate_delta(self, store):
+        last_week, this_week = NOW - timedelta(days=10), NOW - timedelta(days=1)
+        store.record_run("bulk", [row("Verify OTP", "PASS", when=last_week)] * 4)
+        store.record_run("bulk", [row("Verify OTP", "FAIL", when=this_week), row("Verify OTP", when=this_week),
+                                  row("Email Send OTP", "SKIP", when=this_week)])
+
+        delta = store.failure_rate_delta(days=7, now=NOW)
+        assert delta == {"Verify OTP": {"previous": 0.0, "current": 0.5, "delta": 0.5}}
+
+    def test_flaky_tests(self, store):
+        for day, status in enumerate(["PASS", "FAIL", "PASS", "PASS"]):
+            store.record_run("auto_flow", [row("Verify OTP", status, when=NOW + timedelta(days=day)),
+                                           row("Generate OTP", "PASS", when=NOW + timedelta(days=day)),
+                                           row("2FA Authentication", "FAIL", when=NOW + timedelta(days=day))])
+
+        flaky = store.flaky_tests(min_runs=3)
+        assert [(f["api_name"], f["runs"], f["failures"], f["flips"]) for f in flaky] == [("Verify OTP", 4, 1, 2)]
+        assert store.flaky_tests(min_runs=5) == []
+
+    def test_flaky_counts_runs_not_flows(self, store):
+        # One bulk run of 10 flows with a single failure is one (failed) run
+        store.record_run("bulk", [row("Verify OTP", "FAIL" if flow == 3 else "PASS", when=NOW + timedelta(seconds=flow))
+                                  for flow in range(10)])
+        assert store.flaky_tests(min_runs=2) == []
+
+        for day in (1, 2):
+            store.record_run("bulk", [row("Verify OTP", when=NOW + timedelta(days=day))] * 10)
+        flaky = store.flaky_tests(min_runs=3)
+        assert [(f["runs"], f["failures"], f["flips"]) for f in flaky] == [(3, 1, 1)]
+
+
+class TestIngest:
+
+    def write(self, path, data):
+        path.write_text(json.dumps(data), encoding="utf-8")
+        return path
+
+    def test_allure_results_directory(self, store, tmp_path):
+        start = int(NOW.timestamp() * 1000)
+        self.write(tmp_path / "a-result.json", {
+            "uuid": "a", "name": "Lead flow", "status": "failed", "start": start, "stop": start + 900,
+            "steps": [{"name": "Stage 2: Verify OTP", "status": "passed", "start": start, "stop": start + 120}],
+        })
+        self.write(tmp_path / "a-container.json", {"uuid": "c", "children": ["a"]})
+
+        assert store.ingest(tmp_path, environment="uat") == 1
+        assert store.ingest(tmp_path, environment="uat") == 0
+        assert store.latency_trend("Verify OTP")[0]["avg_ms"] == 120
+        assert store.failure_rates()["Lead flow"]["failed"] == 1
+
+    def test_upstox_automation_report_and_logs(self, store, tmp_path):
+        report = self.write(tmp_path / "test_report.json", {
+            "metadata": {"generated_at": NOW.isoformat()},
+            "results": [{"tc_id": "STEP-01", "description": "Mobile Entry", "status": "PASS",
+                         "details": {"execution_time": 1.5}},
+                        {"tc_id": "STEP-02", "description": "Email Entry", "status": "SKIP", "details": {}}],
+        })
+        log = self.write(tmp_path / "logs.json", {
+            "test_name": "Happy Path Test", "session_id": "20261015_120000", "end_time": "2026-10-15T12:00:03",
+            "logs": [{"timestamp": "2026-10-15T12:00:00", "step_number": 1, "title": "Sign In", "status": "PASS"},
+                     {"timestamp": "2026-10-15T12:00:02", "step_number": 2, "title": "Mobile Entry", "status": "PASS"}],
+        })
+
+        assert store.ingest(report) == 1 and store.ingest(log) == 1
+        assert store.latency_trend("Mobile Entry") == [
+            {"period": "2026-10-15", "count": 2, "avg_ms": 1250.0, "min_ms": 1000.0, "max_ms": 1500.0}
+        ]
+        assert [run["source"] for run in store.runs()] == ["upstox_automation", "test_log"]
+
+    def test_unknown_file_is_rejected(self, store, tmp_path):
+        with pytest.raises(ValueError):
+            store.ingest(self.write(tmp_path / "other.json", {"hello": "world"}))
+
+
+class TestUpstoxAutomationWriter:
+    """Upstox_Automation's runners write to the history with a copy of the schema and row mapping"""
+
+    REPORT = {
+        "metadata": {"generated_at": NOW.isoformat()},
+        "results": [{"tc_id": "STEP-01", "description": "Mobile Entry", "status": "PASS",
+                     "details": {"execution_time": 1.5}},
+                    {"tc_id": "STEP-02", "description": "Email Entry", "status": "FAIL", "error": "timeout",
+                     "details": {}}],
+    }
+
+    @pytest.fixture
+    def writer(self):
+        path = Path(results_db.__file__).parents[3] / "Upstox_Automation" / "reports" / "results_history.py"
+        if not path.exists():
+            pytest.skip("Upstox_Automation is not checked out next to Final_upload")
+        spec = importlib.util.spec_from_file_location("upstox_results_history", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def test_schema_and_rows_match(self, writer):
+        assert writer._SCHEMA == results_db._SCHEMA
+        assert list(writer.rows_from_report(self.REPORT)) == list(rows_from_upstox_report(self.REPORT))
+
+    def test_recorded_run_is_not_ingested_again(self, writer, tmp_path):
+        assert writer.record_report(str(tmp_path / "history.db"), self.REPORT, environment="uat")
+        assert writer.record_report(str(tmp_path / "history.db"), self.REPORT) is None
+
+        report = tmp_path / "test_report.json"
+        report.write_text(json.dumps(self.REPORT), encoding="utf-8")
+        with ResultsStore(tmp_path / "history.db") as store:
+            assert store.ingest(report) == 0
+            assert store.latency_trend("Mobile Entry")[0]["avg_ms"] == 1500
+            assert store.failure_rates()["Email Entry"]["failed"] == 1
@@ -0,0 +1,89 @@
+"""
+Unit Tests for cached JSON-schema validation in APIAssertions
+"""
+import json
+
+import pytest
+import requests
+from jsonschema import SchemaError
+
+from src.models.lead_models import LEAD_LIST_SCHEMA
+from src.utils import assertions
+from src.utils.assertions import APIAssertions, clear_schema_cache
+
+
+SCHEMA = {
+    "type": "object",
+    "required": ["id", "email"],
+    "properties": {"id": {"type": "integer"}, "email": {"type": "string"}},
+}
+
+
+def make_response(body) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body if isinstance(body, bytes) else json.dumps(body).encode()
+    return response
+
+
+@pytest.fixture(params=["fast", "jsonschema"])
+def validation_path(request, monkeypatch):
+    """Run each test with and without the optional fastjsonschema fast path"""
+    if request.param == "fast":
+        pytest.importorskip("fastjsonschema")
+    else:
+        monkeypatch.setattr(assertions, "fastjsonschema", None)
+        monkeypatch.setattr(assertions, "_fastjsonschema_checked", True)
+    clear_schema_cache()
+    yield request.param
+    clear_schema_cache()
+
+
+class TestAssertJsonSchema:
+
+    def test_valid_response_passes(self, validation_path):
+        APIAssertions.assert_json_schema(make_response({"id": 1, "email": "a@b.c"}), SCHEMA)
+
+    def test_error_message_matches_jsonschema(self, validation_path):
+        with pytest.raises(AssertionError, match="'email' is a required property"):
+            APIAssertions.assert_json_schema(make_response({"id": 1}), SCHEMA)
+
+    def test_invalid_json(self, validation_path):
+        with pytest.raises(AssertionError, match="Invalid JSON response"):
+            APIAssertions.assert_json_schema(make_response(b"<html>"), SCHEMA)
+
+    def test_validator_is_built_once_per_schema(self, validation_path, monkeypatch):
+        built = []
+        real_validator_for = assertions.validator_for
+        monkeypatch.setattr(assertions, "validator_for", lambda s: built.append(s) or real_validator_for(s))
+
+        for n in range(5):
+            APIAssertions.assert_json_schema(make_response({"id": n, "email": "a@b.c"}), SCHEMA)
+        APIAssertions.assert_json_schema(make_response({"leads": [], "total": 0, "page": 1, "pageSize": 20}), LEAD_LIST_SCHEMA)
+        assert built == [SCHEMA, LEAD_LIST_SCHEMA]
+
+    def test_invalid_schema_is_rejected(self, validation_path):
+        with pytest.raises(SchemaError):
+            APIAssertions.assert_json_schema(make_response({}), {"type": "not-a-type"})
+
+
+class TestAssertJsonSchemaMany:
+
+    def test_all_valid(self, validation_path):
+        items = [make_response({"id": n, "email": "a@b.c"}) for n in range(10)]
+        APIAssertions.assert_json_schema_many(items + [{"id": 99, "email": "x@y.z"}], SCHEMA)
+
+    def test_reports_every_failure_with_index(self, validation_path):
+        items = [
+            make_response({"id": 1, "email": "a@b.c"}),
+            make_response({"id": "two", "email": "a@b.c"}),
+            make_response(b"not json"),
+            {"email": "a@b.c"},
+        ]
+        with pytest.raises(AssertionError) as error:
+            APIAssertions.assert_json_schema_many(items, SCHEMA)
+        message = str(error.value)
+        assert "3/4 responses" in message
+        assert "[1] 'two' is not of type 'integer'" in message
+        assert "[2] Invalid JSON response" in message
+        assert "[3] 'id' is a required property" in message
@@ -0,0 +1,79 @@
+"""
+Unit Tests for per-flow SessionContext and the TokenStore facade
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.api_clients.upstox_auth_client import UpstoxAuthClient
+from src.models.upstox_models import (
+    SessionContext,
+    current_session,
+    session_scope,
+    token_store
+)
+
+
+class TestSessionScope:
+
+    def test_facade_uses_default_session_outside_scope(self):
+        token_store.clear_all()
+        token_store.save_token("validate_otp_token", "legacy")
+        assert current_session().get_token("validate_otp_token") == "legacy"
+        token_store.clear_all()
+
+    def test_scope_isolates_and_restores(self):
+        token_store.clear_all()
+        token_store.save_user_data("profile_id", 1)
+
+        with session_scope() as session:
+            assert token_store.get_user_data("profile_id") is None
+            token_store.save_user_data("profile_id", 2)
+            assert session.get_user_data("profile_id") == 2
+
+        assert token_store.get_user_data("profile_id") == 1
+        token_store.clear_all()
+
+    def test_threads_do_not_share_scoped_state(self):
+        barrier = threading.Barrier(8)
+
+        def flow(n):
+            with session_scope():
+                token_store.save_token("validate_otp_token", f"token-{n}")
+                barrier.wait()
+                return token_store.get_token("validate_otp_token")
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(flow, range(8)))
+
+        assert results == [f"token-{n}" for n in range(8)]
+
+    def test_asyncio_tasks_do_not_share_scoped_state(self):
+        async def flow(n):
+            with session_scope():
+                token_store.save_user_data("profile_id", n)
+                await asyncio.sleep(0.01)
+                return token_store.get_user_data("profile_id")
+
+        async def run():
+            return await asyncio.gather(*(flow(n) for n in range(10)))
+
+        assert asyncio.run(run()) == list(range(10))
+
+
+class TestClientSessionBinding:
+
+    def test_client_follows_active_scope_by_default(self):
+        client = UpstoxAuthClient(request_id="qatest")
+        with session_scope() as session:
+            session.save_user_data("profile_id", 99)
+            assert client.get_stored_profile_id() == 99
+        client.close()
+
+    def test_client_with_explicit_store_ignores_scope(self):
+        pinned = SessionContext(name="pinned")
+        pinned.save_token("validate_otp_token", "pinned-token")
+        client = UpstoxAuthClient(request_id="qatest", store=pinned)
+        with session_scope():
+            assert client.get_stored_token() == "pinned-token"
+        client.close()
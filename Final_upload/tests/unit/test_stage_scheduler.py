@@ -0,0 +1,121 @@
+"""
+Unit Tests for the stage graph scheduler (no network, fake stage handlers)
+"""
+import threading
+import time
+
+import pytest
+
+from src.auto_flow.scheduler import FlowState, StageGraph, StageScheduler
+from src.auto_flow.stages import StageResult
+from src.models.upstox_models import token_store
+
+
+class FakeStageManager:
+    """Stage handlers that record call order and write to the active session"""
+
+    def __init__(self, mobile_number, fail_on=None, delay=0.0):
+        self.mobile_number = mobile_number
+        self.email = f"{mobile_number}_@gmail.com"
+        self.otp = "123789"
+        self.fail_on = fail_on
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def _stage(self, name, outputs):
+        with self.lock:
+            self.calls.append(name)
+        time.sleep(self.delay)
+        if name == self.fail_on:
+            return StageResult(False, f"{name} Failed")
+        token_store.save_user_data(name, self.mobile_number)
+        return StageResult(True, name, outputs=outputs)
+
+    def generate(self):
+        return self._stage("generate", {"validate_otp_token": f"tok-{self.mobile_number}"})
+
+    def lookup(self):
+        return self._stage("lookup", {"kyc": "ok"})
+
+    def verify(self):
+        return self._stage("verify", {"profile_id": 1})
+
+    def finish(self):
+        return self._stage("finish", {"done": True})
+
+
+GRAPH_CONFIG = [
+    {"name": "generate", "handler": "generate", "inputs": ["mobile_number"], "outputs": ["validate_otp_token"]},
+    {"name": "lookup", "handler": "lookup", "inputs": ["mobile_number"], "outputs": ["kyc"]},
+    {"name": "verify", "handler": "verify", "inputs": ["validate_otp_token"], "outputs": ["profile_id"]},
+    {"name": "finish", "handler": "finish", "inputs": ["profile_id", "kyc"], "outputs": ["done"]},
+]
+
+
+class TestStageGraph:
+
+    def test_default_graph_is_valid_linear_chain(self):
+        graph = StageGraph.default()
+        assert len(graph.stages) == 5
+        assert graph.critical_path()[0] == "Stage 1: Generate OTP"
+        assert graph.critical_path()[-1] == "Stage 5: Email Verify OTP"
+
+    def test_critical_path_skips_independent_stages(self):
+        graph = StageGraph.from_config(GRAPH_CONFIG)
+        assert graph.critical_path() == ["generate", "verify", "finish"]
+
+    def test_rejects_unknown_input(self):
+        with pytest.raises(ValueError, match="nobody produces"):
+            StageGraph.from_config([{"name": "a", "handler": "a", "inputs": ["missing"]}])
+
+    def test_rejects_cycle(self):
+        with pytest.raises(ValueError, match="cycle"):
+            StageGraph.from_config([
+                {"name": "a", "handler": "a", "inputs": ["y"], "outputs": ["x"]},
+                {"name": "b", "handler": "b", "inputs": ["x"], "outputs": ["y"]},
+            ])
+
+    def test_loads_from_yaml(self, tmp_path):
+        path = tmp_path / "flow.yaml"
+        path.write_text(
+            "stages:\n"
+            "  - {name: generate, handler: generate, inputs: [mobile_number], outputs: [validate_otp_token]}\n"
+        )
+        assert [s.name for s in StageGraph.from_yaml(str(path)).stages] == ["generate"]
+
+
+class TestStageScheduler:
+
+    def test_respects_dependencies_and_runs_independent_stages(self):
+        manager = FakeStageManager("9000000001", delay=0.02)
+        flow = FlowState(manager)
+        StageScheduler(StageGraph.from_config(GRAPH_CONFIG)).run([flow])
+
+        assert flow.success
+        assert set(manager.calls[:2]) == {"generate", "lookup"}
+        assert manager.calls.index("verify") > manager.calls.index("generate")
+        assert manager.calls[-1] == "finish"
+        assert flow.values["done"] is True
+
+    def test_many_flows_keep_sessions_isolated(self):
+        managers = [FakeStageManager(f"900000000{n}", delay=0.01) for n in range(5)]
+        flows = [FlowState(manager) for manager in managers]
+        StageScheduler(StageGraph.from_config(GRAPH_CONFIG), max_workers=8).run(flows)
+
+        for manager, flow in zip(managers, flows):
+            assert flow.success
+            assert set(flow.session.all_user_data.values()) == {manager.mobile_number}
+
+    def test_failure_stops_dependent_stages(self):
+        manager = FakeStageManager("9000000009", fail_on="verify")
+        flow = FlowState(manager)
+        completed = []
+        StageScheduler(StageGraph.from_config(GRAPH_CONFIG)).run(
+            [flow], on_stage_complete=lambda f, stage, result: completed.append(stage.name)
+        )
+
+        assert not flow.success
+        assert flow.failed.message == "verify Failed"
+        assert "finish" not in manager.calls
+        assert "verify" in completed
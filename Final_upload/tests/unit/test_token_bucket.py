@@ -0,0 +1,128 @@
+"""
+Unit Tests for TokenBucket, RateLimitRegistry and HTTPClient's proactive rate limiting
+"""
+import threading
+import time
+
+import pytest
+
+from src.mock_server import MockConfig, UpstoxMockServer
+from src.utils.http_client import HTTPClient
+from src.utils.rate_limiter import RateLimitRegistry, TokenBucket, fcntl
+
+
+def timed(func) -> float:
+    start = time.monotonic()
+    func()
+    return time.monotonic() - start
+
+
+class TestTokenBucket:
+
+    def test_burst_then_steady_rate(self):
+        bucket = TokenBucket(rate=20, burst=5)
+        assert timed(lambda: [bucket.acquire() for _ in range(5)]) < 0.05
+        # 10 more tokens at 20/s
+        assert 0.4 <= timed(lambda: [bucket.acquire() for _ in range(10)]) < 0.7
+
+    def test_threads_never_exceed_quota(self):
+        bucket = TokenBucket(rate=50, burst=1)
+        stamps, lock = [], threading.Lock()
+
+        def worker():
+            for _ in range(5):
+                bucket.acquire()
+                with lock:
+                    stamps.append(time.monotonic())
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # 40 requests at 50/s with a burst of 1 take at least 39 intervals
+        assert max(stamps) - min(stamps) >= 39 / 50 * 0.9
+
+    def test_pause_holds_tokens(self):
+        bucket = TokenBucket(rate=100, burst=10)
+        bucket.pause(0.3)
+        assert timed(bucket.acquire) >= 0.25
+
+    @pytest.mark.skipif(fcntl is None, reason="file-shared buckets need fcntl")
+    def test_state_file_shares_quota_between_instances(self, tmp_path):
+        # Two instances stand in for two processes: only the file is shared
+        first = TokenBucket(rate=10, burst=4, state_file=str(tmp_path / "upstox.bucket"))
+        second = TokenBucket(rate=10, burst=4, state_file=str(tmp_path / "upstox.bucket"))
+        assert timed(lambda: [first.acquire() for _ in range(4)]) < 0.05
+        assert timed(second.acquire) >= 0.08
+
+
+class TestRateLimitRegistry:
+
+    CONFIG = {"hosts": {
+        "api.example.com": {"rate": 100, "endpoints": {"/api/v1/leads/{lead_id}": {"rate": 1, "burst": 1}}},
+        "other.example.com": {"endpoints": {"/slow": {"rate": 2}}},
+    }}
+
+    def test_matches_host_and_endpoint_templates(self):
+        registry = RateLimitRegistry(self.CONFIG)
+        assert len(registry.buckets_for("https://api.example.com/api/v1/leads/42?x=1")) == 2
+        assert len(registry.buckets_for("https://api.example.com/api/v1/leads")) == 1
+        assert len(registry.buckets_for("https://other.example.com/slow")) == 1
+        assert registry.buckets_for("https://other.example.com/fast") == []
+        assert registry.buckets_for("https://unknown.example.com/") == []
+
+    def test_overall_rate_caps_every_host(self):
+        registry = RateLimitRegistry({**self.CONFIG, "rate": 50, "burst": 1})
+        assert len(registry.buckets_for("https://unknown.example.com/")) == 1
+        assert len(registry.buckets_for("https://api.example.com/api/v1/leads/42")) == 3
+        hosts = ["api.example.com", "other.example.com", "unknown.example.com"] * 2
+        # First request is free, the next five wait 20ms each
+        assert timed(lambda: [registry.acquire(f"https://{host}/") for host in hosts]) >= 0.09
+
+    def test_endpoint_quota_applies_across_ids(self):
+        registry = RateLimitRegistry(self.CONFIG)
+        registry.acquire("https://api.example.com/api/v1/leads/1")
+        assert registry.acquire("https://api.example.com/api/v1/leads/2") >= 0.9
+
+    def test_shipped_config_throttles_nothing(self):
+        # Quotas are opt-in: the default environments.yaml lists no hosts
+        registry = RateLimitRegistry()
+        assert registry.buckets_for("https://service-uat.upstox.com/login/open/v8/auth/1fa/otp-step/generate") == []
+
+    def test_shared_dir_puts_buckets_in_files(self, tmp_path):
+        registry = RateLimitRegistry({"shared_dir": str(tmp_path), **self.CONFIG})
+        registry.acquire("https://api.example.com/api/v1/leads")
+        if fcntl is not None:
+            assert (tmp_path / "api.example.com.bucket").exists()
+
+
+class TestHTTPClientRateLimits:
+
+    def test_clients_share_one_quota(self, upstox_mock_server):
+        registry = RateLimitRegistry({"hosts": {"127.0.0.1": {"rate": 20, "burst": 1}}})
+        clients = [HTTPClient(base_url=upstox_mock_server.base_url, rate_limits=registry) for _ in range(3)]
+        url = "/login/open/v8/auth/1fa/otp-step/generate"
+
+        elapsed = timed(lambda: [
+            client.post(url, json={"data": {"mobileNumber": f"98704{n:02d}{index:03d}"}})
+            for n, client in enumerate(clients) for index in range(4)
+        ])
+        # 12 requests at 20/s through one bucket, whichever client sends them
+        assert elapsed >= 11 / 20 * 0.9
+        for client in clients:
+            client.close()
+
+    def test_429_is_retried_after_retry_after(self):
+        registry = RateLimitRegistry({"hosts": {"127.0.0.1": {"rate": 100}}})
+        config = MockConfig(enforce_rate_limit=True, next_request_interval=1)
+        with UpstoxMockServer(config=config) as server:
+            client = HTTPClient(base_url=server.base_url, retry_attempts=2, rate_limits=registry)
+            url = "/login/open/v8/auth/1fa/otp-step/generate"
+            body = {"data": {"mobileNumber": "9870499999"}}
+            client.post(url, json=body)
+
+            start = time.monotonic()
+            assert client.post(url, json=body).status_code == 200
+            assert time.monotonic() - start >= 0.9
+            client.close()
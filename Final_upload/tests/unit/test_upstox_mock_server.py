@@ -0,0 +1,85 @@
+"""
+Unit Tests for the Upstox mock server (real UpstoxAuthClient against localhost)
+"""
+import pytest
+import requests
+
+from src.api_clients.upstox_auth_client import UpstoxAuthClient
+from src.mock_server import MockConfig, UpstoxMockServer
+from src.models.upstox_models import UpstoxErrorCodes, session_scope
+
+
+@pytest.fixture
+def mock_client(upstox_mock_server):
+    """Upstox client pointed at the shared mock server, in its own session"""
+    upstox_mock_server.state.reset()
+    client = UpstoxAuthClient(request_id="qatest4567", base_url=upstox_mock_server.base_url)
+    with session_scope():
+        yield client
+    client.close()
+
+
+class TestUpstoxMockFlow:
+
+    def test_full_five_stage_flow(self, mock_client):
+        generate = mock_client.generate_otp("9870165199")
+        assert generate.is_success
+        assert generate.next_request_interval == 30
+
+        verify = mock_client.verify_otp("123789")
+        assert verify.validate_success_response() == (True, "All validations passed")
+
+        two_fa = mock_client.two_factor_auth()
+        assert two_fa.validate_success_response()[0]
+
+        email = "mockuser01_@gmail.com"
+        assert mock_client.email_send_otp(email).validate_success_response()[0]
+        assert mock_client.email_verify_otp(email).validate_success_response()[0]
+
+    def test_legacy_validate_and_login(self, mock_client):
+        mock_client.generate_otp("9870165198")
+        assert mock_client.validate_otp("123789")["success"] is True
+
+        token = mock_client.get_stored_token()
+        url = mock_client._build_url_with_query(mock_client.LOGIN_ENDPOINT)
+        response = mock_client.http.post(url, json={"data": {"validateOTPToken": token}})
+        assert response.json()["data"]["profileId"]
+
+    def test_wrong_otp_is_rejected(self, mock_client):
+        mock_client.generate_otp("9870165197")
+        response = mock_client.verify_otp("000000")
+        assert response.success is False
+
+    def test_unknown_token_reports_session_expired(self, mock_client):
+        with pytest.raises(AssertionError, match="Session expired"):
+            mock_client.verify_otp("123789", validate_otp_token="not-a-real-token")
+
+    def test_2fa_requires_verified_otp(self, mock_client):
+        mock_client.generate_otp("9870165196")
+        response = mock_client.two_factor_auth_raw()
+        assert response.json()["error"]["code"] == UpstoxErrorCodes.SESSION_EXPIRED
+
+    def test_invalid_mobile_returns_400(self, mock_client):
+        with pytest.raises(requests.HTTPError):
+            mock_client.generate_otp_raw("12345")
+
+
+class TestUpstoxMockInjection:
+
+    def test_rate_limit_returns_429_with_retry_after(self):
+        config = MockConfig(enforce_rate_limit=True, next_request_interval=60)
+        with UpstoxMockServer(config=config) as server:
+            url = f"{server.base_url}{UpstoxAuthClient.GENERATE_OTP_ENDPOINT}"
+            body = {"data": {"mobileNumber": "9870165195"}}
+            assert requests.post(url, json=body).status_code == 200
+
+            throttled = requests.post(url, json=body)
+            assert throttled.status_code == 429
+            assert throttled.json()["error"]["code"] == UpstoxErrorCodes.RATE_LIMIT_EXCEEDED
+            assert int(throttled.headers["Retry-After"]) > 0
+
+    def test_failure_injection(self):
+        config = MockConfig(failure_rate=1.0, failure_status=503)
+        with UpstoxMockServer(config=config) as server:
+            url = f"{server.base_url}{UpstoxAuthClient.GENERATE_OTP_ENDPOINT}"
+            assert requests.post(url, json={"data": {"mobileNumber": "9870165194"}}).status_code == 503
@@ -4,18 +4,19 @@ HTTP Client with retry logic, authentication, and logging
 import time
 import requests
 from typing import Dict, Any, Optional, Callable
+from urllib.parse import urlsplit
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
 from config.settings import Settings
 from src.utils.logger import logger, APILogger
+from src.utils.retry_policy import RetryPolicy, retry_policy
 
 
 class HTTPClient:
     """
     Robust HTTP client for API automation with:
-    - Automatic retries
+    - Automatic retries (retry budget, per-host circuit breaker, deadlines)
     - Request/response logging
     - Session management
     - Authentication handling
@@ -26,11 +27,14 @@ class HTTPClient:
         base_url: Optional[str] = None,
         timeout: int = 60,  # Increased from 30 to 60 seconds
         retry_attempts: int = 5,  # Increased from 3 to 5
-        headers: Optional[Dict[str, str]] = None
+        headers: Optional[Dict[str, str]] = None,
+        policy: Optional[RetryPolicy] = None
     ):
         self.base_url = base_url or Settings.get_base_url()
         self.timeout = timeout
         self.retry_attempts = retry_attempts
+        # Shared by every client so the budget and circuits see all traffic
+        self.policy = policy if policy is not None else retry_policy
         self.session = requests.Session()
         
         # Set default headers
@@ -51,14 +55,8 @@ class HTTPClient:
         self._auth_callback: Optional[Callable] = None
     
     def _setup_retries(self):
-        """Configure retry strategy with exponential backoff for 503 errors"""
-        retry_strategy = Retry(
-            total=self.retry_attempts,
-            backoff_factor=2,  # Wait 2, 4, 8 seconds between retries
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["HEAD", "GET", "OPTIONS", "POST", "PUT", "DELETE", "PATCH"],
-            raise_on_status=False  # Don't raise immediately on status errors
-        )
+        """Mount the connection pool; retries are left to self.policy so they never multiply"""
+        retry_strategy = Retry(total=0, connect=0, read=0, status=0, raise_on_status=False)
         adapter = HTTPAdapter(
             max_retries=retry_strategy,
             pool_connections=10,
@@ -66,7 +64,7 @@ class HTTPClient:
         )
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
-        logger.info(f"✅ Retry configured: {self.retry_attempts} attempts with exponential backoff")
+        logger.info(f"✅ Retry configured: up to {self.retry_attempts} attempts (budget + circuit breaker)")
     
     def set_auth_token(self, token: str):
         """Set bearer token for authentication"""
@@ -89,9 +87,16 @@ class HTTPClient:
         self,
         method: str,
         endpoint: str,
+        deadline: Optional[float] = None,
         **kwargs
     ) -> requests.Response:
-        """Make HTTP request with logging, error handling and manual retry for 503"""
+        """
+        Make HTTP request with logging and error handling
+
+        503s, 5xx/429 and connection errors are retried by self.policy; the
+        request fails fast once the host's circuit is open, the retry budget
+        is spent or the deadline (argument or active deadline_scope) passes.
+        """
         url = f"{self.base_url}{endpoint}"
         
         # Prepare request
@@ -107,65 +112,39 @@ class HTTPClient:
         # Log request
         APILogger.log_request(method, url, request_headers, json_data or data)
         
-        # Make request with manual retry for 503 errors
-        max_manual_retries = 5
-        base_delay = 3  # Start with 3 seconds
+        def send(timeout: float) -> requests.Response:
+            return self.session.request(
+                method=method,
+                url=url,
+                headers=request_headers,
+                json=json_data,
+                params=params,
+                files=files,
+                data=data,
+                timeout=timeout,
+                **kwargs
+            )
+        
+        def send_with_policy() -> requests.Response:
+            return self.policy.execute(
+                send, urlsplit(url).netloc, self.timeout,
+                deadline=deadline, max_attempts=self.retry_attempts
+            )
         
         start_time = time.time()
-        last_exception = None
+        response = send_with_policy()
         
-        for attempt in range(max_manual_retries):
-            try:
-                response = self.session.request(
-                    method=method,
-                    url=url,
-                    headers=request_headers,
-                    json=json_data,
-                    params=params,
-                    files=files,
-                    data=data,
-                    timeout=self.timeout,
-                    **kwargs
-                )
-                response.raise_for_status()
-                
-                # Success - log and return
-                duration = time.time() - start_time
-                APILogger.log_response(response, duration)
-                return response
-                
-            except requests.exceptions.HTTPError as e:
-                # Handle 401 - Try to refresh token if callback is set
-                if response.status_code == 401 and self._auth_callback:
-                    logger.warning("Token expired, attempting refresh...")
-                    self._auth_callback()
-                    # Retry request immediately after token refresh
-                    continue
-                
-                # Handle 503 Service Unavailable - Retry with delay
-                if response.status_code == 503:
-                    last_exception = e
-                    delay = base_delay * (2 ** attempt)  # Exponential: 3, 6, 12, 24, 48 seconds
-                    logger.warning(f"⚠️  503 Service Unavailable (Attempt {attempt + 1}/{max_manual_retries}). Retrying in {delay}s...")
-                    time.sleep(delay)
-                    continue
-                
-                # Other HTTP errors - raise immediately
-                raise
-                
-            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
-                # Connection issues - retry with delay
-                last_exception = e
-                delay = base_delay * (2 ** attempt)
-                logger.warning(f"⚠️  Connection error (Attempt {attempt + 1}/{max_manual_retries}): {e}. Retrying in {delay}s...")
-                time.sleep(delay)
-                continue
+        # Handle 401 - Try to refresh token once if callback is set
+        if response.status_code == 401 and self._auth_callback:
+            logger.warning("Token expired, attempting refresh...")
+            self._auth_callback()
+            request_headers.update({k: v for k, v in self.session.headers.items() if k == "Authorization"})
+            response = send_with_policy()
         
-        # All retries exhausted
-        logger.error(f"❌ All {max_manual_retries} retry attempts failed")
-        if last_exception:
-            raise last_exception
-        raise requests.exceptions.RequestException("Request failed after all retry attempts")
+        duration = time.time() - start_time
+        APILogger.log_response(response, duration)
+        response.raise_for_status()
+        return response
     
     def get(self, endpoint: str, **kwargs) -> requests.Response:
         """Make GET request"""
@@ -0,0 +1,339 @@
+"""
+Retry Policy Engine for the HTTP client
+- Retry budget: retries may only be a fraction of recent requests
+- Per-host circuit breaker with half-open probing
+- Deadline propagation: no attempt or sleep runs past the caller's deadline
+"""
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Iterator, Optional
+
+import requests
+
+from src.utils.logger import logger
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised without sending when a host's circuit is open"""
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """Raised when the request deadline passes before a response"""
+
+
+# ═══════════════════════════════════════════════════════════════════
+# DEADLINES
+# ═══════════════════════════════════════════════════════════════════
+
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+@contextmanager
+def deadline_scope(seconds: float) -> Iterator[float]:
+    """
+    Give every request made inside the block a shared deadline
+
+    Nested scopes can only shorten the deadline, so a bulk job's overall
+    limit also bounds each request (and each retry sleep) it makes.
+
+    Example:
+        >>> with deadline_scope(600):      # whole bulk job: 10 minutes
+        ...     for lead in leads:
+        ...         client.create_lead(lead)
+    """
+    deadline = time.monotonic() + seconds
+    outer = _deadline.get()
+    if outer is not None:
+        deadline = min(deadline, outer)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def current_deadline() -> Optional[float]:
+    """Monotonic deadline of the innermost deadline_scope (None if unbounded)"""
+    return _deadline.get()
+
+
+# ═══════════════════════════════════════════════════════════════════
+# RETRY BUDGET
+# ═══════════════════════════════════════════════════════════════════
+
+class RetryBudget:
+    """
+    Allows retries only while they stay under `ratio` of the requests sent
+    in the last `window` seconds (plus `min_retries` so a quiet client can
+    still retry). When a host is failing everywhere, the budget runs out
+    and failures surface at once instead of multiplying the load.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10, window: float = 60.0):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self._lock = threading.Lock()
+        self._requests: deque = deque()
+        self._retries: deque = deque()
+
+    def record_request(self):
+        """Count a first attempt"""
+        with self._lock:
+            self._requests.append(time.monotonic())
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget; False if it is exhausted"""
+        with self._lock:
+            now = time.monotonic()
+            for stamps in (self._requests, self._retries):
+                while stamps and stamps[0] < now - self.window:
+                    stamps.popleft()
+            if len(self._retries) >= self.min_retries + self.ratio * len(self._requests):
+                return False
+            self._retries.append(now)
+            return True
+
+
+# ═══════════════════════════════════════════════════════════════════
+# CIRCUIT BREAKER
+# ═══════════════════════════════════════════════════════════════════
+
+class CircuitBreaker:
+    """
+    Per-host circuit: closed → open after `failure_threshold` consecutive
+    failures → half-open after `recovery_timeout` seconds, when a single
+    probe request is let through. A successful probe closes the circuit,
+    a failed one opens it again, and any other outcome (429, unexpected
+    error) releases it so the next request can probe.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, host: str, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self):
+        """
+        Check that a request may be sent
+
+        Raises:
+            CircuitOpenError: While open, or while a half-open probe is in flight
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            retry_in = self.recovery_timeout - (time.monotonic() - self._opened_at)
+            if retry_in > 0 or self._probe_in_flight:
+                raise CircuitOpenError(
+                    f"Circuit open for {self.host} after {self._failures} failures "
+                    f"(next probe in {max(retry_in, 0):.1f}s)"
+                )
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = True
+            logger.info(f"🔌 Circuit half-open for {self.host}: sending probe request")
+
+    def record_success(self):
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info(f"✅ Circuit closed for {self.host}")
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def release_probe(self):
+        """End a half-open probe without a verdict (the next request probes again)"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.error(f"🔌 Circuit opened for {self.host} after {self._failures} failures")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+
+# ═══════════════════════════════════════════════════════════════════
+# RETRY POLICY
+# ═══════════════════════════════════════════════════════════════════
+
+def retry_after_seconds(value: Optional[str], default: float) -> float:
+    """
+    Seconds to wait from a Retry-After header
+
+    Accepts both forms RFC 9110 allows: delay-seconds ("120") and an
+    HTTP-date ("Wed, 21 Oct 2026 07:28:00 GMT"). Missing or unparseable
+    values give `default`; dates in the past give 0.
+    """
+    value = (value or "").strip()
+    if not value:
+        return default
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max((moment - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class RetryPolicy:
+    """
+    The single place that decides whether, and when, a request is retried.
+
+    Retries 5xx/429 responses and connection errors/timeouts with
+    full-jitter exponential backoff (honouring Retry-After), while the
+    retry budget allows it, the host's circuit is closed and the deadline
+    leaves room for another attempt.
+
+    One policy is shared by every HTTPClient in the process (retry_policy),
+    so the budget and circuits reflect all traffic to a host.
+    """
+
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        budget: Optional[RetryBudget] = None,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget if budget is not None else RetryBudget()
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        """Circuit breaker for host (created on first use)"""
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(host, self.failure_threshold, self.recovery_timeout)
+            return self._breakers[host]
+
+    def backoff(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """Delay before retry number `attempt` (0-based)"""
+        jitter = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if response is None:
+            return jitter
+        return min(retry_after_seconds(response.headers.get("Retry-After"), jitter), self.max_delay)
+
+    def execute(
+        self,
+        send: Callable[[float], requests.Response],
+        host: str,
+        timeout: float,
+        deadline: Optional[float] = None,
+        max_attempts: Optional[int] = None
+    ) -> requests.Response:
+        """
+        Call send(attempt_timeout) until it returns a non-retryable response
+        or the policy gives up
+
+        Args:
+            send: Sends one attempt with the given timeout (seconds)
+            host: Circuit breaker key
+            timeout: Per-attempt timeout
+            deadline: Monotonic deadline (default: the active deadline_scope)
+            max_attempts: Overrides the policy's attempt limit
+
+        Returns:
+            The last response (possibly a retryable status, once retries run out)
+
+        Raises:
+            CircuitOpenError: The host's circuit is open
+            DeadlineExceeded: The deadline passed before an attempt could be made
+            requests.RequestException: From the last attempt
+        """
+        deadline = deadline if deadline is not None else current_deadline()
+        max_attempts = max_attempts if max_attempts is not None else self.max_attempts
+        breaker = self.breaker(host)
+        self.budget.record_request()
+
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic() if deadline is not None else timeout
+            if remaining <= 0:
+                raise DeadlineExceeded(f"Deadline passed before attempt {attempt + 1} to {host}")
+            breaker.allow()
+
+            response, error, resolved = None, None, False
+            try:
+                try:
+                    response = send(min(timeout, remaining))
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                    error = e
+
+                if error is None and response.status_code not in self.RETRY_STATUSES:
+                    breaker.record_success()
+                    resolved = True
+                    return response
+                # 429 means "slow down", not "host is down"
+                if error is not None or response.status_code >= 500:
+                    breaker.record_failure()
+                    resolved = True
+            finally:
+                # 429s and unexpected errors must not leave a half-open probe pending
+                if not resolved:
+                    breaker.release_probe()
+
+            reason = f"{type(error).__name__}: {error}" if error is not None else f"HTTP {response.status_code}"
+            attempt += 1
+            delay = self.backoff(attempt - 1, response)
+            if attempt >= max_attempts:
+                give_up = f"after {attempt} attempts"
+            elif deadline is not None and time.monotonic() + delay >= deadline:
+                give_up = "retry would pass the deadline"
+            elif breaker.state != CircuitBreaker.CLOSED:
+                give_up = "circuit open"
+            elif not self.budget.try_spend():
+                give_up = "retry budget exhausted"
+            else:
+                logger.warning(f"⚠️  {reason} from {host} (attempt {attempt}/{max_attempts}). Retrying in {delay:.2f}s...")
+                time.sleep(delay)
+                continue
+
+            logger.error(f"❌ Giving up on {host}: {reason} ({give_up})")
+            if error is not None:
+                raise error
+            return response
+
+
+# Global policy shared by every HTTPClient
+retry_policy = RetryPolicy()
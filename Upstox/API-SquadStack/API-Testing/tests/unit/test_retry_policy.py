@@ -0,0 +1,180 @@
+"""
+Unit Tests for the retry policy engine (retry budget, circuit breaker, deadlines)
+"""
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+
+from src.utils.retry_policy import (
+    CircuitBreaker, CircuitOpenError, DeadlineExceeded, RetryBudget, RetryPolicy,
+    current_deadline, deadline_scope, retry_after_seconds
+)
+
+
+def response(status_code: int, retry_after: str = None) -> requests.Response:
+    result = requests.Response()
+    result.status_code = status_code
+    if retry_after is not None:
+        result.headers["Retry-After"] = retry_after
+    return result
+
+
+def sender(*outcomes):
+    """send() returning (or raising) each outcome in turn; records attempt timeouts"""
+    outcomes = list(outcomes)
+    calls = []
+
+    def send(timeout):
+        calls.append(timeout)
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return response(outcome)
+
+    send.calls = calls
+    return send
+
+
+def policy(**overrides) -> RetryPolicy:
+    settings = dict(max_attempts=3, base_delay=0.0, max_delay=0.0, budget=RetryBudget(min_retries=100),
+                    failure_threshold=2, recovery_timeout=0.0)
+    settings.update(overrides)
+    return RetryPolicy(**settings)
+
+
+class TestRetryBudget:
+
+    def test_retries_limited_to_ratio_of_requests(self):
+        budget = RetryBudget(ratio=0.5, min_retries=0)
+        for _ in range(4):
+            budget.record_request()
+        assert [budget.try_spend() for _ in range(3)] == [True, True, False]
+
+    def test_min_retries_for_a_quiet_client(self):
+        budget = RetryBudget(ratio=0.0, min_retries=2)
+        assert [budget.try_spend() for _ in range(3)] == [True, True, False]
+
+    def test_old_retries_leave_the_window(self):
+        budget = RetryBudget(ratio=0.0, min_retries=1, window=0.05)
+        assert budget.try_spend() and not budget.try_spend()
+        time.sleep(0.06)
+        assert budget.try_spend()
+
+    def test_exhausted_budget_stops_retrying(self):
+        send = sender(503, 503, 503)
+        result = policy(budget=RetryBudget(ratio=0.0, min_retries=0), failure_threshold=10).execute(send, "api", 5)
+        assert result.status_code == 503
+        assert len(send.calls) == 1
+
+
+class TestCircuitBreaker:
+
+    def test_opens_after_threshold_and_rejects_without_sending(self):
+        breaker = CircuitBreaker("api", failure_threshold=2, recovery_timeout=60)
+        breaker.record_failure()
+        breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.allow()
+
+    def test_half_open_lets_one_probe_through(self):
+        breaker = CircuitBreaker("api", failure_threshold=1, recovery_timeout=0)
+        breaker.record_failure()
+        breaker.allow()                      # The probe
+        with pytest.raises(CircuitOpenError):
+            breaker.allow()                  # Others wait for its verdict
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker("api", failure_threshold=1, recovery_timeout=60)
+        breaker.record_failure()
+        breaker._opened_at -= 60
+        breaker.allow()
+        breaker.record_failure()
+        with pytest.raises(CircuitOpenError):
+            breaker.allow()
+
+    def test_probe_answered_with_429_does_not_wedge_the_circuit(self):
+        retry = policy(max_attempts=1, failure_threshold=1)
+        assert retry.execute(sender(503), "api", 5).status_code == 503   # Opens
+        assert retry.execute(sender(429), "api", 5).status_code == 429   # Probe throttled
+        assert retry.execute(sender(200), "api", 5).status_code == 200   # Next request probes again
+        assert retry.breaker("api").state == CircuitBreaker.CLOSED
+
+    def test_probe_raising_unexpected_error_does_not_wedge_the_circuit(self):
+        retry = policy(max_attempts=1, failure_threshold=1)
+        retry.execute(sender(503), "api", 5)
+        with pytest.raises(ValueError):
+            retry.execute(sender(ValueError("bad body")), "api", 5)
+        assert retry.execute(sender(200), "api", 5).status_code == 200
+
+    def test_connection_errors_count_as_failures(self):
+        retry = policy(max_attempts=5, failure_threshold=2, recovery_timeout=60)
+        send = sender(requests.exceptions.ConnectionError(), requests.exceptions.ConnectionError(), 200)
+        with pytest.raises(requests.exceptions.ConnectionError):
+            retry.execute(send, "api", 5)
+        assert len(send.calls) == 2          # Stopped once the circuit opened
+        with pytest.raises(CircuitOpenError):
+            retry.execute(sender(200), "api", 5)
+
+    def test_circuits_are_per_host(self):
+        retry = policy(max_attempts=1, failure_threshold=1, recovery_timeout=60)
+        retry.execute(sender(503), "down.example", 5)
+        assert retry.execute(sender(200), "up.example", 5).status_code == 200
+
+
+class TestDeadlines:
+
+    def test_nested_scope_only_shortens(self):
+        with deadline_scope(10) as outer:
+            with deadline_scope(100) as inner:
+                assert inner == outer
+            with deadline_scope(1) as inner:
+                assert inner < outer
+        assert current_deadline() is None
+
+    def test_passed_deadline_raises_without_sending(self):
+        send = sender(200)
+        with pytest.raises(DeadlineExceeded):
+            policy().execute(send, "api", 5, deadline=time.monotonic() - 1)
+        assert send.calls == []
+
+    def test_attempt_timeout_capped_by_deadline(self):
+        send = sender(200)
+        with deadline_scope(0.5):
+            policy().execute(send, "api", 30)
+        assert send.calls[0] <= 0.5
+
+    def test_no_retry_sleep_past_the_deadline(self):
+        retry = policy(max_delay=60.0, failure_threshold=10)
+        send = lambda timeout: response(503, retry_after="30")
+        started = time.monotonic()
+        result = retry.execute(send, "api", 5, deadline=time.monotonic() + 2)
+        assert result.status_code == 503
+        assert time.monotonic() - started < 1
+
+
+class TestRetryAfter:
+
+    def test_delay_seconds_and_fractions(self):
+        retry = policy(max_delay=60.0)
+        assert retry.backoff(0, response(503, retry_after="7")) == 7.0
+        assert retry.backoff(0, response(503, retry_after="1.5")) == 1.5
+
+    def test_http_date(self):
+        retry = policy(max_delay=60.0)
+        later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+        assert 25 < retry.backoff(0, response(429, retry_after=later)) <= 30
+        assert retry.backoff(0, response(429, retry_after="Wed, 21 Oct 2015 07:28:00 GMT")) == 0.0
+
+    def test_capped_by_max_delay(self):
+        assert policy(max_delay=2.0).backoff(0, response(503, retry_after="120")) == 2.0
+
+    def test_garbage_falls_back_to_jitter(self):
+        assert retry_after_seconds("soon", 0.25) == 0.25
+        assert policy().backoff(0, response(503, retry_after="soon")) == 0.0
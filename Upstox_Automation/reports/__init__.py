@@ -4,5 +4,6 @@ Contains report generation utilities
 """
 
 from .report_generator import generate_report, generate_html_report, generate_json_report
+from .results_history import record_report
 
-__all__ = ['generate_report', 'generate_html_report', 'generate_json_report']
+__all__ = ['generate_report', 'generate_html_report', 'generate_json_report', 'record_report']
@@ -0,0 +1,301 @@
+# Vendored copy of Final_upload/src/utils/report_viewer.py. Edit that file and
+# copy it here unchanged; Final_upload/tests/unit/test_report_viewer.py fails
+# when the two drift apart.
+"""
+Virtualised HTML Report Viewer
+One self-contained HTML file: results are embedded as a compact JSON blob
+({"columns": [...], "rows": [[...], ...]}) and a small script renders only
+the rows in view, with filter, sort and summary charts. A 20k-row report
+opens instantly because the browser never builds 20k table rows.
+
+Rows are written one at a time, so the report can be rendered straight
+from a streamed NDJSON file.
+"""
+import json
+from pathlib import Path
+from typing import Any, Iterable, Optional, Sequence, Union
+
+_DATA_MARKER = "/*__REPORT_DATA__*/"
+
+_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>__TITLE__</title>
+<style>
+    * { margin: 0; padding: 0; box-sizing: border-box; }
+    body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background: #f5f6fa; color: #333; padding: 20px; }
+    .container { max-width: 1300px; margin: 0 auto; }
+    .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; border-radius: 12px; padding: 24px 30px; margin-bottom: 18px; }
+    .header h1 { font-size: 1.7em; margin-bottom: 6px; }
+    .header p { opacity: 0.9; }
+    .cards { display: grid; grid-template-columns: repeat(auto-fit, minmax(180px, 1fr)); gap: 14px; margin-bottom: 18px; }
+    .card { background: white; border-radius: 10px; padding: 16px 20px; box-shadow: 0 2px 8px rgba(0,0,0,0.08); }
+    .card h3 { font-size: 0.75em; color: #667eea; text-transform: uppercase; letter-spacing: 1px; margin-bottom: 6px; }
+    .card .value { font-size: 1.9em; font-weight: bold; }
+    .card.pass .value { color: #11998e; }
+    .card.fail .value { color: #eb3349; }
+    .card.skip .value { color: #d39e00; }
+    .charts { display: grid; grid-template-columns: repeat(auto-fit, minmax(320px, 1fr)); gap: 14px; margin-bottom: 18px; }
+    .chart .bar-row { display: flex; align-items: center; margin: 4px 0; font-size: 0.85em; }
+    .chart .bar-label { width: 38%; overflow: hidden; text-overflow: ellipsis; white-space: nowrap; padding-right: 8px; }
+    .chart .bar { height: 14px; background: #667eea; border-radius: 3px; min-width: 2px; }
+    .chart .bar-count { padding-left: 6px; color: #666; }
+    .toolbar { display: flex; gap: 10px; align-items: center; padding: 14px 16px; background: white; border-radius: 10px 10px 0 0; border-bottom: 1px solid #e9ecef; }
+    .toolbar input, .toolbar select { padding: 7px 10px; border: 1px solid #ccd; border-radius: 6px; font-size: 0.9em; }
+    .toolbar input { flex: 1; }
+    .toolbar .count { color: #666; font-size: 0.85em; white-space: nowrap; }
+    .grid { background: white; border-radius: 0 0 10px 10px; box-shadow: 0 2px 8px rgba(0,0,0,0.08); overflow: hidden; }
+    .grid-head, .grid-row { display: grid; grid-template-columns: var(--columns); }
+    .grid-head div { padding: 10px 12px; background: #f8f9fa; font-size: 0.78em; font-weight: 600; color: #555; text-transform: uppercase; cursor: pointer; user-select: none; border-bottom: 1px solid #e9ecef; }
+    .grid-head div.sorted-asc::after { content: " \\25B2"; }
+    .grid-head div.sorted-desc::after { content: " \\25BC"; }
+    .viewport { height: 600px; overflow-y: auto; position: relative; }
+    .spacer { position: relative; }
+    .grid-row { position: absolute; left: 0; right: 0; height: 36px; border-bottom: 1px solid #f0f0f0; font-size: 0.88em; }
+    .grid-row div { padding: 9px 12px; overflow: hidden; text-overflow: ellipsis; white-space: nowrap; }
+    .grid-row.pass { background: #f0fff4; }
+    .grid-row.fail { background: #fff5f5; }
+    .grid-row.skip { background: #fffbea; }
+    .grid-row:hover { background: #eef1ff; }
+    .footer { text-align: center; color: #888; padding: 18px; font-size: 0.85em; }
+</style>
+</head>
+<body>
+<div class="container">
+    <div class="header">
+        <h1>__TITLE__</h1>
+        <p>__SUBTITLE__</p>
+    </div>
+    <div class="cards" id="cards"></div>
+    <div class="charts" id="charts"></div>
+    <div class="toolbar">
+        <input id="filter" type="search" placeholder="Filter rows (any column)...">
+        <select id="status-filter"><option value="">All statuses</option></select>
+        <span class="count" id="count"></span>
+    </div>
+    <div class="grid">
+        <div class="grid-head" id="head"></div>
+        <div class="viewport" id="viewport"><div class="spacer" id="spacer"></div></div>
+    </div>
+    <div class="footer">__FOOTER__</div>
+</div>
+<script type="application/json" id="report-data">/*__REPORT_DATA__*/</script>
+<script>
+(function () {
+    var ROW_HEIGHT = 36, OVERSCAN = 10;
+    var data = JSON.parse(document.getElementById("report-data").textContent);
+    var columns = data.columns, rows = data.rows, meta = data.meta || {};
+    var statusIndex = columns.indexOf(meta.status_column);
+    var view = rows.map(function (_, i) { return i; });
+    var sortColumn = -1, sortDirection = 1;
+
+    function text(value) { return value === null || value === undefined ? "" : String(value); }
+
+    // Lower-cased row text, built once, for the filter box
+    var haystack = rows.map(function (row) { return row.map(text).join("\\u0001").toLowerCase(); });
+
+    function element(tag, className, content) {
+        var node = document.createElement(tag);
+        if (className) node.className = className;
+        if (content !== undefined) node.textContent = content;
+        return node;
+    }
+
+    function countBy(index) {
+        var counts = {};
+        rows.forEach(function (row) { var key = text(row[index]) || "-"; counts[key] = (counts[key] || 0) + 1; });
+        return Object.keys(counts).map(function (key) { return [key, counts[key]]; })
+            .sort(function (a, b) { return b[1] - a[1]; });
+    }
+
+    // ─── Summary cards and charts ───
+    var cards = document.getElementById("cards");
+    function card(title, value, className) {
+        var node = element("div", "card " + (className || ""));
+        node.appendChild(element("h3", "", title));
+        node.appendChild(element("div", "value", value));
+        cards.appendChild(node);
+    }
+    card("Total", rows.length);
+    if (statusIndex >= 0) {
+        var statuses = countBy(statusIndex), passed = 0, failed = 0, skipped = 0;
+        statuses.forEach(function (entry) {
+            if (entry[0] === "PASS") passed = entry[1];
+            else if (entry[0] === "FAIL") failed = entry[1];
+            else if (entry[0] === "SKIP") skipped = entry[1];
+        });
+        card("Passed", passed, "pass");
+        card("Failed", failed, "fail");
+        if (skipped) card("Skipped", skipped, "skip");
+        card("Pass Rate", rows.length ? (passed / rows.length * 100).toFixed(1) + "%" : "0%");
+        var select = document.getElementById("status-filter");
+        statuses.forEach(function (entry) { select.appendChild(element("option", "", entry[0])).value = entry[0]; });
+    } else {
+        document.getElementById("status-filter").style.display = "none";
+    }
+
+    var charts = document.getElementById("charts");
+    (meta.charts || []).forEach(function (name) {
+        var index = columns.indexOf(name);
+        if (index < 0) return;
+        var counts = countBy(index).slice(0, 12), max = counts.length ? counts[0][1] : 1;
+        var chart = element("div", "card chart");
+        chart.appendChild(element("h3", "", name));
+        counts.forEach(function (entry) {
+            var row = element("div", "bar-row");
+            row.appendChild(element("div", "bar-label", entry[0])).title = entry[0];
+            var bar = row.appendChild(element("div", "bar"));
+            bar.style.width = (entry[1] / max * 50) + "%";
+            row.appendChild(element("div", "bar-count", entry[1]));
+            chart.appendChild(row);
+        });
+        charts.appendChild(chart);
+    });
+
+    // ─── Virtualised table ───
+    var head = document.getElementById("head"), viewport = document.getElementById("viewport");
+    var spacer = document.getElementById("spacer"), count = document.getElementById("count");
+    document.documentElement.style.setProperty("--columns", columns.map(function (name) {
+        return (meta.widths && meta.widths[name]) || "1fr";
+    }).join(" "));
+    columns.forEach(function (name, index) {
+        var cell = head.appendChild(element("div", "", name));
+        cell.onclick = function () { sortBy(index); };
+    });
+
+    function render() {
+        var first = Math.max(0, Math.floor(viewport.scrollTop / ROW_HEIGHT) - OVERSCAN);
+        var last = Math.min(view.length, Math.ceil((viewport.scrollTop + viewport.clientHeight) / ROW_HEIGHT) + OVERSCAN);
+        var fragment = document.createDocumentFragment();
+        for (var position = first; position < last; position++) {
+            var row = rows[view[position]];
+            var status = statusIndex >= 0 ? text(row[statusIndex]).toLowerCase() : "";
+            var node = element("div", "grid-row " + status);
+            node.style.top = (position * ROW_HEIGHT) + "px";
+            row.forEach(function (value) {
+                var cell = node.appendChild(element("div", "", text(value)));
+                cell.title = text(value);
+            });
+            fragment.appendChild(node);
+        }
+        spacer.textContent = "";
+        spacer.style.height = (view.length * ROW_HEIGHT) + "px";
+        spacer.appendChild(fragment);
+        count.textContent = view.length === rows.length
+            ? rows.length + " rows" : view.length + " of " + rows.length + " rows";
+    }
+
+    function compare(a, b) {
+        if (a === b) return 0;
+        if (a === null || a === undefined || a === "") return 1;
+        if (b === null || b === undefined || b === "") return -1;
+        if (typeof a === "number" && typeof b === "number") return (a - b) * sortDirection;
+        return String(a).localeCompare(String(b), undefined, {numeric: true}) * sortDirection;
+    }
+
+    function applySort() {
+        if (sortColumn < 0) return;
+        view.sort(function (i, j) { return compare(rows[i][sortColumn], rows[j][sortColumn]) || i - j; });
+    }
+
+    function sortBy(index) {
+        sortDirection = sortColumn === index ? -sortDirection : 1;
+        sortColumn = index;
+        Array.prototype.forEach.call(head.children, function (cell, i) {
+            cell.className = i === index ? (sortDirection > 0 ? "sorted-asc" : "sorted-desc") : "";
+        });
+        applySort();
+        render();
+    }
+
+    function applyFilter() {
+        var needle = document.getElementById("filter").value.trim().toLowerCase();
+        var status = document.getElementById("status-filter").value;
+        view = [];
+        for (var i = 0; i < rows.length; i++) {
+            if (status && text(rows[i][statusIndex]) !== status) continue;
+            if (needle && haystack[i].indexOf(needle) < 0) continue;
+            view.push(i);
+        }
+        applySort();
+        viewport.scrollTop = 0;
+        render();
+    }
+
+    var pending = null;
+    document.getElementById("filter").oninput = function () {
+        clearTimeout(pending);
+        pending = setTimeout(applyFilter, 120);
+    };
+    document.getElementById("status-filter").onchange = applyFilter;
+    viewport.onscroll = function () { window.requestAnimationFrame(render); };
+    render();
+})();
+</script>
+</body>
+</html>
+"""
+
+
+def _escape_html(value: str) -> str:
+    return value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _json_for_script(value: Any) -> str:
+    """JSON safe to embed in a <script> element"""
+    return json.dumps(value, ensure_ascii=False, default=str).replace("</", "<\\/")
+
+
+def write_report_viewer(
+    path: Union[str, Path],
+    title: str,
+    columns: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    status_column: Optional[str] = None,
+    charts: Sequence[str] = (),
+    subtitle: str = "",
+    footer: str = "",
+    widths: Optional[dict] = None
+) -> str:
+    """
+    Write a virtualised, filterable report
+
+    Args:
+        path: Output .html file
+        title: Page heading
+        columns: Column names
+        rows: One list of cell values per row (consumed lazily)
+        status_column: Column holding PASS/FAIL/SKIP; drives the summary cards,
+                       row colours and the status filter
+        charts: Columns to chart as value counts (e.g. "Customer Status")
+        subtitle, footer: Plain-text header/footer lines
+        widths: CSS grid widths per column (default "1fr")
+
+    Returns:
+        Path to the written report
+
+    Example:
+        >>> write_report_viewer("reports/bulk.html", "Bulk run", ["#", "Status"],
+        ...                     ([n, "PASS"] for n in range(20000)), status_column="Status")
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    page = (_TEMPLATE
+            .replace("__TITLE__", _escape_html(title))
+            .replace("__SUBTITLE__", _escape_html(subtitle))
+            .replace("__FOOTER__", _escape_html(footer)))
+    before, after = page.split(_DATA_MARKER)
+    meta = {"status_column": status_column, "charts": list(charts), "widths": widths or {}}
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(before)
+        f.write('{"meta": ' + _json_for_script(meta) + ', "columns": ' + _json_for_script(list(columns)))
+        f.write(', "rows": [')
+        for index, row in enumerate(rows):
+            if index:
+                f.write(",\n")
+            f.write(_json_for_script(list(row)))
+        f.write("]}")
+        f.write(after)
+    return str(path)
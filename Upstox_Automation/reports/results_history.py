@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Results History Writer
+Appends each run to the SQLite results history shared with Final_upload,
+so trend queries (python -m src.utils.results_db latency ... in
+Final_upload) cover these runners without an after-the-fact ingest.
+
+Final_upload/src/utils/results_db.py owns the store and its queries; the
+schema and row mapping here are copied from it, and
+Final_upload/tests/unit/test_results_db.py fails when they drift apart.
+"""
+
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id      TEXT PRIMARY KEY,
+    source      TEXT NOT NULL,
+    environment TEXT,
+    started_at  TEXT,
+    finished_at TEXT,
+    recorded_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    id          INTEGER PRIMARY KEY,
+    run_id      TEXT NOT NULL REFERENCES runs(run_id),
+    environment TEXT,
+    test_id     TEXT NOT NULL,
+    stage       INTEGER,
+    api_name    TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    latency_ms  REAL,
+    timestamp   TEXT NOT NULL,
+    message     TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_env_time ON runs(environment, started_at);
+CREATE INDEX IF NOT EXISTS idx_results_run ON results(run_id);
+CREATE INDEX IF NOT EXISTS idx_results_api_time ON results(api_name, timestamp);
+CREATE INDEX IF NOT EXISTS idx_results_env_time ON results(environment, timestamp);
+CREATE INDEX IF NOT EXISTS idx_results_test ON results(test_id, api_name, timestamp);
+CREATE TRIGGER IF NOT EXISTS runs_no_update BEFORE UPDATE ON runs
+    BEGIN SELECT RAISE(ABORT, 'results history is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS runs_no_delete BEFORE DELETE ON runs
+    BEGIN SELECT RAISE(ABORT, 'results history is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS results_no_update BEFORE UPDATE ON results
+    BEGIN SELECT RAISE(ABORT, 'results history is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS results_no_delete BEFORE DELETE ON results
+    BEGIN SELECT RAISE(ABORT, 'results history is append-only'); END;
+"""
+
+_RESULT_COLUMNS = ("test_id", "stage", "api_name", "status", "latency_ms", "timestamp", "message")
+
+
+def rows_from_report(report: Dict) -> Iterator[Dict]:
+    """Result rows for a test_report.json dict (same rows Final_upload's ingest builds)"""
+    timestamp = report.get("metadata", {}).get("generated_at") or datetime.now().isoformat()
+    for result in report.get("results", []):
+        details = result.get("details", {})
+        exec_time = details.get("execution_time")
+        yield {
+            "test_id": result.get("tc_id", "N/A"),
+            "stage": None,
+            "api_name": result.get("description") or details.get("step") or result.get("tc_id", "N/A"),
+            "status": (result.get("status") or "UNKNOWN").upper(),
+            "latency_ms": float(exec_time) * 1000 if exec_time is not None else None,
+            "timestamp": timestamp,
+            "message": result.get("error") or details.get("message"),
+        }
+
+
+def record_report(db_path: str, report: Dict, environment: Optional[str] = None) -> Optional[str]:
+    """
+    Append one run (a test_report.json dict) to the results history
+    
+    The run_id is the one Final_upload's ingest gives the same report, so
+    importing its test_report.json later does not count the run twice.
+    
+    Args:
+        db_path: SQLite file (created on first use)
+        report: Report dict from build_json_report()
+        environment: Environment name, if known
+        
+    Returns:
+        The run_id, or None if that run was already recorded
+    """
+    run_id = f"upstox_automation:{report.get('metadata', {}).get('generated_at')}"
+    rows: List[tuple] = [tuple(row.get(column) for column in _RESULT_COLUMNS) for row in rows_from_report(report)]
+    timestamps = sorted(row[5] for row in rows)
+    
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(db_path)
+    try:
+        db.execute("PRAGMA journal_mode=WAL")
+        db.executescript(_SCHEMA)
+        with db:
+            if db.execute("SELECT 1 FROM runs WHERE run_id = ?", (run_id,)).fetchone():
+                return None
+            db.execute(
+                "INSERT INTO runs (run_id, source, environment, started_at, finished_at, recorded_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (run_id, "upstox_automation", environment,
+                 timestamps[0] if timestamps else None, timestamps[-1] if timestamps else None,
+                 datetime.now().isoformat())
+            )
+            db.executemany(
+                "INSERT INTO results (run_id, environment, test_id, stage, api_name, status, latency_ms, timestamp, message)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, environment) + row for row in rows]
+            )
+        return run_id
+    finally:
+        db.close()
@@ -90,13 +90,14 @@ class TestRunner:
         print(f"⚠️ Flow '{flow_name}' not found")
         return []
     
-    def generate_reports(self, output_format: str = "all", output_dir: str = "reports"):
+    def generate_reports(self, output_format: str = "all", output_dir: str = "reports", results_db: str = None):
         """
         Generate test reports
         
         Args:
             output_format: Report format (html, json, all)
             output_dir: Directory to save reports
+            results_db: Results history (SQLite) to append this run to
         """
         print("\n" + "=" * 70)
         print("📊 GENERATING REPORTS")
@@ -106,7 +107,7 @@ class TestRunner:
         print_console_report(self.all_results)
         
         # Generate file reports
-        generated = generate_report(self.all_results, output_format, output_dir)
+        generated = generate_report(self.all_results, output_format, output_dir, results_db)
         
         print("\n✅ Reports generated successfully!")
         for format_type, path in generated.items():
@@ -155,6 +156,12 @@ def main():
         default="config/test_data.json",
         help="Path to test data JSON file"
     )
+    parser.add_argument(
+        "--results-db",
+        default=None,
+        metavar="PATH",
+        help="Append results to this SQLite results history (e.g. ../Final_upload/reports/results_history.db)"
+    )
     
     args = parser.parse_args()
     
@@ -176,7 +183,9 @@ def main():
     # Generate reports
     if args.report in ("html", "json", "all"):
         report_format = "all" if args.report == "all" else args.report
-        runner.generate_reports(report_format, args.output)
+        runner.generate_reports(report_format, args.output, args.results_db)
+    elif args.results_db:
+        generate_report(runner.all_results, "console", args.output, args.results_db)
     
     # Print final summary
     summary = runner.get_combined_summary()
@@ -61,6 +61,13 @@ Note: GUI mode is required for OTP entry. CLI mode disabled.
         help="Output directory for reports (default: reports)"
     )
     
+    parser.add_argument(
+        "--results-db",
+        default=None,
+        metavar="PATH",
+        help="Append results to this SQLite results history (e.g. ../Final_upload/reports/results_history.db)"
+    )
+    
     # NOTE: CLI/Headless mode disabled - OTP requires GUI interaction
     # parser.add_argument(
     #     "--headless", "-hl",
@@ -134,11 +141,13 @@ Note: GUI mode is required for OTP entry. CLI mode disabled.
     # File reports
     if args.report in ("html", "json", "all"):
         report_format = "all" if args.report == "all" else args.report
-        generated = generate_report(report_results, report_format, args.output)
+        generated = generate_report(report_results, report_format, args.output, args.results_db)
         
         print("\n✅ Reports generated:")
         for fmt, path in generated.items():
             print(f"   {fmt.upper()}: {path}")
+    elif args.results_db:
+        generate_report(report_results, "console", args.output, args.results_db)
     
     # Final summary
     print("\n" + "=" * 70)